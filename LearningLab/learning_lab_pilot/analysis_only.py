@@ -6,8 +6,12 @@ from config import Config
 from paper_analyzer import PaperAnalyzer
 import time
 
-def analyze_existing_papers():
-    """기존 수집된 논문으로 분석만 실행"""
+def analyze_existing_papers(excel_file=None, n_clusters=None, queue_db=None, local_workers=0):
+    """기존 수집된 논문으로 분석만 실행
+    
+    queue_db를 주면 요약/임베딩을 작업 큐에 등록하고 워커들(local_workers개 + 다른 프로세스/호스트)이
+    끝낼 때까지 기다린 뒤 결과를 모아 클러스터링합니다.
+    """
     
     print("🤖 기존 논문 데이터로 AI 분석 시작!")
     print("=" * 50)
@@ -22,7 +26,11 @@ def analyze_existing_papers():
     
     # 3. 기존 데이터 로드
     print("📚 기존 수집 데이터 로드 중...")
-    if not analyzer.load_papers('collected_papers.xlsx'):
+    if excel_file is not None:
+        if not analyzer.load_papers(excel_file):
+            print(f"❌ {excel_file} 파일을 불러올 수 없습니다.")
+            return
+    elif not analyzer.load_papers('collected_papers.xlsx'):
         print("❌ collected_papers.xlsx 파일이 없습니다.")
         print("💡 먼저 demo_papers.xlsx로 시도해보겠습니다.")
         if not analyzer.load_papers('demo_papers.xlsx'):
@@ -35,24 +43,48 @@ def analyze_existing_papers():
     
     start_time = time.time()
     
-    # GPT로 초록 요약
-    print("📝 GPT 요약 시작...")
-    analyzer.summarize_abstracts_with_gpt()
-    summary_time = time.time() - start_time
-    
-    # 임베딩 생성
-    print("\n🔢 임베딩 생성...")
-    analyzer.create_embeddings()
+    if queue_db is not None:
+        # 요약/임베딩을 작업 큐로 여러 워커에 분산
+        from work_queue import WorkQueue, start_local_workers
+        queue = WorkQueue(queue_db)
+        analyzer.submit_to_queue(queue)
+        pool = start_local_workers(queue.db_path, local_workers) if local_workers else None
+        analyzer.wait_for_queue(queue, workers=pool)
+        if pool is not None:
+            pool.join()
+        analyzer.load_queue_results(queue, fit_reducer=True)
+        queue.close()
+        summary_time = time.time() - start_time
+    else:
+        # GPT로 초록 요약
+        print("📝 GPT 요약 시작...")
+        analyzer.summarize_abstracts_with_gpt()
+        summary_time = time.time() - start_time
+        
+        # 임베딩 생성
+        print("\n🔢 임베딩 생성...")
+        analyzer.create_embeddings(fit_reducer=True)
+    
+    # 'Other' 논문 카테고리 보정 (임베딩 프로토타입, API 호출 없음)
+    analyzer.refine_other_categories()
     
     # 클러스터링 수행
     print("\n🎯 클러스터링...")
-    analyzer.perform_clustering()
+    if Config.CLUSTERING_CONFIG['hierarchical']:
+        analyzer.perform_hierarchical_clustering(n_clusters)
+    else:
+        analyzer.perform_clustering(n_clusters)
+    
+    # 클러스터 단위 이름/키워드 생성 (논문별 키워드 추출 대신)
+    if Config.GPT_CONFIG['insight_mode'] == 'cluster':
+        print("\n🏷️ 클러스터 이름 생성...")
+        analyzer.name_clusters_with_gpt()
     
     # 클러스터 분석
     print("\n🔍 클러스터 분석...")
     analyzer.analyze_clusters()
     
-    # 5. 시각화 (텍스트)
+    # 5. 시각화
     print("\n📊 결과 정리")
     print("-" * 30)
     analyzer.visualize_clusters()
@@ -60,6 +92,13 @@ def analyze_existing_papers():
     # 6. 결과 저장
     analyzer.save_analysis_results()
     
+    # 조회 서비스(query_service)가 사용할 스냅샷
+    analyzer.save_snapshot()
+    
+    # 재시도 후에도 실패한 항목은 파일로 남겨 다시 처리할 수 있게 함
+    if len(analyzer.retry_queue):
+        print(f"📮 실패 항목 {len(analyzer.retry_queue)}건 기록: {analyzer.retry_queue.save()}")
+    
     # 7. 최종 리포트
     total_time = time.time() - start_time
     
@@ -0,0 +1,86 @@
+"""
+임베딩 차원 축소 벤치마크: 전체 차원 대비 클러스터링 시간 / 메모리 / 클러스터 일치도(ARI)
+
+사용 예:
+    python benchmark_dimensions.py                                   # 합성 데이터 (20,000 x 1536)
+    python benchmark_dimensions.py --embeddings snapshots/<버전>/embeddings.npy --n-clusters 8
+
+'api' 행은 API의 dimensions 파라미터와 같은 방식(앞쪽 차원 + 재정규화)으로 계산하므로
+실제 text-embedding-3 임베딩(--embeddings)으로 돌려야 의미 있는 결과가 나옵니다.
+"""
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from embedding_reduction import EmbeddingReducer, l2_normalize
+
+
+def synthetic_embeddings(n_samples, n_clusters, dimensions=1536, latent_dimensions=64, seed=42):
+    """저차원 군집 구조를 고차원으로 올린 정규화 임베딩"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_clusters, latent_dimensions)) * 0.6
+    labels = rng.integers(n_clusters, size=n_samples)
+    latent = centers[labels] + rng.normal(size=(n_samples, latent_dimensions))
+    mixing = rng.normal(size=(latent_dimensions, dimensions)) / np.sqrt(latent_dimensions)
+    noise = rng.normal(scale=0.5, size=(n_samples, dimensions))
+    return l2_normalize(latent @ mixing + noise)
+
+
+def run_kmeans(embeddings, n_clusters):
+    """K-means 학습 시간(초), 최대 추가 메모리(MB), 라벨"""
+    from sklearn.cluster import KMeans
+
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    labels = KMeans(n_clusters=n_clusters, random_state=42, n_init=10).fit_predict(embeddings)
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6, labels
+
+
+def main():
+    parser = argparse.ArgumentParser(description='임베딩 차원 축소 벤치마크')
+    parser.add_argument('--embeddings', default=None, help='임베딩 .npy 파일 (없으면 합성 데이터)')
+    parser.add_argument('--n-samples', type=int, default=20000, help='합성 데이터 논문 수')
+    parser.add_argument('--n-clusters', type=int, default=8)
+    parser.add_argument('--dims', type=int, nargs='+', default=[256, 512])
+    args = parser.parse_args()
+
+    from sklearn.metrics import adjusted_rand_score
+
+    if args.embeddings:
+        embeddings = np.load(args.embeddings).astype(np.float32)
+        embeddings = embeddings[np.isfinite(embeddings).all(axis=1) & embeddings.any(axis=1)]
+    else:
+        embeddings = synthetic_embeddings(args.n_samples, args.n_clusters)
+    print(f"📐 임베딩 {embeddings.shape[0]}개 x {embeddings.shape[1]}차원, 클러스터 {args.n_clusters}개\n")
+
+    full_time, full_peak, full_labels = run_kmeans(embeddings, args.n_clusters)
+    rows = [('full', embeddings.shape[1], 0.0, full_time, full_peak, embeddings.nbytes / 1e6, 1.0)]
+
+    for dimensions in args.dims:
+        for method in ('api', 'pca'):
+            reducer = EmbeddingReducer(dimensions=dimensions, method=method)
+            start_time = time.perf_counter()
+            if method == 'pca':
+                # 설정된 pca_model_file을 덮어쓰지 않도록 저장 없이 학습
+                reduced = reducer.fit(embeddings, save=False).transform(embeddings)
+            else:
+                reduced = reducer.reduce(embeddings)
+            reduce_time = time.perf_counter() - start_time
+
+            elapsed, peak, labels = run_kmeans(reduced, args.n_clusters)
+            ari = adjusted_rand_score(full_labels, labels)
+            rows.append((method, dimensions, reduce_time, elapsed, peak, reduced.nbytes / 1e6, ari))
+
+    print(f"{'방식':<6}{'차원':>6}{'축소(초)':>10}{'K-means(초)':>13}{'최대메모리(MB)':>16}{'저장(MB)':>10}{'ARI':>8}")
+    for method, dimensions, reduce_time, elapsed, peak, size, ari in rows:
+        print(f"{method:<6}{dimensions:>6}{reduce_time:>10.2f}{elapsed:>13.2f}{peak:>16.1f}{size:>10.1f}{ari:>8.3f}")
+    print(f"\n💡 K-means 속도: 전체 차원 대비 " + ', '.join(
+        f"{method}-{dimensions} {full_time / elapsed:.1f}배" for method, dimensions, _, elapsed, *_ in rows[1:]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""
+분석 단계 마이크로 벤치마크: 합성 논문/임베딩으로 단계별 소요시간과 최대 메모리 측정 (네트워크 없음)
+
+측정 단계:
+    classify_papers_by_category / _extract_common_keywords / perform_clustering (차원 x 클러스터링 방식별)
+    analyze_clusters / save_to_excel / save_analysis_results
+
+결과는 JSON으로 저장하고, 기준(baseline) 파일과 비교해 허용 범위를 넘게 느려지거나
+메모리를 더 쓰면 회귀 목록을 출력하고 종료 코드 1로 끝납니다 (CI에서 그대로 사용 가능).
+
+사용 예:
+    python benchmark_suite.py                                        # quick: 1k/10k x 256/1536
+    python benchmark_suite.py --profile full                         # 1k ~ 1M x 256/768/1536
+    python benchmark_suite.py --rows 50000 --dims 512 --repeat 1 --no-memory
+    python benchmark_suite.py --save-baseline                        # 현재 결과를 기준으로 저장
+    python benchmark_suite.py --baseline benchmark_baseline.json     # 기준과 비교 (회귀 시 실패)
+
+시간은 repeat회 중 최솟값, 메모리는 tracemalloc을 켠 별도 1회 실행의 최대 추가 할당량입니다.
+클러스터링 단계는 품질(cohesion: 논문과 소속 클러스터 평균 방향의 코사인 유사도 평균)도 함께 기록합니다.
+기준 파일은 장비마다 다르므로 같은 장비에서 만든 기준과 비교해야 합니다.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from config import Config
+from embedding_reduction import l2_normalize
+from spherical_kmeans import cosine_cohesion
+
+PROFILES = {
+    'quick': {'rows': [1000, 10000], 'dims': [256, 1536]},
+    'full': {'rows': [1000, 10000, 100000, 1000000], 'dims': [256, 768, 1536]},
+}
+
+CATEGORY_POOL = ['cs.AI', 'cs.LG', 'cs.CV', 'cs.CL', 'cs.RO', 'cs.IR', 'cs.NE', 'stat.ML', 'cs.DC', 'cs.CR',
+                 'math.OC', 'eess.IV', 'eess.SP', 'physics.comp-ph', 'q-bio.NC', 'econ.EM']
+WORD_POOL = ['model', 'learning', 'neural', 'network', 'data', 'training', 'graph', 'language', 'vision',
+             'robust', 'efficient', 'transformer', 'attention', 'optimization', 'inference', 'benchmark',
+             'dataset', 'representation', 'generative', 'diffusion', 'reinforcement', 'policy', 'agent',
+             'retrieval', 'federated', 'privacy', 'sparse', 'scalable', 'evaluation', 'adversarial']
+
+
+class BenchmarkStageError(RuntimeError):
+    """측정 중 단계가 실패 메시지(❌)를 출력하거나 예외를 낸 경우"""
+
+
+def synthetic_papers(n_rows, seed=42):
+    """PaperCollector 수집 결과와 같은 컬럼의 합성 논문 레코드 + key_insights"""
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(WORD_POOL)
+    # 초록은 미리 만든 1,000개를 재사용해 생성 비용/메모리를 줄임 (엑셀 기록량은 실제와 비슷)
+    abstract_pool = [' '.join(rng.choice(vocabulary, size=rng.integers(80, 200))) for _ in range(1000)]
+    keyword_pool = [f"{a} {b}" for a in WORD_POOL for b in WORD_POOL[:10]]
+    keyword_weights = 1.0 / np.arange(1, len(keyword_pool) + 1)  # Zipf 분포 키워드
+    keyword_weights /= keyword_weights.sum()
+
+    n_categories = rng.integers(1, 4, size=n_rows)
+    category_ids = rng.integers(len(CATEGORY_POOL), size=(n_rows, 3))
+    abstract_ids = rng.integers(len(abstract_pool), size=n_rows)
+    keyword_ids = rng.choice(len(keyword_pool), size=(n_rows, 3), p=keyword_weights)
+    published = (np.datetime64('2018-01-01') + rng.integers(0, 8 * 365, size=n_rows)).astype(str)
+    collected_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    papers = []
+    for i in range(n_rows):
+        categories = [CATEGORY_POOL[c] for c in category_ids[i, :n_categories[i]]]
+        abstract = abstract_pool[abstract_ids[i]]
+        papers.append({
+            'id': i + 1,
+            'title': f"Synthetic paper {i} on {keyword_pool[keyword_ids[i, 0]]}",
+            'authors': f"Author {i % 997}, Author {i % 991}",
+            'published_date': published[i],
+            'primary_category': categories[0],
+            'categories': ', '.join(categories),
+            'abstract': abstract,
+            'word_count': abstract.count(' ') + 1,
+            'arxiv_id': f"{2000 + i // 100000}.{i % 100000:05d}",
+            'pdf_url': f"http://arxiv.org/pdf/{i}",
+            'arxiv_url': f"http://arxiv.org/abs/{i}",
+            'journal_ref': '',
+            'doi': '',
+            'comment': '',
+            'collected_at': collected_at,
+        })
+    key_insights = [', '.join(keyword_pool[k] for k in row) for row in keyword_ids]
+    return papers, key_insights
+
+
+def synthetic_embeddings(n_rows, dimensions, n_topics=20, failed_ratio=0.001, seed=42, block_size=50000):
+    """주제 중심 + 잡음으로 만든 정규화 float32 임베딩 (일부 행은 임베딩 실패처럼 NaN)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_topics, dimensions), dtype=np.float32)
+    topics = rng.integers(n_topics, size=n_rows)
+    embeddings = np.empty((n_rows, dimensions), dtype=np.float32)
+    # float64 중간 배열 없이 블록 단위로 생성 (1M x 1536에서도 결과 배열 크기만 사용)
+    for start in range(0, n_rows, block_size):
+        end = min(start + block_size, n_rows)
+        noise = rng.standard_normal((end - start, dimensions), dtype=np.float32) * 2
+        embeddings[start:end] = l2_normalize(centers[topics[start:end]] + noise)
+    embeddings[rng.random(n_rows) < failed_ratio] = np.nan
+    return embeddings
+
+
+def measure(func, repeat=1, trace_memory=True):
+    """func를 repeat회 실행한 최소 시간(초)과 별도 1회 실행의 최대 추가 메모리(MB), 마지막 반환값"""
+    def run_quietly():
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                result = func()
+        except Exception as e:
+            raise BenchmarkStageError(f"{type(e).__name__}: {e}") from e
+        # 분석기 메서드는 실패해도 예외 대신 ❌ 메시지를 출력하므로 출력으로 판단
+        failures = [line for line in output.getvalue().splitlines() if '❌' in line]
+        if failures:
+            raise BenchmarkStageError(failures[0].strip())
+        return result
+
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start_time = time.perf_counter()
+        result = run_quietly()
+        timings.append(time.perf_counter() - start_time)
+
+    peak_mb = None
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        try:
+            result = run_quietly()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_mb = (peak - baseline) / 1e6
+    return min(timings), peak_mb, result
+
+
+def _offline_analyzer():
+    """API 호출 없이 수치 단계만 쓰는 분석기 (클라이언트 생성에만 키가 필요하므로 더미 키 사용)"""
+    from paper_analyzer import PaperAnalyzer
+
+    original_key = Config.OPENAI_API_KEY
+    Config.OPENAI_API_KEY = original_key or 'benchmark-offline'
+    try:
+        return PaperAnalyzer()
+    finally:
+        Config.OPENAI_API_KEY = original_key
+
+
+def _clustering_stage(method):
+    """결과 키 호환: 기본 방식(kmeans)은 기존 단계 이름 유지"""
+    return 'perform_clustering' if method == 'kmeans' else f'perform_clustering[{method}]'
+
+
+def run_suite(rows_list, dims_list, n_clusters, repeat=1, trace_memory=True, excel_max_rows=200000,
+              clustering_methods=('kmeans',)):
+    """행 수 x 차원 조합별로 단계를 측정해 결과 레코드 목록 반환"""
+    from paper_collector import PaperCollector
+    import sklearn.cluster  # noqa: F401  첫 측정에 sklearn 임포트 시간이 섞이지 않도록 미리 로드
+
+    results = []
+
+    def record(stage, n_rows, dimensions, func):
+        label = f"{stage} (rows={n_rows}" + (f", dims={dimensions})" if dimensions else ")")
+        entry = {'stage': stage, 'rows': n_rows, 'dims': dimensions}
+        try:
+            seconds, peak_mb, result = measure(func, repeat, trace_memory)
+            entry.update(status='ok', seconds=round(seconds, 4),
+                         peak_mb=round(peak_mb, 2) if peak_mb is not None else None)
+            memory_text = f", 최대 {peak_mb:.1f}MB" if peak_mb is not None else ''
+            print(f"  ⏱️ {label}: {seconds:.3f}초{memory_text}")
+        except BenchmarkStageError as e:
+            result = None
+            entry.update(status='error', error=str(e))
+            print(f"  ❌ {label}: {e}")
+        results.append(entry)
+        return result
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for n_rows in rows_list:
+            print(f"\n📐 합성 코퍼스 {n_rows:,}개 생성 중...")
+            papers, key_insights = synthetic_papers(n_rows)
+
+            collector = PaperCollector()
+            collector.papers = papers
+            df = record('classify_papers_by_category', n_rows, None, collector.classify_papers_by_category)
+            if df is None:
+                continue
+            del papers
+            collector.papers = None
+
+            analyzer = _offline_analyzer()
+            record('_extract_common_keywords', n_rows, None,
+                   lambda: analyzer._extract_common_keywords(key_insights))
+
+            analyzer.papers_df = df.assign(key_insights=key_insights)
+            for dimensions in dims_list:
+                analyzer.embeddings = synthetic_embeddings(n_rows, dimensions)
+                original_method = Config.CLUSTERING_CONFIG['clustering_method']
+                for method in clustering_methods:
+                    Config.CLUSTERING_CONFIG['clustering_method'] = method
+                    try:
+                        labels = record(_clustering_stage(method), n_rows, dimensions,
+                                        lambda: analyzer.perform_clustering(n_clusters))
+                    finally:
+                        Config.CLUSTERING_CONFIG['clustering_method'] = original_method
+                    if labels is not None:
+                        results[-1]['cohesion'] = round(cosine_cohesion(analyzer.embeddings, labels), 4)
+                        print(f"     📏 cohesion {results[-1]['cohesion']:.4f}")
+                analyzer.embeddings = None
+            if 'cluster' not in analyzer.papers_df.columns:
+                continue
+
+            record('analyze_clusters', n_rows, None, analyzer.analyze_clusters)
+
+            if n_rows > excel_max_rows:
+                print(f"  ⏭️ 엑셀 저장 건너뜀 ({n_rows:,}행 > --excel-max-rows {excel_max_rows:,})")
+                continue
+            collected_file = os.path.join(output_dir, 'collected.xlsx')
+            record('save_to_excel', n_rows, None, lambda: collector.save_to_excel(df, collected_file))
+
+            original_filename = Config.OUTPUT_CONFIG['excel_filename']
+            Config.OUTPUT_CONFIG['excel_filename'] = os.path.join(output_dir, 'analysis.xlsx')
+            try:
+                record('save_analysis_results', n_rows, None, analyzer.save_analysis_results)
+            finally:
+                Config.OUTPUT_CONFIG['excel_filename'] = original_filename
+    return results
+
+
+def print_clustering_comparison(results):
+    """같은 행 수/차원에서 클러스터링 방식별 시간과 품질을 기본(kmeans) 대비로 출력"""
+    ok = {_key(entry): entry for entry in results if entry['status'] == 'ok' and entry.get('cohesion') is not None}
+    rows = [(key, entry) for key, entry in ok.items() if key[0] != 'perform_clustering']
+    if not rows:
+        return
+    print(f"\n{'방식':<30}{'행':>9}{'차원':>6}{'속도 향상':>10}{'cohesion':>10}{'kmeans':>9}")
+    for (stage, n_rows, dims), entry in rows:
+        base = ok.get(('perform_clustering', n_rows, dims))
+        if base is None:
+            continue
+        speedup = base['seconds'] / entry['seconds'] if entry['seconds'] else float('inf')
+        print(f"{stage:<30}{n_rows:>9}{dims:>6}{speedup:>9.1f}x{entry['cohesion']:>10.4f}{base['cohesion']:>9.4f}")
+
+
+def environment_info():
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def _key(entry):
+    return entry['stage'], entry['rows'], entry['dims']
+
+
+def compare_with_baseline(results, baseline, time_tolerance, memory_tolerance, min_seconds, min_mb,
+                          quality_tolerance=0.005):
+    """기준 대비 느려지거나 메모리가 늘어나거나 클러스터 품질이 떨어진 단계 목록 (기준에 없는 단계는 비교하지 않음)"""
+    baseline_by_key = {_key(entry): entry for entry in baseline['results'] if entry.get('status') == 'ok'}
+    regressions = []
+    print(f"\n{'단계':<30}{'행':>9}{'차원':>6}{'시간(초)':>10}{'기준':>9}{'비율':>7}{'메모리(MB)':>12}{'기준':>9}")
+    for entry in results:
+        base = baseline_by_key.get(_key(entry))
+        if base is None:
+            continue
+        dims = entry['dims'] or '-'
+        if entry['status'] != 'ok':
+            regressions.append(f"{entry['stage']} rows={entry['rows']} dims={dims}: 실패 ({entry['error']})")
+            continue
+
+        ratio = entry['seconds'] / base['seconds'] if base['seconds'] else float('inf')
+        marks = ''
+        if (entry['seconds'] > base['seconds'] * (1 + time_tolerance)
+                and entry['seconds'] - base['seconds'] > min_seconds):
+            marks += ' ⏱️'
+            regressions.append(f"{entry['stage']} rows={entry['rows']} dims={dims}: "
+                               f"{base['seconds']:.3f}초 → {entry['seconds']:.3f}초 ({ratio:.2f}배)")
+        if (entry.get('peak_mb') is not None and base.get('peak_mb') is not None
+                and entry['peak_mb'] > base['peak_mb'] * (1 + memory_tolerance)
+                and entry['peak_mb'] - base['peak_mb'] > min_mb):
+            marks += ' 💾'
+            regressions.append(f"{entry['stage']} rows={entry['rows']} dims={dims}: "
+                               f"메모리 {base['peak_mb']:.1f}MB → {entry['peak_mb']:.1f}MB")
+
+        if (entry.get('cohesion') is not None and base.get('cohesion') is not None
+                and entry['cohesion'] < base['cohesion'] - quality_tolerance):
+            marks += ' 📏'
+            regressions.append(f"{entry['stage']} rows={entry['rows']} dims={dims}: "
+                               f"cohesion {base['cohesion']:.4f} → {entry['cohesion']:.4f}")
+
+        memory = f"{entry['peak_mb']:.1f}" if entry.get('peak_mb') is not None else '-'
+        base_memory = f"{base['peak_mb']:.1f}" if base.get('peak_mb') is not None else '-'
+        print(f"{entry['stage']:<30}{entry['rows']:>9}{dims:>6}{entry['seconds']:>10.3f}{base['seconds']:>9.3f}"
+              f"{ratio:>7.2f}{memory:>12}{base_memory:>9}{marks}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='분석 단계 합성 데이터 벤치마크')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+    parser.add_argument('--rows', type=int, nargs='+', default=None, help='논문 수 목록 (프로필 대신)')
+    parser.add_argument('--dims', type=int, nargs='+', default=None, help='임베딩 차원 목록 (프로필 대신)')
+    parser.add_argument('--n-clusters', type=int, default=None)
+    parser.add_argument('--clustering-methods', nargs='+', choices=['kmeans', 'spherical'],
+                        default=['kmeans', 'spherical'], help='비교할 클러스터링 방식')
+    parser.add_argument('--repeat', type=int, default=3, help='시간 측정 반복 횟수 (최솟값 사용)')
+    parser.add_argument('--no-memory', action='store_true', help='tracemalloc 메모리 측정 생략')
+    parser.add_argument('--excel-max-rows', type=int, default=200000,
+                        help='이보다 큰 코퍼스는 엑셀 저장 단계 생략 (엑셀 시트 최대 1,048,576행)')
+    parser.add_argument('--output', default='benchmark_results.json', help='결과 JSON 파일')
+    parser.add_argument('--baseline', default=None, help='비교할 기준 JSON 파일')
+    parser.add_argument('--save-baseline', nargs='?', const='benchmark_baseline.json', default=None,
+                        help='현재 결과를 기준 파일로 저장')
+    parser.add_argument('--time-tolerance', type=float, default=0.25, help='허용 시간 증가율 (0.25 = 25%%)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.25, help='허용 메모리 증가율')
+    parser.add_argument('--min-seconds', type=float, default=0.05, help='이보다 작은 시간 차이는 무시')
+    parser.add_argument('--min-mb', type=float, default=5.0, help='이보다 작은 메모리 차이는 무시')
+    parser.add_argument('--quality-tolerance', type=float, default=0.005,
+                        help='허용 클러스터 품질(cohesion) 감소폭')
+    args = parser.parse_args()
+
+    rows_list = args.rows or PROFILES[args.profile]['rows']
+    dims_list = args.dims or PROFILES[args.profile]['dims']
+    n_clusters = args.n_clusters or Config.CLUSTERING_CONFIG['n_clusters']
+    print(f"🧪 벤치마크: 행 {rows_list}, 차원 {dims_list}, 클러스터 {n_clusters}개, 반복 {args.repeat}회")
+
+    start_time = time.time()
+    results = run_suite(rows_list, dims_list, n_clusters, args.repeat, not args.no_memory, args.excel_max_rows,
+                        args.clustering_methods)
+    print_clustering_comparison(results)
+    report = {
+        'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'environment': environment_info(),
+        'settings': {'n_clusters': n_clusters, 'repeat': args.repeat, 'trace_memory': not args.no_memory},
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {args.output} ({len(results)}개 측정, {time.time() - start_time:.1f}초)")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📌 기준 저장: {args.save_baseline}")
+
+    failed = [entry for entry in results if entry['status'] != 'ok']
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('environment', {}).get('machine') != report['environment']['machine']:
+            print("⚠️ 기준 파일과 장비 종류가 달라 비교 결과가 부정확할 수 있습니다")
+        regressions = compare_with_baseline(results, baseline, args.time_tolerance, args.memory_tolerance,
+                                            args.min_seconds, args.min_mb, args.quality_tolerance)
+
+    if regressions:
+        print(f"\n🚨 성능 회귀 {len(regressions)}건 (기준: {args.baseline})")
+        for regression in regressions:
+            print(f"  - {regression}")
+    if failed:
+        print(f"\n❌ 실패한 단계 {len(failed)}개")
+    if regressions or failed:
+        return 1
+    if args.baseline:
+        print("\n✅ 기준 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+임베딩 프로토타입 분류기: arXiv 카테고리 매핑에서 'Other'로 빠진 논문을 임베딩으로 재분류
+- 이미 분류된 논문의 임베딩으로 Config.CATEGORY_MAPPING 라벨마다 프로토타입(정규화 평균 벡터) 하나씩 계산
+- 'Other' 논문은 (정규화 임베딩 @ 프로토타입.T) 행렬곱 한 번으로 가장 가까운 라벨과 코사인 유사도(신뢰도)를 구함
+API 호출 없이 로컬에서만 계산하며, 행 수가 많으면 chunk_size 행씩 나눠 메모리 사용량을 제한합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from config import Config
+
+OTHER_LABEL = 'Other'
+
+
+def _normalize_rows(vectors):
+    """행별 L2 정규화 (길이 0인 행은 그대로 0)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class PrototypeClassifier:
+    """라벨별 프로토타입 벡터와의 코사인 유사도로 가장 가까운 카테고리 배정"""
+
+    def __init__(self, min_confidence=None, min_examples=None, chunk_size=None):
+        config = Config.CATEGORY_CLASSIFIER_CONFIG
+        self.min_confidence = config['min_confidence'] if min_confidence is None else min_confidence
+        self.min_examples = config['min_examples'] if min_examples is None else min_examples
+        self.chunk_size = chunk_size or config['chunk_size']
+        self.labels = []
+        self.prototypes = None
+
+    def fit(self, embeddings, categories):
+        """분류된 논문(라벨이 CATEGORY_MAPPING 값인 행)의 임베딩으로 프로토타입 계산"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        known_labels = list(dict.fromkeys(Config.CATEGORY_MAPPING.values()))
+        codes = pd.Categorical(categories, categories=known_labels).codes
+        valid = (codes >= 0) & ~np.isnan(embeddings).any(axis=1)
+        if not valid.any():
+            self.labels, self.prototypes = [], None
+            return self
+
+        # 라벨별 합계를 one-hot 희소행렬 곱 한 번으로 계산 (라벨 수만큼 전체를 다시 훑지 않음)
+        from scipy.sparse import csr_matrix
+        valid_codes = codes[valid]
+        one_hot = csr_matrix((np.ones(len(valid_codes), dtype=np.float32),
+                              (valid_codes, np.arange(len(valid_codes)))),
+                             shape=(len(known_labels), len(valid_codes)))
+        sums = np.asarray(one_hot @ _normalize_rows(embeddings[valid]))
+        counts = np.bincount(valid_codes, minlength=len(known_labels))
+
+        keep = counts >= self.min_examples
+        self.labels = [label for label, kept in zip(known_labels, keep) if kept]
+        self.prototypes = _normalize_rows(sums[keep] / counts[keep, None]) if keep.any() else None
+        return self
+
+    def predict(self, embeddings):
+        """가장 가까운 프로토타입 라벨과 코사인 유사도 (임베딩이 없는 행은 라벨 None, 유사도 NaN)"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        labels = np.full(len(embeddings), None, dtype=object)
+        confidence = np.full(len(embeddings), np.nan, dtype=np.float32)
+        if self.prototypes is None or len(embeddings) == 0:
+            return labels, confidence
+
+        label_array = np.array(self.labels, dtype=object)
+        valid_positions = np.flatnonzero(~np.isnan(embeddings).any(axis=1))
+        for start in range(0, len(valid_positions), self.chunk_size):
+            positions = valid_positions[start:start + self.chunk_size]
+            similarity = _normalize_rows(embeddings[positions]) @ self.prototypes.T
+            best = similarity.argmax(axis=1)
+            labels[positions] = label_array[best]
+            confidence[positions] = similarity[np.arange(len(positions)), best]
+        return labels, confidence
+
+    def refine(self, papers_df, embeddings, category_column='main_category'):
+        """'Other' 논문 재분류 (신뢰도가 min_confidence 이상인 경우만 라벨 변경)
+
+        papers_df에 category_confidence 컬럼을 추가합니다 (arXiv 매핑으로 분류된 논문은 NaN).
+        반환: 재분류된 논문 수
+        """
+        categories = papers_df[category_column].to_numpy(dtype=object, copy=True)
+        self.fit(embeddings, categories)
+        other_positions = np.flatnonzero(categories == OTHER_LABEL)
+        papers_df['category_confidence'] = np.full(len(papers_df), np.nan, dtype=np.float32)
+        if self.prototypes is None or len(other_positions) == 0:
+            return 0
+
+        predicted, confidence = self.predict(np.asarray(embeddings)[other_positions])
+        papers_df.iloc[other_positions, papers_df.columns.get_loc('category_confidence')] = confidence
+        accepted = confidence >= self.min_confidence  # NaN(임베딩 없음)은 False
+        categories[other_positions[accepted]] = predicted[accepted]
+        papers_df[category_column] = pd.Categorical(categories)
+        return int(accepted.sum())
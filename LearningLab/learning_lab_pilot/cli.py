@@ -0,0 +1,377 @@
+"""
+AI 논문 자동분류 시스템 - 통합 CLI
+수집(collect) / 분석(analyze) / 내보내기(export) / 리포트(report) 서브커맨드
+
+pandas, numpy, sklearn, openai 등 무거운 모듈은 서브커맨드 실행 시점에만 로드하므로
+`python cli.py collect --help` 같은 경로는 즉시 시작됩니다.
+
+사용 예:
+    python cli.py collect --demo
+    python cli.py collect --by-category --max-results 50
+    python cli.py collect --query "딥러닝" --sources arxiv kci crossref
+    python cli.py analyze --input collected_papers.xlsx --importtime
+    python cli.py analyze --queue work_queue.db --local-workers 4
+    python cli.py analyze --input collected_papers.xlsx --dry-run
+    python cli.py worker --queue work_queue.db --stage embedding
+    python cli.py ingest arxiv-metadata-oai-snapshot.json.gz
+    python cli.py analyze-store --store paper_store --n-clusters 50 --memory-limit-mb 8000
+    python cli.py trends --store paper_store --output trend_report.xlsx
+    python cli.py pipeline --input collected_papers.xlsx --n-clusters 8
+    python cli.py export --input ai_papers_analysis.xlsx --format csv
+    python cli.py report --input collected_papers.xlsx
+    python cli.py serve --port 8765
+    python cli.py watch --interval 3600
+"""
+
+import argparse
+import importlib
+import sys
+import time
+
+# 무거운 모듈 임포트 시간 기록 (-X importtime 형식으로 출력)
+_import_timings = []
+
+
+def lazy_import(module_name):
+    """모듈을 필요한 시점에 임포트하고 소요 시간 기록"""
+    already_loaded = module_name in sys.modules
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed_us = int((time.perf_counter() - start) * 1_000_000)
+    if not already_loaded:
+        _import_timings.append((module_name, elapsed_us))
+    return module
+
+
+def print_import_report():
+    """-X importtime 과 같은 형식으로 지연 임포트 시간 출력"""
+    print("\n⏱️ 지연 임포트 시간 (python -X importtime 형식)", file=sys.stderr)
+    print("import time: cumulative [us] | imported package", file=sys.stderr)
+    for module_name, elapsed_us in _import_timings:
+        print(f"import time: {elapsed_us:>15} | {module_name}", file=sys.stderr)
+    total_us = sum(elapsed_us for _, elapsed_us in _import_timings)
+    print(f"📦 총 지연 임포트: {total_us / 1000:.1f}ms", file=sys.stderr)
+    print("💡 전체 상세 내역: python -X importtime cli.py ...", file=sys.stderr)
+
+
+def cmd_collect(args):
+    """논문 수집 + 카테고리 분류 + 엑셀 저장"""
+    collector_module = lazy_import('paper_collector')
+    config_module = lazy_import('config')
+
+    if args.demo:
+        query = "artificial intelligence"
+        max_results = 10
+        output = args.output or 'demo_papers.xlsx'
+    else:
+        query = args.query
+        max_results = args.max_results or config_module.Config.ARXIV_SEARCH_CONFIG['max_results']
+        output = args.output or 'collected_papers.xlsx'
+
+    collector = collector_module.PaperCollector()
+    if args.sources:
+        # 여러 출처를 동시에 검색해 DOI/제목 기준으로 병합
+        papers = collector.collect_from_sources(query, args.sources, max_results_per_source=max_results)
+    elif args.by_category or args.queries:
+        # 여러 쿼리를 동시에 검색해 arxiv_id 기준으로 병합
+        queries = list(args.queries or [])
+        if args.by_category:
+            queries += collector.category_queries()
+        papers = collector.search_multiple_queries(queries, max_results_per_query=max_results)
+    else:
+        papers = collector.search_arxiv_papers(query, max_results=max_results)
+
+    if not papers:
+        print("❌ 논문 수집 실패")
+        return 1
+
+    df = collector.classify_papers_by_category()
+    collector.save_to_excel(df, output)
+    if not args.demo:
+        collector.generate_summary_report(df)
+    return 0
+
+
+def cmd_analyze(args):
+    """수집된 논문으로 GPT 요약 + 임베딩 + 클러스터링 실행"""
+    if args.dry_run:
+        planner_module = lazy_import('cost_planner')
+        planner_module.dry_run(args.input, args.n_clusters, queue_db=args.queue, local_workers=args.local_workers)
+        return 0
+    analysis_module = lazy_import('analysis_only')
+    analysis_module.analyze_existing_papers(args.input, args.n_clusters,
+                                            queue_db=args.queue, local_workers=args.local_workers)
+    return 0
+
+
+def cmd_worker(args):
+    """작업 큐에서 요약/임베딩 항목을 가져와 처리하는 워커"""
+    queue_module = lazy_import('work_queue')
+    queue_module.run_worker(args.stage, args.queue, exit_when_empty=not args.keep_running)
+    return 0
+
+
+def cmd_ingest(args):
+    """arXiv 메타데이터 스냅샷(JSON Lines / OAI-PMH XML)을 논문 저장소로 적재"""
+    store_module = lazy_import('paper_store')
+    ingest_module = lazy_import('snapshot_ingest')
+
+    store = store_module.PaperStore(args.store)
+    ingestor = ingest_module.SnapshotIngestor(store, chunk_size=args.chunk_size)
+    ingestor.ingest(args.files)
+    return 0
+
+
+def cmd_analyze_store(args):
+    """논문 저장소 전체를 메모리에 올리지 않고 청크 단위로 임베딩 + 클러스터링"""
+    store_module = lazy_import('paper_store')
+    out_of_core_module = lazy_import('out_of_core')
+
+    analyzer = out_of_core_module.OutOfCoreAnalyzer(
+        store_module.PaperStore(args.store), work_dir=args.work_dir, n_clusters=args.n_clusters,
+        memory_limit_mb=args.memory_limit_mb, chunk_size=args.chunk_size)
+    analyzer.run(args.output)
+    return 0
+
+
+def cmd_trends(args):
+    """논문 저장소의 part별 월간 집계로 카테고리/클러스터 추세와 신규 키워드 리포트"""
+    store_module = lazy_import('paper_store')
+    trends_module = lazy_import('trend_rollups')
+
+    rollups = trends_module.TrendRollups(store_module.PaperStore(args.store))
+    rollups.update(rebuild=args.rebuild)
+    if rollups.report(args.output, window=args.window, new_keyword_months=args.new_keyword_months) is None:
+        return 1
+    return 0
+
+
+def cmd_fulltext(args):
+    """수집된 논문의 PDF 전문 다운로드 + 텍스트 추출 + 청크 분할"""
+    delta_module = lazy_import('delta_export')
+    fulltext_module = lazy_import('fulltext')
+
+    try:
+        papers_df = delta_module.read_papers(args.input)
+    except Exception as e:
+        print(f"❌ 파일 로드 실패: {e}")
+        return 1
+
+    pipeline = fulltext_module.FullTextPipeline(source_dir=args.source_dir,
+                                                download_workers=args.download_workers,
+                                                extract_workers=args.extract_workers)
+    fulltext_df, chunks_df = pipeline.run(papers_df)
+
+    # 본문은 엑셀 셀 길이 제한(32,767자)을 넘으므로 Parquet로 저장
+    fulltext_df.to_parquet(f'{args.output_prefix}.parquet', index=False)
+    chunks_df.to_parquet(f'{args.output_prefix}_chunks.parquet', index=False)
+    print(f"💾 저장 완료: {args.output_prefix}.parquet, {args.output_prefix}_chunks.parquet")
+    return 0
+
+
+def cmd_pipeline(args):
+    """입력이 바뀐 단계만 다시 실행하는 증분 파이프라인"""
+    if args.dry_run:
+        if args.input is None:
+            print("❌ --dry-run은 --input(수집된 논문 엑셀)이 필요합니다.")
+            return 1
+        planner_module = lazy_import('cost_planner')
+        planner_module.dry_run(args.input, args.n_clusters, pipeline_cache_dir='.pipeline_cache', force=args.force)
+        return 0
+    pipeline_module = lazy_import('pipeline')
+    pipeline_module.run_incremental(args.input, args.query, args.n_clusters, force=args.force)
+    return 0
+
+
+def cmd_export(args):
+    """분석/수집 결과 엑셀의 시트를 CSV 또는 JSON으로 내보내기"""
+    pd = lazy_import('pandas')
+
+    try:
+        df = pd.read_excel(args.input, sheet_name=args.sheet)
+    except Exception as e:
+        print(f"❌ 파일 로드 실패: {e}")
+        return 1
+
+    output = args.output or args.input.rsplit('.', 1)[0] + f'.{args.format}'
+    if args.format == 'csv':
+        df.to_csv(output, index=False, encoding='utf-8-sig')
+    else:
+        df.to_json(output, orient='records', force_ascii=False, lines=True)
+
+    print(f"💾 {len(df)}개 행 내보내기 완료: {output}")
+    return 0
+
+
+def cmd_report(args):
+    """수집된 논문 엑셀로 요약 리포트 출력"""
+    delta_module = lazy_import('delta_export')
+    collector_module = lazy_import('paper_collector')
+
+    try:
+        df = delta_module.read_papers(args.input)
+    except Exception as e:
+        print(f"❌ 파일 로드 실패: {e}")
+        return 1
+
+    collector_module.PaperCollector().generate_summary_report(df)
+    return 0
+
+
+def cmd_serve(args):
+    """분석 스냅샷을 메모리에 올려 두고 HTTP 조회 서비스 실행"""
+    service_module = lazy_import('query_service')
+    service_module.serve(args.snapshot_dir, args.host, args.port, args.reload_interval)
+    return 0
+
+
+def cmd_watch(args):
+    """새 논문만 주기적으로 수집 → 분석 → 기존 클러스터 배정"""
+    watch_module = lazy_import('watch')
+    watcher = watch_module.PaperWatcher(query=args.query, feed_url=args.feed_url)
+    if args.once:
+        watcher.poll_once()
+    else:
+        watcher.run(args.interval, args.max_polls)
+    return 0
+
+
+def build_parser():
+    """서브커맨드 파서 구성 (무거운 모듈 임포트 없음)"""
+    parser = argparse.ArgumentParser(
+        prog='cli.py',
+        description='AI 논문 자동분류 시스템 통합 CLI'
+    )
+    parser.add_argument('--importtime', action='store_true',
+                        help='지연 임포트된 모듈의 로드 시간을 출력')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    collect = subparsers.add_parser('collect', help='arXiv 논문 수집 및 분류')
+    collect.add_argument('--query',
+                         default='artificial intelligence OR machine learning OR deep learning OR AI technology',
+                         help='arXiv 검색 쿼리')
+    collect.add_argument('--max-results', type=int, default=None,
+                         help='최대 수집 논문 수, 다중 쿼리 시 쿼리당 (기본: Config.ARXIV_SEARCH_CONFIG)')
+    collect.add_argument('--output', default=None, help='저장할 엑셀 파일명')
+    collect.add_argument('--queries', nargs='+', default=None,
+                         help='동시에 검색할 여러 쿼리 (결과는 arxiv_id로 병합)')
+    collect.add_argument('--by-category', action='store_true',
+                         help='Config.CATEGORY_MAPPING 카테고리별 쿼리를 동시에 검색')
+    collect.add_argument('--sources', nargs='+', default=None, choices=['arxiv', 'kci', 'crossref'],
+                         help='동시에 검색할 출처 (결과는 DOI/제목으로 병합, KCI는 KCI_API_KEY 필요)')
+    collect.add_argument('--demo', action='store_true', help='빠른 데모 모드 (10개 수집)')
+    collect.set_defaults(func=cmd_collect)
+
+    analyze = subparsers.add_parser('analyze', help='GPT 요약 + 클러스터링')
+    analyze.add_argument('--input', default=None,
+                         help='수집된 논문 엑셀 (기본: collected_papers.xlsx → demo_papers.xlsx)')
+    analyze.add_argument('--n-clusters', type=int, default=None,
+                         help='클러스터 수 (기본: Config.CLUSTERING_CONFIG)')
+    analyze.add_argument('--queue', default=None,
+                         help='요약/임베딩을 나눠 처리할 작업 큐 SQLite 파일 (예: work_queue.db)')
+    analyze.add_argument('--local-workers', type=int, default=0,
+                         help='--queue 사용 시 단계별로 띄울 로컬 워커 프로세스 수')
+    analyze.add_argument('--dry-run', action='store_true',
+                         help='API 호출 없이 요청 수/토큰/비용/소요 시간만 추정')
+    analyze.set_defaults(func=cmd_analyze)
+
+    worker = subparsers.add_parser('worker', help='작업 큐 워커 (여러 프로세스/호스트에서 실행 가능)')
+    worker.add_argument('--queue', default=None, help='작업 큐 SQLite 파일 (기본: Config.WORK_QUEUE_CONFIG)')
+    worker.add_argument('--stage', choices=['summary', 'embedding'], required=True)
+    worker.add_argument('--keep-running', action='store_true',
+                        help='대기 항목이 없어도 종료하지 않고 계속 대기')
+    worker.set_defaults(func=cmd_worker)
+
+    ingest = subparsers.add_parser('ingest', help='arXiv 메타데이터 스냅샷 대량 적재')
+    ingest.add_argument('files', nargs='+', help='스냅샷 파일 (.json/.jsonl/.xml, .gz 가능)')
+    ingest.add_argument('--store', default=None, help='저장소 디렉토리 (기본: Config.STORE_CONFIG)')
+    ingest.add_argument('--chunk-size', type=int, default=None, help='청크당 논문 수')
+    ingest.set_defaults(func=cmd_ingest)
+
+    analyze_store = subparsers.add_parser('analyze-store', help='메모리보다 큰 저장소의 청크 단위 분석')
+    analyze_store.add_argument('--store', default=None, help='저장소 디렉토리 (기본: Config.STORE_CONFIG)')
+    analyze_store.add_argument('--n-clusters', type=int, default=None)
+    analyze_store.add_argument('--memory-limit-mb', type=int, default=None,
+                               help='청크 크기 계산 기준 메모리 한도 (기본: Config.OUT_OF_CORE_CONFIG)')
+    analyze_store.add_argument('--chunk-size', type=int, default=None, help='청크당 논문 수 (지정 시 메모리 한도 무시)')
+    analyze_store.add_argument('--work-dir', default=None, help='memmap/진행 상태 디렉토리')
+    analyze_store.add_argument('--output', default=None, help='결과 저장소 디렉토리')
+    analyze_store.set_defaults(func=cmd_analyze_store)
+
+    trends = subparsers.add_parser('trends', help='저장소 월별 추세 리포트 (증분 집계)')
+    trends.add_argument('--store', default=None, help='저장소 디렉토리 (기본: Config.STORE_CONFIG)')
+    trends.add_argument('--output', default=None, help='추세 리포트 엑셀 파일 (지정 시 저장)')
+    trends.add_argument('--window', type=int, default=None,
+                        help='성장률 비교 기간(개월, 기본: Config.TREND_CONFIG)')
+    trends.add_argument('--new-keyword-months', type=int, default=None,
+                        help='신규 키워드로 볼 최근 기간(개월)')
+    trends.add_argument('--rebuild', action='store_true', help='모든 part의 집계를 다시 계산')
+    trends.set_defaults(func=cmd_trends)
+
+    fulltext = subparsers.add_parser('fulltext', help='PDF 전문 다운로드 및 텍스트 추출')
+    fulltext.add_argument('--input', default='collected_papers.xlsx', help='수집된 논문 엑셀')
+    fulltext.add_argument('--source-dir', default=None,
+                          help='HTTP 대신 PDF를 가져올 로컬 디렉토리 (<arxiv_id>.pdf)')
+    fulltext.add_argument('--download-workers', type=int, default=None, help='동시 다운로드 수')
+    fulltext.add_argument('--extract-workers', type=int, default=None, help='추출 프로세스 수')
+    fulltext.add_argument('--output-prefix', default='fulltext', help='출력 Parquet 파일 접두어')
+    fulltext.set_defaults(func=cmd_fulltext)
+
+    pipeline = subparsers.add_parser('pipeline', help='변경된 단계만 재실행하는 증분 파이프라인')
+    pipeline.add_argument('--input', default=None,
+                          help='수집된 논문 엑셀 (없으면 arXiv 수집 단계부터 실행)')
+    pipeline.add_argument('--query', default=None, help='수집 단계의 arXiv 검색 쿼리')
+    pipeline.add_argument('--n-clusters', type=int, default=None,
+                          help='클러스터 수 (기본: Config.CLUSTERING_CONFIG)')
+    pipeline.add_argument('--force', nargs='*', default=[], metavar='STAGE',
+                          help='강제로 재실행할 단계 이름 (예: summarize embed)')
+    pipeline.add_argument('--dry-run', action='store_true',
+                          help='실행하지 않고 캐시를 반영한 비용/소요 시간만 추정')
+    pipeline.set_defaults(func=cmd_pipeline)
+
+    export = subparsers.add_parser('export', help='엑셀 결과를 CSV/JSON으로 내보내기')
+    export.add_argument('--input', default='ai_papers_analysis.xlsx', help='입력 엑셀 파일')
+    export.add_argument('--sheet', default='분석결과', help='내보낼 시트명')
+    export.add_argument('--format', choices=['csv', 'json'], default='csv')
+    export.add_argument('--output', default=None, help='출력 파일명')
+    export.set_defaults(func=cmd_export)
+
+    report = subparsers.add_parser('report', help='수집 결과 요약 리포트')
+    report.add_argument('--input', default='collected_papers.xlsx', help='수집된 논문 엑셀')
+    report.set_defaults(func=cmd_report)
+
+    serve = subparsers.add_parser('serve', help='논문 조회/유사도/클러스터 배정 HTTP 서비스')
+    serve.add_argument('--snapshot-dir', default=None, help='스냅샷 디렉토리 (기본: Config.SERVICE_CONFIG)')
+    serve.add_argument('--host', default=None, help='바인딩 주소')
+    serve.add_argument('--port', type=int, default=None, help='포트')
+    serve.add_argument('--reload-interval', type=float, default=None,
+                       help='새 스냅샷 확인 주기(초), 0이면 POST /reload로만 교체')
+    serve.set_defaults(func=cmd_serve)
+
+    watch = subparsers.add_parser('watch', help='새 논문 모니터링 (증분 분석)')
+    watch.add_argument('--query', default=None, help='arXiv 검색 쿼리 (기본: CATEGORY_MAPPING 카테고리)')
+    watch.add_argument('--interval', type=int, default=None, help='확인 주기(초)')
+    watch.add_argument('--once', action='store_true', help='한 번만 확인하고 종료')
+    watch.add_argument('--max-polls', type=int, default=None, help='확인 횟수 제한')
+    watch.add_argument('--feed-url', default=None,
+                       help='arXiv API 대신 사용할 Atom 피드 주소 형식 (예: http://127.0.0.1:8000/feed.xml?{})')
+    watch.set_defaults(func=cmd_watch)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    start_time = time.perf_counter()
+    try:
+        return args.func(args)
+    finally:
+        if args.importtime:
+            print_import_report()
+            print(f"⏱️ 서브커맨드 실행 시간: {time.perf_counter() - start_time:.1f}초", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,12 +10,26 @@ class Config:
     # API 키들
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     CLAUDE_API_KEY = os.getenv('CLAUDE_API_KEY')
+    KCI_API_KEY = os.getenv('KCI_API_KEY')
     
     # arXiv 검색 설정
     ARXIV_SEARCH_CONFIG = {
         'max_results': 30,
         'sort_by': 'relevance',
-        'delay_between_requests': 0.5  # API 제한 고려
+        'delay_between_requests': 0.5,  # API 제한 고려
+        'max_workers': 4,               # 다중 쿼리 동시 검색 스레드 수
+        'min_request_interval': 3.0     # 모든 스레드 공유 arXiv 요청 최소 간격(초)
+    }
+    
+    # 다중 출처 수집 설정 (sources.py)
+    SOURCES_CONFIG = {
+        'enabled': ['arxiv'],         # 기본 출처 ('arxiv', 'kci', 'crossref')
+        'max_workers': 4,             # 출처 동시 검색 수
+        'timeout': 30,
+        'arxiv_url': None,            # None이면 arXiv API 기본 주소
+        'kci_url': 'https://open.kci.go.kr/po/openapi/openApiSearch.kci',
+        'crossref_url': 'https://api.crossref.org/works',
+        'crossref_mailto': None       # 지정 시 Crossref polite pool 사용
     }
     
     # GPT 설정
@@ -23,15 +37,163 @@ class Config:
         'model': 'gpt-4o-mini',  # 비용 효율적인 모델
         'max_tokens': 150,       # 요약문 길이
         'temperature': 0.3,      # 일관성 있는 요약을 위해 낮게
-        'timeout': 30
+        'timeout': 30,
+        'insight_mode': 'paper',  # 'paper' (논문별 키워드 추출) or 'cluster' (클러스터별 이름/키워드)
+        'cluster_sample_size': 5,  # 클러스터 이름 생성 시 사용할 중심 근처 논문 수
+        'insight_max_tokens': 50,        # 논문별 키워드 응답 길이
+        'cluster_name_max_tokens': 100,  # 클러스터 이름/키워드 응답 길이
+        'request_interval': 1,           # 순차 실행 시 요청 사이 대기(초, API 제한 고려)
+        'normalize_abstracts': True      # URL/LaTeX/상용구를 지운 clean_abstract로 요청 (토큰 절감)
+    }
+    
+    # 요약 티어 라우팅 설정 (summary_router.py) - 규칙에 맞는 논문은 GPT 대신 로컬 추출 요약 (영문 원문 문장)
+    SUMMARY_ROUTING_CONFIG = {
+        'enabled': False,
+        'max_words': 80,          # word_count가 이 값 이하인 짧은 초록은 로컬 (None이면 사용 안 함)
+        'local_categories': [],   # 로컬로 보낼 main_category 값 (예: ['Other'])
+        'rule': None,             # DataFrame.eval 조건식 (예: "published_date < '2020-01-01'")
+        'max_sentences': 2,       # 로컬 요약 문장 수
+        'n_keywords': 2           # 로컬 키워드 수 (insight_mode='paper')
+    }
+    
+    # 공용 전송 계층 설정 (HTTP 세션 / 재시도)
+    TRANSPORT_CONFIG = {
+        'pool_maxsize': 16,           # 공유 HTTP 세션 커넥션 풀 크기
+        'max_retries': 5,             # 항목별 최대 재시도 횟수
+        'backoff_base': 1.0,          # 지수 백오프 기본 대기(초)
+        'backoff_max': 60.0,          # 백오프 최대 대기(초)
+        'retry_queue_file': 'retry_queue.json'
     }
     
     # 클러스터링 설정
     CLUSTERING_CONFIG = {
         'n_clusters': 5,         # 기본 클러스터 수
         'embedding_model': 'text-embedding-3-small',  # OpenAI 임베딩 모델
-        'clustering_method': 'kmeans',  # 'kmeans' or 'hdbscan'
-        'min_cluster_size': 2
+        'embedding_batch_size': 10,      # 임베딩 요청당 텍스트 수
+        'embedding_dimensions': None,    # 축소할 차원 (예: 256, 512), None이면 모델 기본(1536)
+        'dimension_reduction': 'api',    # 'api' (dimensions 파라미터로 요청) or 'pca' (로컬 PCA 투영)
+        'pca_model_file': 'embedding_pca.npz',  # 'pca' 방식에서 학습한 투영 저장 위치
+        'clustering_method': 'kmeans',  # 'kmeans' (유클리드) or 'spherical' (코사인, spherical_kmeans.py)
+        'spherical_n_init': 10,          # 구면 K-means 재시작 수 (동시에 실행)
+        'spherical_max_iter': 100,
+        'spherical_tol': 1e-4,           # 목적함수 상대 개선이 이보다 작으면 조기 종료
+        'spherical_seed_sample_size': 20000,  # k-means++ 초기화에 쓰는 표본 수
+        'spherical_workers': None,       # 재시작 동시 실행 스레드 수 (None이면 CPU 코어 수)
+        'min_cluster_size': 2,
+        'hierarchical': False,   # True면 상위 클러스터 → 하위 클러스터 2단계 분류
+        'n_subclusters': 5,      # 상위 클러스터당 하위 클러스터 수
+        'subcluster_workers': None  # 하위 클러스터링 프로세스 수 (None이면 CPU 코어 수)
+    }
+    
+    # 'Other' 논문 재분류 설정 (category_classifier.py, 임베딩 프로토타입 최근접 배정)
+    CATEGORY_CLASSIFIER_CONFIG = {
+        'enabled': True,
+        'min_confidence': 0.3,   # 프로토타입과의 코사인 유사도가 이보다 낮으면 'Other' 유지
+        'min_examples': 5,       # 프로토타입을 만들 라벨별 최소 논문 수
+        'chunk_size': 100000     # 유사도 행렬곱 한 번에 처리할 행 수
+    }
+    
+    # 작업 큐 설정 (work_queue.py, 요약/임베딩 분산 처리)
+    WORK_QUEUE_CONFIG = {
+        'db_path': 'work_queue.db',  # SQLite 파일 (여러 호스트면 공유 파일시스템에 위치)
+        'lease_seconds': 300,        # 임대 후 이 시간 안에 결과가 없으면 다른 워커에게 재배정
+        'max_attempts': 5,           # 항목별 최대 시도 횟수
+        'batch_size': 10,            # 워커가 한 번에 임대할 항목 수
+        'poll_interval': 2,          # 대기 항목이 없을 때 확인 주기(초)
+        'journal_mode': 'DELETE'     # SQLite 저널 (공유 파일시스템은 DELETE, 한 호스트에서만 쓰면 'WAL' 가능)
+    }
+    
+    # 분석 비용/시간 사전 추정 설정 (cost_planner.py, analyze --dry-run)
+    COST_CONFIG = {
+        'prices_per_1m_tokens': {        # USD (입력, 출력) - 요금표 변경 시 갱신
+            'gpt-4o-mini': (0.15, 0.60),
+            'gpt-4o': (2.50, 10.00),
+            'text-embedding-3-small': (0.02, 0.0),
+            'text-embedding-3-large': (0.13, 0.0),
+            'text-embedding-ada-002': (0.10, 0.0)
+        },
+        'rate_limits': {                 # 계정 등급에 맞게 조정 (요청/분, 토큰/분)
+            'gpt-4o-mini': {'rpm': 500, 'tpm': 200000},
+            'text-embedding-3-small': {'rpm': 3000, 'tpm': 1000000},
+            'default': {'rpm': 500, 'tpm': 200000}
+        },
+        'latency_seconds': {'chat': 1.5, 'embedding': 0.5},  # 요청당 평균 응답 시간
+        'output_fill_ratio': 0.7         # max_tokens 중 실제 생성되는 비율 (예상 비용용)
+    }
+    
+    # 논문 저장소 설정 (청크 단위 Parquet)
+    STORE_CONFIG = {
+        'store_dir': 'paper_store',
+        'chunk_size': 50000      # 청크(part 파일)당 논문 수
+    }
+
+    # 저장소 추세 집계 설정 (trend_rollups.py, part별 월간 집계)
+    TREND_CONFIG = {
+        'rollup_dir': 'rollups',         # store_dir 아래 집계 디렉토리
+        'update_on_append': True,        # PaperStore.append 시 새 part 집계를 바로 저장
+        'growth_window_months': 3,       # 성장률 비교 기간 (최근 N개월 vs 이전 N개월)
+        'new_keyword_months': 3,         # 이 기간 안에 처음 등장한 키워드를 신규로 표시
+        'top_keywords': 10
+    }
+
+    # 메모리보다 큰 저장소 분석 설정 (out-of-core)
+    OUT_OF_CORE_CONFIG = {
+        'work_dir': 'out_of_core_work',         # 임베딩/라벨 memmap, 진행 상태
+        'output_dir': 'out_of_core_output',     # cluster 컬럼을 붙인 결과 저장소 (PaperStore)
+        'summary_filename': 'out_of_core_summary.xlsx',
+        'memory_limit_mb': 8000,                # 청크 크기 계산 기준 메모리 한도
+        'embedding_batch_size': 100,            # 임베딩 API 요청당 텍스트 수
+        'kmeans_epochs': 2                      # MiniBatchKMeans partial_fit 반복 횟수
+    }
+    
+    # PDF 전문 처리 설정
+    FULLTEXT_CONFIG = {
+        'cache_dir': 'pdf_cache',     # arxiv_id별 PDF 캐시 디렉토리
+        'download_workers': 8,        # 동시 다운로드 수 (커넥션 풀 크기)
+        'extract_workers': None,      # 추출 프로세스 수 (None이면 CPU 코어 수)
+        'timeout': 60,                # 다운로드 타임아웃(초)
+        'chunk_words': 500,           # 임베딩용 청크 단어 수
+        'chunk_overlap_words': 50     # 청크 간 겹치는 단어 수
+    }
+    
+    # 증분 내보내기 설정 (delta_export.py)
+    # 켜면 collected_papers.xlsx 등을 읽는 곳(load_papers, 파이프라인, report/fulltext)은 대응하는 디렉토리의
+    # 파티션을 합쳐 읽음 (지금까지 내보낸 행 전체 누적)
+    DELTA_EXPORT_CONFIG = {
+        'enabled': False,                        # True면 통합 엑셀 대신 새/변경 행만 실행별 파티션으로 저장
+        'export_dir': 'delta_exports',           # <export_dir>/<엑셀 파일명>/run-*.xlsx + manifest.json
+        'format': 'xlsx',                        # 'xlsx' or 'parquet'
+        'exclude_columns': ['id', 'collected_at']  # 실행마다 바뀌어 변경 감지에서 제외할 컬럼
+    }
+    
+    # 로컬 조회 서비스 설정 (query_service.py)
+    SERVICE_CONFIG = {
+        'snapshot_dir': 'snapshots',  # 분석 스냅샷 디렉토리 (CURRENT 파일이 현재 버전을 가리킴)
+        'keep_snapshots': 3,          # 보관할 스냅샷 버전 수
+        'host': '127.0.0.1',
+        'port': 8765,
+        'default_k': 10,              # 유사 논문 기본 개수
+        'reload_interval': 5          # CURRENT 변경 확인 주기(초), 0이면 /reload 요청으로만 교체
+    }
+    
+    # 새 논문 모니터링 설정 (watch.py)
+    WATCH_CONFIG = {
+        'query': None,                  # None이면 CATEGORY_MAPPING 카테고리 전체 (cat:cs.AI OR ...)
+        'interval_seconds': 3600,       # 확인 주기(초)
+        'max_results_per_poll': 200,    # 한 번에 확인할 최대 논문 수
+        'feed_url': None,               # 로컬 Atom 피드 주소 형식 (None이면 arXiv API)
+        'state_file': 'watch_state.json',
+        'store_dir': 'watch_store',     # 새 논문 누적 저장소 (PaperStore)
+        'seen_ids_limit': 5000          # 중복 확인용으로 기억할 최근 arxiv_id 수
+    }
+    
+    # 시각화 설정
+    VISUALIZATION_CONFIG = {
+        'pca_sample_size': 20000,       # PCA 학습에 사용할 최대 샘플 수
+        'transform_chunk_size': 50000,  # 2D 투영 청크 크기
+        'scatter_max_points': 50000,    # 이보다 많으면 밀도 격자로 표시
+        'density_bins': 400,            # 밀도 격자 해상도
+        'dpi': 150
     }
     
     # 출력 파일 설정
@@ -0,0 +1,267 @@
+"""
+분석 실행 전 비용/시간 사전 추정 (dry-run) - API를 한 번도 호출하지 않음
+- 실제 요청과 같은 프롬프트(paper_analyzer의 프롬프트 함수)를 로컬에서 토큰화
+  (tiktoken이 있으면 정확한 토큰 수, 없으면 문자 수 기반 근사)
+- 작업 큐에 이미 완료된 항목, 파이프라인 캐시가 최신인 단계는 캐시 적중으로 빼고 계산
+- COST_CONFIG의 단가 / 속도 제한(RPM, TPM) / 응답 시간과 요청 사이 대기, 동시 실행 워커 수로
+  단계별 요청 수, 토큰, 비용, 소요 시간 추정
+
+출력 토큰은 max_tokens x output_fill_ratio로 예상하고, 상한(max_tokens 전부)도 함께 표시합니다.
+클러스터 이름 단계의 입력은 클러스터링 전에는 알 수 없어 평균 논문 길이로 추정합니다.
+
+사용 예:
+    python cli.py analyze --input collected_papers.xlsx --dry-run
+    python cli.py analyze --input collected_papers.xlsx --queue work_queue.db --local-workers 4 --dry-run
+    python cli.py pipeline --input collected_papers.xlsx --dry-run
+"""
+
+import math
+import os
+import numpy as np
+import pandas as pd
+from config import Config
+from paper_analyzer import (cluster_naming_prompt, embedding_text, insight_prompt, summary_prompt,
+                            work_keys)
+from schema import apply_schema
+from summary_router import route_papers
+from text_normalization import normalize_abstracts, report_token_reduction
+
+# 채팅 요청의 메시지 구조 토큰 (메시지당 3 + role 1 + 응답 시작 3)
+CHAT_MESSAGE_OVERHEAD = 7
+
+
+class TokenCounter:
+    """모델 토크나이저로 토큰 수 계산 (tiktoken이 없으면 근사)"""
+
+    def __init__(self, model):
+        try:
+            import tiktoken
+        except ImportError:
+            self.encoding = None
+            return
+        try:
+            self.encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            self.encoding = tiktoken.get_encoding('o200k_base')
+
+    @property
+    def exact(self):
+        return self.encoding is not None
+
+    def count(self, texts):
+        """텍스트 목록의 토큰 수 배열"""
+        if self.encoding is not None:
+            return np.array([len(tokens) for tokens in self.encoding.encode_ordinary_batch(list(texts))],
+                            dtype=np.int64)
+        # 근사: ASCII는 4글자당 1토큰, 한글 등 비ASCII 문자는 글자당 1토큰
+        counts = []
+        for text in texts:
+            non_ascii = (len(text.encode('utf-8')) - len(text)) // 2
+            counts.append(math.ceil((len(text) - non_ascii) / 4) + non_ascii)
+        return np.array(counts, dtype=np.int64)
+
+
+def load_corpus(excel_file=None):
+    """analysis_only와 같은 순서로 분석 대상 엑셀 로드 (전체논문 시트)"""
+    from delta_export import read_papers, resolve_input
+    candidates = [excel_file] if excel_file else ['collected_papers.xlsx', 'demo_papers.xlsx']
+    for path in candidates:
+        path = resolve_input(path)  # delta 모드면 증분 내보내기 디렉토리
+        if os.path.exists(path):
+            return path, apply_schema(read_papers(path))
+    raise FileNotFoundError(f"분석할 데이터가 없습니다: {', '.join(candidates)}")
+
+
+def estimate_seconds(requests, rate_tokens, serial_seconds, concurrency, limits):
+    """응답 대기(동시 실행 고려) / RPM / TPM 중 가장 느린 쪽을 소요 시간으로"""
+    if requests == 0:
+        return 0.0, '-'
+    candidates = {
+        '응답 대기': serial_seconds / max(concurrency, 1),
+        'RPM 제한': requests / limits['rpm'] * 60,
+        'TPM 제한': rate_tokens / limits['tpm'] * 60,
+    }
+    bottleneck = max(candidates, key=candidates.get)
+    return candidates[bottleneck], bottleneck
+
+
+def _cost(model, input_tokens, output_tokens):
+    prices = Config.COST_CONFIG['prices_per_1m_tokens'].get(model)
+    if prices is None:
+        return None
+    return (input_tokens * prices[0] + output_tokens * prices[1]) / 1e6
+
+
+def _limits(model):
+    rate_limits = Config.COST_CONFIG['rate_limits']
+    return rate_limits.get(model, rate_limits['default'])
+
+
+def plan_analysis(papers_df, n_clusters=None, queue_db=None, local_workers=0, cached_stages=()):
+    """단계별 요청/토큰/비용/시간 추정 (cached_stages: 파이프라인 캐시가 최신인 단계 이름)"""
+    gpt = Config.GPT_CONFIG
+    cost_config = Config.COST_CONFIG
+    chat_model = gpt['model']
+    embedding_model = Config.CLUSTERING_CONFIG['embedding_model']
+    per_paper_insight = gpt.get('insight_mode', 'paper') == 'paper'
+    n_clusters = n_clusters or Config.CLUSTERING_CONFIG['n_clusters']
+    fill_ratio = cost_config['output_fill_ratio']
+    latency = cost_config['latency_seconds']
+    interval = gpt['request_interval']
+    use_queue = queue_db is not None
+    concurrency = max(local_workers, 1) if use_queue else 1
+
+    titles = papers_df['title'].fillna('').astype(str).tolist()
+    abstracts = papers_df['abstract']
+    if gpt['normalize_abstracts']:
+        # 실제 실행과 같이 정규화한 초록(clean_abstract)으로 계산
+        abstracts = normalize_abstracts(abstracts)
+        report_token_reduction(papers_df['abstract'], abstracts, chat_model)
+    abstracts = abstracts.fillna('').astype(str).tolist()
+    n_papers = len(titles)
+
+    # 캐시 적중: 작업 큐에 완료된 항목 / 최신 파이프라인 캐시
+    keys = work_keys(papers_df)
+    done = {'summary': set(), 'embedding': set()}
+    if use_queue and os.path.exists(queue_db):
+        from work_queue import WorkQueue
+        queue = WorkQueue(queue_db)
+        done = {stage: queue.done_keys(stage) for stage in done}
+        queue.close()
+    pending = {
+        stage: np.array([stage_name not in cached_stages and key not in done[stage] for key in keys], dtype=bool)
+        for stage, stage_name in (('summary', 'summarize'), ('embedding', 'embed'))
+    }
+
+    # 요약 티어 라우팅: 로컬 추출 요약으로 가는 논문은 채팅 요청 없음 (캐시 열과 구분해 따로 표시)
+    local_tier = route_papers(papers_df)
+    local_pending = int((pending['summary'] & local_tier).sum())
+    pending['summary'] &= ~local_tier
+
+    chat_counter = TokenCounter(chat_model)
+    embedding_counter = TokenCounter(embedding_model)
+    stages = []
+
+    # 1. 요약 (+ 논문별 키워드): 논문마다 채팅 요청 1~2회
+    todo = np.flatnonzero(pending['summary'])
+    summary_tokens = chat_counter.count(summary_prompt(titles[i], abstracts[i]) for i in todo) + CHAT_MESSAGE_OVERHEAD
+    input_tokens = int(summary_tokens.sum())
+    requests = len(todo)
+    max_output = requests * gpt['max_tokens']
+    # 순차 실행은 논문마다 대기, 큐 워커는 요약 사이 대기 없음
+    serial_seconds = requests * (latency['chat'] + (0 if use_queue else interval))
+    if per_paper_insight:
+        insight_tokens = chat_counter.count(insight_prompt(titles[i], abstracts[i]) for i in todo) + CHAT_MESSAGE_OVERHEAD
+        input_tokens += int(insight_tokens.sum())
+        max_output += len(todo) * gpt['insight_max_tokens']
+        serial_seconds += len(todo) * (latency['chat'] + interval)  # 요약과 키워드 요청 사이 대기
+        requests += len(todo)
+    stages.append({
+        'stage': 'summarize', 'label': '요약' + (' + 키워드' if per_paper_insight else ''),
+        'model': chat_model, 'requests': requests, 'cached': n_papers - len(todo) - local_pending,
+        'input_tokens': input_tokens, 'output_tokens': int(max_output * fill_ratio), 'max_output_tokens': max_output,
+        # TPM 제한은 입력 토큰 + max_tokens로 계산됨
+        'rate_tokens': input_tokens + max_output, 'serial_seconds': serial_seconds,
+    })
+
+    # 2. 임베딩: 배치 요청
+    todo = np.flatnonzero(pending['embedding'])
+    batch_size = Config.WORK_QUEUE_CONFIG['batch_size'] if use_queue else Config.CLUSTERING_CONFIG['embedding_batch_size']
+    input_tokens = int(embedding_counter.count(embedding_text(titles[i], abstracts[i]) for i in todo).sum())
+    requests = math.ceil(len(todo) / batch_size)
+    stages.append({
+        'stage': 'embed', 'label': '임베딩', 'model': embedding_model, 'requests': requests,
+        'cached': n_papers - len(todo), 'input_tokens': input_tokens, 'output_tokens': 0, 'max_output_tokens': 0,
+        'rate_tokens': input_tokens,
+        'serial_seconds': requests * (latency['embedding'] + (0 if use_queue else interval)),
+    })
+
+    # 3. 클러스터 이름 ('cluster' 모드): 클러스터당 1회, 중심 근처 논문은 평균 길이로 추정
+    if not per_paper_insight:
+        naming_cached = 'export' in cached_stages
+        requests = 0 if naming_cached else min(n_clusters, n_papers)
+        sample_size = min(gpt['cluster_sample_size'], max(n_papers // max(n_clusters, 1), 1))
+        sample = np.random.default_rng(42).choice(n_papers, size=min(n_papers, 1000), replace=False) if n_papers else []
+        template_tokens = int(chat_counter.count([cluster_naming_prompt([])])[0]) + CHAT_MESSAGE_OVERHEAD
+        paper_tokens = chat_counter.count(f"제목: {titles[i]}\n초록: {abstracts[i]}" for i in sample)
+        per_request = template_tokens + sample_size * (float(paper_tokens.mean()) + 1 if len(paper_tokens) else 0)
+        input_tokens = int(requests * per_request)
+        max_output = requests * gpt['cluster_name_max_tokens']
+        stages.append({
+            'stage': 'cluster_naming', 'label': '클러스터 이름 (추정)', 'model': chat_model, 'requests': requests,
+            'cached': n_clusters if naming_cached else 0, 'input_tokens': input_tokens,
+            'output_tokens': int(max_output * fill_ratio), 'max_output_tokens': max_output,
+            'rate_tokens': input_tokens + max_output,
+            'serial_seconds': requests * (latency['chat'] + interval),
+        })
+
+    for stage in stages:
+        # 클러스터 이름은 분석 프로세스에서 순차 실행
+        stage_concurrency = concurrency if stage['stage'] != 'cluster_naming' else 1
+        stage['seconds'], stage['bottleneck'] = estimate_seconds(
+            stage['requests'], stage['rate_tokens'], stage['serial_seconds'], stage_concurrency,
+            _limits(stage['model']))
+        stage['cost'] = _cost(stage['model'], stage['input_tokens'], stage['output_tokens'])
+        stage['max_cost'] = _cost(stage['model'], stage['input_tokens'], stage['max_output_tokens'])
+
+    # 큐 모드에서는 요약/임베딩 워커가 동시에 돌아 두 단계 중 긴 쪽만큼 걸림
+    seconds = {stage['stage']: stage['seconds'] for stage in stages}
+    front = max(seconds['summarize'], seconds['embed']) if use_queue else seconds['summarize'] + seconds['embed']
+    known_costs = [stage['cost'] for stage in stages if stage['cost'] is not None]
+    return {
+        'papers': n_papers,
+        'mode': f"작업 큐 (워커 {concurrency}개/단계)" if use_queue else '순차 실행',
+        'local_summaries': local_pending,
+        'exact_tokens': chat_counter.exact,
+        'stages': stages,
+        'total_requests': sum(stage['requests'] for stage in stages),
+        'total_cost': sum(known_costs),
+        'total_max_cost': sum(stage['max_cost'] for stage in stages if stage['max_cost'] is not None),
+        'unknown_price_models': sorted({stage['model'] for stage in stages if stage['cost'] is None}),
+        'total_seconds': front + seconds.get('cluster_naming', 0.0),
+    }
+
+
+def _format_duration(seconds):
+    if seconds < 60:
+        return f"{seconds:.0f}초"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}분"
+    return f"{seconds / 3600:.1f}시간"
+
+
+def print_plan(plan):
+    """추정 결과 표 출력"""
+    print(f"\n🧮 비용/시간 사전 추정: 논문 {plan['papers']:,}개, {plan['mode']} (API 호출 없음)")
+    if not plan['exact_tokens']:
+        print("⚠️ tiktoken이 설치되지 않아 토큰 수는 문자 수 기반 근사치입니다 (pip install tiktoken)")
+    print(f"\n{'단계':<22}{'요청':>9}{'캐시':>9}{'입력 토큰':>14}{'출력 토큰(예상/상한)':>24}{'비용($)':>10}{'시간':>10}  병목")
+    for stage in plan['stages']:
+        output = f"{stage['output_tokens']:,}/{stage['max_output_tokens']:,}"
+        cost = f"{stage['cost']:.4f}" if stage['cost'] is not None else '?'
+        print(f"{stage['label']:<22}{stage['requests']:>9,}{stage['cached']:>9,}{stage['input_tokens']:>14,}"
+              f"{output:>24}{cost:>10}{_format_duration(stage['seconds']):>10}  {stage['bottleneck']}")
+    print(f"\n💰 예상 비용: ${plan['total_cost']:.4f} (상한 ${plan['total_max_cost']:.4f}), "
+          f"요청 {plan['total_requests']:,}회")
+    if plan['unknown_price_models']:
+        print(f"⚠️ 단가 미등록 모델 (COST_CONFIG에 추가 필요): {', '.join(plan['unknown_price_models'])}")
+    if plan['local_summaries']:
+        print(f"🪶 로컬 추출 요약 {plan['local_summaries']:,}개는 요약 요청에서 제외 (SUMMARY_ROUTING_CONFIG)")
+    print(f"⏱️ 예상 소요 시간 (API 단계): {_format_duration(plan['total_seconds'])}")
+
+
+def dry_run(excel_file=None, n_clusters=None, queue_db=None, local_workers=0, pipeline_cache_dir=None, force=()):
+    """analysis_only / pipeline 실행 계획만 계산해 출력 (pipeline_cache_dir를 주면 최신 단계는 캐시 적중)"""
+    path, papers_df = load_corpus(excel_file)
+    print(f"📚 {path}: {len(papers_df)}개 논문")
+
+    cached_stages = set()
+    if pipeline_cache_dir is not None:
+        from pipeline import build_analysis_graph
+        graph = build_analysis_graph(path, n_clusters=n_clusters, cache_dir=pipeline_cache_dir)
+        cached_stages = graph.fresh_stages(force)
+        print(f"🗂️ 파이프라인 캐시 최신 단계: {sorted(cached_stages) or '없음'}")
+
+    plan = plan_analysis(papers_df, n_clusters, queue_db, local_workers, cached_stages)
+    print_plan(plan)
+    return plan
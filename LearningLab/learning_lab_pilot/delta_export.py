@@ -0,0 +1,273 @@
+"""
+증분(delta) 내보내기: 이전 내보내기 이후 새로 생기거나 내용이 바뀐 행만 실행별 파티션 파일로 저장
+- 행 식별: arxiv_id (없으면 doi, 그것도 없으면 제목 해시)
+- 변경 감지: 내용 컬럼의 행 해시 (pandas.util.hash_pandas_object, 벡터화) — 매 실행 바뀌는 id/collected_at 제외
+  엑셀/Parquet로 저장했다 다시 읽어도 같은 해시가 나오도록 값을 통일한 뒤 계산
+  (날짜 → ISO 문자열, 숫자 → float64, 빈 문자열과 결측값은 같은 값)
+- 저장: <export_dir>/<name>/  (name = 통합 파일 이름에서 확장자를 뺀 것, 예: collected_papers)
+    run-YYYYmmdd-HHMMSS.xlsx  이번 실행의 새/변경 행 (+ 그 행이 속한 카테고리/클러스터 시트, 요약 시트)
+    exported_hashes.parquet   지금까지 내보낸 key → 해시 색인
+    manifest.json             실행별 파일, 새/변경 행 수
+기존 통합 엑셀을 다시 쓰지 않으므로 비용은 바뀐 행 수에 비례합니다.
+전체 데이터가 필요하면 load_delta_export()로 파티션을 합쳐 최신 행만 읽습니다 (지금까지 내보낸 전체 누적).
+delta 모드에서는 통합 파일 이름(collected_papers.xlsx 등)을 입력으로 받는 곳이 read_papers()/resolve_input()으로
+대응하는 디렉토리를 읽고, 파이프라인은 manifest.json으로 단계 출력의 최신 여부를 판단합니다.
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+from config import Config
+from schema import DATE_COLUMNS, apply_schema
+
+CHANGE_COLUMN = '변경구분'  # 'new' / 'changed'
+MANIFEST_FILE = 'manifest.json'
+
+
+def export_location(filename, config=None):
+    """통합 파일 이름에 대응하는 증분 내보내기 디렉토리 (예: collected_papers.xlsx → delta_exports/collected_papers)"""
+    config = config or Config.DELTA_EXPORT_CONFIG
+    return os.path.join(config['export_dir'], os.path.splitext(os.path.basename(filename))[0])
+
+
+def resolve_input(path, config=None):
+    """delta 모드이고 대응하는 디렉토리에 매니페스트가 있으면 통합 파일 대신 그 디렉토리"""
+    config = config or Config.DELTA_EXPORT_CONFIG
+    if config['enabled'] and not os.path.isdir(path):
+        directory = export_location(path, config)
+        if os.path.exists(os.path.join(directory, MANIFEST_FILE)):
+            return directory
+    return path
+
+
+def source_file(path):
+    """파이프라인 입력의 내용 해시 대상: 증분 내보내기 디렉토리면 그 manifest.json, 아니면 path"""
+    path = resolve_input(path)
+    return os.path.join(path, MANIFEST_FILE) if os.path.isdir(path) else path
+
+
+def output_file(filename, config=None):
+    """파이프라인 단계 출력 파일: delta 모드면 (아직 없더라도) 대응하는 디렉토리의 manifest.json"""
+    config = config or Config.DELTA_EXPORT_CONFIG
+    if config['enabled']:
+        return os.path.join(export_location(filename, config), MANIFEST_FILE)
+    return filename
+
+
+def read_papers(path, sheet_name='전체논문'):
+    """엑셀 파일 또는 증분 내보내기 디렉토리에서 논문 로드 (delta 모드면 통합 파일 이름을 디렉토리로 해석)"""
+    path = resolve_input(path)
+    if os.path.isdir(path):
+        return load_delta_export(path)
+    return pd.read_excel(path, sheet_name=sheet_name)
+
+
+def row_keys(df):
+    """행 식별 key: arxiv_id → doi → 제목 해시 순서로 사용"""
+    keys = pd.Series(pd.NA, index=df.index, dtype=object)
+    if 'arxiv_id' in df.columns:
+        keys = df['arxiv_id'].astype(object).where(df['arxiv_id'].notna(), keys)
+    if 'doi' in df.columns:
+        doi_keys = 'doi:' + df['doi'].astype(object).where(df['doi'].notna(), '').astype(str)
+        keys = keys.where(keys.notna(), doi_keys.where(df['doi'].notna()))
+    missing = keys.isna()
+    if missing.any():
+        # sources는 arxiv 클라이언트까지 임포트하므로 식별자 없는 행이 있을 때만 로드
+        from sources import title_hash
+        keys[missing] = ['title:' + (title_hash(title) or title)
+                         for title in df.loc[missing, 'title'].astype(str)]
+    return keys.astype(str)
+
+
+def _canonical_values(values, column):
+    """해시용 값 표현: 엑셀/Parquet 왕복이나 apply_schema 전후에도 같은 값
+
+    - 날짜(datetime 컬럼 또는 문자열 날짜 컬럼) → 'YYYY-MM-DDTHH:MM:SS' 문자열
+    - 숫자 → float64 (엑셀에서 int/float로 바뀌어도 같음). 값이 모두 비어 있으면 빈 텍스트 컬럼과 같게 ''
+    - 결측값과 빈 문자열 → '' (엑셀은 빈 문자열을 빈 셀 → NaN으로 읽음)
+    """
+    missing = values.isna().to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(values) or column in DATE_COLUMNS:
+        dates = values if pd.api.types.is_datetime64_any_dtype(values) else \
+            pd.to_datetime(values.astype(object), errors='coerce', format='ISO8601')
+        # strftime보다 훨씬 빠른 numpy 변환 (NaT는 아래에서 원래 값/빈 문자열로 교체)
+        text = np.datetime_as_string(dates.dt.tz_localize(None).to_numpy('datetime64[s]'), unit='s').astype(object)
+        unparsed = dates.isna().to_numpy() & ~missing
+        text[unparsed] = values[unparsed].astype(str).to_numpy()  # 날짜로 읽히지 않는 값은 원래 문자열
+    elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values) and not missing.all():
+        return pd.Series(values.to_numpy(dtype='float64', na_value=np.nan), index=values.index)
+    else:
+        text = values.astype(object).astype(str).to_numpy(dtype=object)
+    return pd.Series(np.where(missing, '', text), index=values.index, dtype=object)
+
+
+def row_hashes(df, columns):
+    """내용 컬럼의 행 해시 (엑셀/Parquet에서 다시 읽거나 apply_schema를 적용해도 같은 값)"""
+    normalized = {column: _canonical_values(df[column], column) for column in columns}
+    return pd.util.hash_pandas_object(pd.DataFrame(normalized, index=df.index), index=False).to_numpy()
+
+
+class DeltaExporter:
+    """이전 내보내기와 비교해 새/변경 행만 파티션 파일로 저장"""
+
+    def __init__(self, name, export_dir=None, config=None):
+        self.config = config or Config.DELTA_EXPORT_CONFIG
+        self.export_dir = os.path.join(export_dir or self.config['export_dir'], name)
+        self.manifest_file = os.path.join(self.export_dir, MANIFEST_FILE)
+        self.hashes_file = os.path.join(self.export_dir, 'exported_hashes.parquet')
+        os.makedirs(self.export_dir, exist_ok=True)
+
+    def _load_manifest(self):
+        if os.path.exists(self.manifest_file):
+            with open(self.manifest_file, encoding='utf-8') as f:
+                return json.load(f)
+        return {'runs': []}
+
+    def _load_hashes(self):
+        if os.path.exists(self.hashes_file):
+            stored = pd.read_parquet(self.hashes_file)
+            return pd.Series(stored['hash'].to_numpy(), index=stored['key'].astype(str))
+        return pd.Series(dtype='uint64')
+
+    def _save_atomic(self, path, write):
+        # 엑셀 writer가 확장자로 형식을 판단하므로 확장자는 유지
+        root, extension = os.path.splitext(path)
+        tmp_path = f'{root}.tmp{extension}'
+        write(tmp_path)
+        os.replace(tmp_path, path)
+
+    def export(self, df, group_sheets=None, extra_sheets=None):
+        """새/변경 행만 이번 실행 파티션으로 저장 (반환: 파티션 경로, 변경 없으면 None)
+
+        group_sheets: (컬럼명, 시트명 함수) — 파티션에 변경 행이 있는 그룹의 시트만 추가
+        extra_sheets: {시트명: 데이터프레임} — 전체 데이터 기준 요약 시트 (통계/요약통계/하위클러스터 등)
+            xlsx는 같은 파일의 시트로, parquet는 '<실행>.<시트명>.parquet' 파일로 저장
+        """
+        exclude = set(self.config['exclude_columns'])
+        content_columns = [column for column in df.columns if column not in exclude]
+        keys = row_keys(df)
+        hashes = row_hashes(df, content_columns)
+
+        previous = self._load_hashes()
+        # map()은 없는 key가 있으면 float로 바뀌어 uint64 해시가 뭉개지므로 위치 색인으로 비교
+        positions = previous.index.get_indexer(keys)
+        is_new = positions < 0
+        is_changed = np.zeros(len(keys), dtype=bool)
+        is_changed[~is_new] = previous.to_numpy(dtype='uint64')[positions[~is_new]] != hashes[~is_new]
+        delta_mask = is_new | is_changed
+        new_count, changed_count = int(is_new.sum()), int(is_changed.sum())
+
+        if not delta_mask.any():
+            if not os.path.exists(self.manifest_file):
+                # 파이프라인이 매니페스트로 최신 여부를 판단하므로 빈 데이터도 매니페스트는 남김
+                self._save_atomic(self.manifest_file, lambda tmp: self._write_json(tmp, self._load_manifest()))
+            print(f"📦 증분 내보내기: 변경된 행 없음 ({len(df)}개 확인, {self.export_dir})")
+            return None
+
+        delta = df[delta_mask].copy()
+        delta.insert(0, CHANGE_COLUMN, np.where(is_new[delta_mask], 'new', 'changed'))
+        run_name = pd.Timestamp.now().strftime('run-%Y%m%d-%H%M%S-%f')
+        path = os.path.join(self.export_dir, f"{run_name}.{self.config['format']}")
+        extra_files = []
+        if self.config['format'] == 'parquet':
+            for sheet_name, sheet in (extra_sheets or {}).items():
+                extra_path = os.path.join(self.export_dir, f"{run_name}.{sheet_name}.parquet")
+                self._save_atomic(extra_path, lambda tmp, sheet=sheet: sheet.to_parquet(tmp, index=False))
+                extra_files.append(os.path.basename(extra_path))
+            self._save_atomic(path, lambda tmp: delta.to_parquet(tmp, index=False))
+        else:
+            self._save_atomic(path, lambda tmp: self._write_workbook(tmp, delta, group_sheets, extra_sheets))
+
+        # 파티션을 쓴 뒤에 색인/매니페스트 갱신 (중간에 중단되면 다음 실행에서 다시 내보냄)
+        updated = pd.concat([previous[~previous.index.isin(keys[delta_mask])],
+                             pd.Series(hashes[delta_mask], index=keys[delta_mask].to_numpy())])
+        updated = updated[~updated.index.duplicated(keep='last')]
+        self._save_atomic(self.hashes_file, lambda tmp: pd.DataFrame(
+            {'key': updated.index.astype(str), 'hash': updated.to_numpy(dtype='uint64')}).to_parquet(tmp, index=False))
+
+        manifest = self._load_manifest()
+        manifest['runs'].append({
+            'run': run_name, 'file': os.path.basename(path), 'extra_files': extra_files, 'rows': len(delta),
+            'new': new_count, 'changed': changed_count, 'checked': len(df),
+            'exported_at': pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
+        self._save_atomic(self.manifest_file, lambda tmp: self._write_json(tmp, manifest))
+
+        print(f"📦 증분 내보내기: 새 {new_count}개, 변경 {changed_count}개 / {len(df)}개 → {path}")
+        return path
+
+    @staticmethod
+    def _write_json(path, data):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def _write_workbook(self, path, delta, group_sheets, extra_sheets):
+        with pd.ExcelWriter(path, engine='openpyxl') as writer:
+            delta.to_excel(writer, sheet_name='전체논문', index=False)
+            for column, sheet_name in (group_sheets or []):
+                if column not in delta.columns:
+                    continue
+                for group, group_df in delta.groupby(column, sort=True, observed=True):
+                    group_df.to_excel(writer, sheet_name=sheet_name(group), index=False)
+            for sheet_name, sheet in (extra_sheets or {}).items():
+                sheet.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def load_delta_export(export_path):
+    """파티션을 실행 순서대로 합쳐 key별 최신 행만 반환 (analyzer 입력용, 변경구분 컬럼 제외)"""
+    with open(os.path.join(export_path, MANIFEST_FILE), encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    frames = []
+    for run in manifest['runs']:
+        path = os.path.join(export_path, run['file'])
+        if path.endswith('.parquet'):
+            frames.append(pd.read_parquet(path))
+        else:
+            frames.append(pd.read_excel(path, sheet_name='전체논문'))
+    if not frames:
+        return pd.DataFrame()
+
+    combined = pd.concat(frames, ignore_index=True).drop(columns=[CHANGE_COLUMN])
+    latest = ~row_keys(combined).duplicated(keep='last').to_numpy()
+    return apply_schema(combined[latest].reset_index(drop=True))
+
+
+def round_trip_check(df, formats=('xlsx', 'parquet')):
+    """df를 내보낸 뒤 다시 읽어(그대로, apply_schema 적용) 내보냈을 때 변경으로 잡힌 행 수 {형식: 행 수}
+
+    해시 정규화가 맞으면 모두 0이어야 합니다 (임시 디렉토리 사용, 설정 파일은 건드리지 않음).
+    """
+    import tempfile
+
+    changed = {}
+    for export_format in formats:
+        with tempfile.TemporaryDirectory() as export_dir:
+            config = dict(Config.DELTA_EXPORT_CONFIG, enabled=True, format=export_format)
+            exporter = DeltaExporter('check', export_dir=export_dir, config=config)
+            exporter.export(df.copy())
+            exporter.export(apply_schema(df.copy()))
+            exporter.export(load_delta_export(exporter.export_dir))
+            # 첫 실행 이후의 파티션은 모두 잘못 잡힌 변경
+            changed[export_format] = sum(run['rows'] for run in exporter._load_manifest()['runs'][1:])
+    return changed
+
+
+if __name__ == '__main__':
+    # 수집기 형식 예시: 문자열 날짜, 빈 doi/comment, 정수 word_count
+    sample = pd.DataFrame({
+        'id': [1, 2, 3],
+        'title': ['A study', 'B study', 'C study'],
+        'published_date': ['2024-01-05', '2024-02-10', '2024-03-15'],
+        'main_category': ['Computer Vision', 'Other', 'Computer Vision'],
+        'abstract': ['x y z', 'y z', 'z'],
+        'word_count': [3, 2, 1],
+        'arxiv_id': ['2401.00001v1', '2402.00002v2', '2403.00003v1'],
+        'doi': ['', '10.1000/b', ''],
+        'comment': [None, '5 pages', ''],
+        'collected_at': ['2024-04-01 10:00:00'] * 3,
+    })
+    result = round_trip_check(sample)
+    print(f"✅ 왕복 확인: 변경으로 잡힌 행 없음 {result}" if not any(result.values())
+          else f"❌ 왕복 후 변경으로 잡힌 행: {result}")
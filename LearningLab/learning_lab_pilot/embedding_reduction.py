@@ -0,0 +1,121 @@
+"""
+임베딩 차원 축소: 클러스터링 속도와 저장 용량을 줄이기 위해 1536차원 임베딩을 목표 차원으로 축소
+- 'api': 임베딩 API의 dimensions 파라미터로 짧은 임베딩을 직접 요청 (text-embedding-3 계열)
+- 'pca': 전체 차원으로 받은 뒤 학습해 저장해 둔 PCA 투영을 로컬에서 적용
+
+어느 방식이든 축소 후 다시 L2 정규화하고 float32로 보관합니다.
+PCA 투영은 배치 분석 경로(fit_if_missing)에서만 명시적으로 학습해 파일로 저장하고, 이후 실행(watch 모드,
+조회 서비스의 새 초록 배정, 실패 항목 재시도)의 reduce()는 저장된 투영만 사용합니다.
+저장된 투영이 없거나 차원이 맞지 않으면 몇 개 행으로 새로 학습하지 않고 예외를 냅니다
+(스냅샷/클러스터 중심과 다른 공간이 되는 것을 방지).
+배치가 작아 PCA를 학습할 수 없으면 이미 받은 임베딩을 버리지 않도록 'api' 방식과 같은 앞쪽 차원 절단으로 대체합니다.
+"""
+
+import os
+import numpy as np
+from config import Config
+
+
+def l2_normalize(embeddings):
+    """행별 L2 정규화 (NaN 행은 NaN, 0 벡터는 그대로)"""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return np.divide(embeddings, norms, out=embeddings.copy(), where=norms > 0)
+
+
+class EmbeddingReducer:
+    """CLUSTERING_CONFIG의 embedding_dimensions / dimension_reduction 설정에 따라 임베딩 축소"""
+
+    def __init__(self, dimensions=None, method=None, model_file=None):
+        config = Config.CLUSTERING_CONFIG
+        self.dimensions = dimensions if dimensions is not None else config['embedding_dimensions']
+        self.method = method or config['dimension_reduction']
+        self.model_file = model_file or config['pca_model_file']
+        self.mean = None
+        self.components = None
+
+    @property
+    def enabled(self):
+        return bool(self.dimensions)
+
+    def request_kwargs(self):
+        """임베딩 API 요청에 추가할 인자 ('api' 방식이면 dimensions)"""
+        if self.enabled and self.method == 'api':
+            return {'dimensions': self.dimensions}
+        return {}
+
+    def needs_projection(self, input_dimensions):
+        """'pca' 방식이고 입력이 목표 차원보다 커서 투영이 필요한지"""
+        return self.enabled and self.method == 'pca' and input_dimensions > self.dimensions
+
+    def _load(self, input_dimensions):
+        """저장된 PCA 투영이 같은 입력/목표 차원이면 로드"""
+        if self.components is not None:
+            return self.components.shape == (self.dimensions, input_dimensions)
+        if not os.path.exists(self.model_file):
+            return False
+        model = np.load(self.model_file)
+        if model['components'].shape != (self.dimensions, input_dimensions):
+            return False
+        self.mean, self.components = model['mean'], model['components']
+        return True
+
+    def fit(self, embeddings, save=True):
+        """유효한 행(샘플)으로 randomized PCA 학습 후 파일로 저장 (목표 차원은 바꾸지 않음)"""
+        from sklearn.decomposition import PCA
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.shape[1] <= self.dimensions:
+            raise ValueError(f"입력 임베딩({embeddings.shape[1]}차원)이 목표 차원({self.dimensions})보다 크지 않아 "
+                             f"PCA 투영이 필요 없습니다.")
+        valid_idx = np.flatnonzero(np.isfinite(embeddings).all(axis=1))
+        sample_size = min(len(valid_idx), Config.VISUALIZATION_CONFIG['pca_sample_size'])
+        if sample_size < self.dimensions:
+            raise ValueError(f"PCA {embeddings.shape[1]} → {self.dimensions}차원 학습에는 유효한 임베딩이 "
+                             f"{self.dimensions}개 이상 필요합니다 (현재 {sample_size}개). "
+                             f"dimension_reduction='api'를 쓰거나 embedding_dimensions를 줄이세요.")
+        sample_idx = np.sort(np.random.default_rng(42).choice(valid_idx, size=sample_size, replace=False))
+
+        pca = PCA(n_components=self.dimensions, svd_solver='randomized', random_state=42)
+        pca.fit(embeddings[sample_idx])
+        self.mean = pca.mean_.astype(np.float32)
+        self.components = pca.components_.astype(np.float32)
+        if save:
+            np.savez(self.model_file, mean=self.mean, components=self.components)
+            print(f"🧭 PCA 투영 학습/저장: {embeddings.shape[1]} → {self.dimensions}차원 ({self.model_file})")
+        return self
+
+    def fit_if_missing(self, embeddings):
+        """배치 분석 경로 전용: 같은 차원의 저장된 투영이 있으면 로드, 없으면 이 배치로 학습해 저장
+
+        유효한 행이 목표 차원보다 적어 학습할 수 없으면 이 실행은 'api' 방식(앞쪽 차원 절단)으로 대체
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if self.needs_projection(embeddings.shape[1]) and not self._load(embeddings.shape[1]):
+            try:
+                self.fit(embeddings)
+            except ValueError as e:
+                print(f"⚠️ PCA 투영 학습 불가, 앞쪽 {self.dimensions}차원 절단으로 대체합니다: {e}")
+                self.method = 'api'
+        return self
+
+    def transform(self, embeddings):
+        """PCA 투영 후 재정규화 (NaN 행은 NaN으로 유지)"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        return l2_normalize((embeddings - self.mean) @ self.components.T)
+
+    def reduce(self, embeddings):
+        """API 응답 임베딩을 설정한 차원으로 (이미 줄어 있으면 재정규화만)
+
+        'pca' 방식은 저장된 투영만 사용하며, 없거나 차원이 맞지 않으면 RuntimeError
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if not self.enabled or embeddings.shape[1] <= self.dimensions:
+            return l2_normalize(embeddings) if self.enabled else embeddings
+        if self.method == 'api':
+            # dimensions를 지원하지 않는 응답이면 앞쪽 차원만 남기고 재정규화 (API의 축소 방식과 동일)
+            return l2_normalize(embeddings[:, :self.dimensions])
+        if not self._load(embeddings.shape[1]):
+            raise RuntimeError(f"{embeddings.shape[1]} → {self.dimensions}차원 PCA 투영이 없거나 차원이 맞지 않습니다 "
+                               f"({self.model_file}). 먼저 배치 분석을 실행해 투영을 학습하세요.")
+        return self.transform(embeddings)
@@ -0,0 +1,169 @@
+"""
+PDF 전문(full-text) 다운로드 + 텍스트 추출 파이프라인
+- 다운로드: 공용 전송 계층(transport)의 HTTP 세션 + 동시 다운로드 수 제한, arxiv_id 기준 디스크 캐시
+- 추출: 프로세스 풀에서 PDF 파싱 (모든 CPU 코어 사용, pypdf 필요)
+- 청크: 임베딩용으로 긴 본문을 단어 수 기준으로 분할
+
+pdf_url 대신 로컬 디렉토리(source_dir)에서 PDF를 가져오거나,
+pdf_url을 로컬 HTTP 서버 주소로 바꿔 테스트할 수 있습니다.
+"""
+
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import pandas as pd
+from config import Config
+from transport import RetryQueue, call_with_retry, get_http_session
+
+
+def _safe_filename(arxiv_id):
+    """'hep-th/9901001' 같은 구형 id도 파일명으로 쓸 수 있게 변환"""
+    return arxiv_id.replace('/', '_') + '.pdf'
+
+
+def _extract_pdf_text(args):
+    """(arxiv_id, pdf_path) → (arxiv_id, text, page_count, error) - 프로세스 풀 작업 함수"""
+    arxiv_id, pdf_path = args
+    try:
+        from pypdf import PdfReader
+        reader = PdfReader(pdf_path)
+        pages = [page.extract_text() or '' for page in reader.pages]
+        text = ' '.join(' '.join(pages).split())
+        return arxiv_id, text, len(pages), None
+    except Exception as e:
+        return arxiv_id, '', 0, str(e)
+
+
+def chunk_text(text, chunk_words=None, overlap_words=None):
+    """본문을 단어 수 기준으로 겹치게 분할"""
+    if chunk_words is None:
+        chunk_words = Config.FULLTEXT_CONFIG['chunk_words']
+    if overlap_words is None:
+        overlap_words = Config.FULLTEXT_CONFIG['chunk_overlap_words']
+
+    words = text.split()
+    if not words:
+        return []
+
+    step = max(chunk_words - overlap_words, 1)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(' '.join(words[start:start + chunk_words]))
+        if start + chunk_words >= len(words):
+            break
+    return chunks
+
+
+class FullTextPipeline:
+    """논문 PDF 다운로드 → 텍스트 추출 → 청크 분할"""
+
+    def __init__(self, cache_dir=None, source_dir=None, download_workers=None, extract_workers=None):
+        self.config = Config.FULLTEXT_CONFIG
+        self.cache_dir = cache_dir or self.config['cache_dir']
+        self.source_dir = source_dir  # 지정 시 HTTP 대신 로컬 디렉토리에서 복사
+        # 공유 HTTP 세션의 커넥션 풀 크기를 넘지 않도록 제한
+        self.download_workers = min(download_workers or self.config['download_workers'],
+                                    Config.TRANSPORT_CONFIG['pool_maxsize'])
+        self.extract_workers = extract_workers or self.config['extract_workers'] or os.cpu_count()
+        self.failed = RetryQueue()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def cache_path(self, arxiv_id):
+        return os.path.join(self.cache_dir, _safe_filename(arxiv_id))
+
+    def _fetch_to_file(self, session, pdf_url, tmp_path):
+        with session.get(pdf_url, stream=True, timeout=self.config['timeout']) as response:
+            response.raise_for_status()
+            with open(tmp_path, 'wb') as f:
+                for block in response.iter_content(chunk_size=1 << 16):
+                    f.write(block)
+
+    def _download_one(self, session, arxiv_id, pdf_url):
+        """PDF 하나를 캐시에 저장 (이미 있으면 건너뜀). 반환: 받은 바이트 수"""
+        path = self.cache_path(arxiv_id)
+        if os.path.exists(path):
+            return 0
+
+        tmp_path = path + '.part'
+        if self.source_dir is not None:
+            shutil.copyfile(os.path.join(self.source_dir, _safe_filename(arxiv_id)), tmp_path)
+        else:
+            call_with_retry(self._fetch_to_file, session, pdf_url, tmp_path,
+                            description=f'{arxiv_id} PDF 다운로드')
+        # 다 받은 파일만 캐시에 보이도록 원자적으로 이름 변경
+        os.replace(tmp_path, path)
+        return os.path.getsize(path)
+
+    def download(self, papers_df):
+        """pdf_url로 PDF를 동시에 다운로드 (arxiv_id 기준 캐시)"""
+        targets = papers_df[['arxiv_id', 'pdf_url']].dropna(subset=['arxiv_id']).values.tolist()
+        print(f"📥 PDF 다운로드: {len(targets)}개 (동시 {self.download_workers}개, 캐시: {self.cache_dir})")
+
+        start_time = time.time()
+        total_bytes = 0
+        cached = 0
+        session = get_http_session() if self.source_dir is None else None
+
+        with ThreadPoolExecutor(max_workers=self.download_workers) as executor:
+            futures = {
+                executor.submit(self._download_one, session, arxiv_id, pdf_url): arxiv_id
+                for arxiv_id, pdf_url in targets
+            }
+            for future in as_completed(futures):
+                arxiv_id = futures[future]
+                try:
+                    size = future.result()
+                    total_bytes += size
+                    cached += size == 0
+                except Exception as e:
+                    print(f"⚠️ {arxiv_id} 다운로드 실패: {e}")
+                    self.failed.add('download', arxiv_id, e)
+
+        elapsed = time.time() - start_time
+        print(f"✅ 다운로드 완료: {total_bytes / 1e6:.1f}MB, 캐시 사용 {cached}개 "
+              f"({elapsed:.1f}초, {total_bytes / 1e6 / max(elapsed, 1e-9):.1f}MB/초)")
+
+    def extract(self, arxiv_ids):
+        """캐시된 PDF에서 프로세스 풀로 텍스트 추출"""
+        jobs = [(arxiv_id, self.cache_path(arxiv_id)) for arxiv_id in arxiv_ids
+                if os.path.exists(self.cache_path(arxiv_id))]
+        print(f"📄 텍스트 추출: {len(jobs)}개 PDF (프로세스 {self.extract_workers}개)")
+
+        start_time = time.time()
+        results = []
+        total_pages = 0
+
+        with ProcessPoolExecutor(max_workers=self.extract_workers) as executor:
+            for arxiv_id, text, page_count, error in executor.map(_extract_pdf_text, jobs, chunksize=4):
+                if error:
+                    print(f"⚠️ {arxiv_id} 텍스트 추출 실패: {error}")
+                    self.failed.add('extract', arxiv_id, error)
+                    continue
+                total_pages += page_count
+                results.append({'arxiv_id': arxiv_id, 'full_text': text,
+                                'page_count': page_count, 'full_text_words': len(text.split())})
+
+        elapsed = time.time() - start_time
+        pages_per_sec = total_pages / elapsed if elapsed > 0 else 0
+        print(f"✅ 추출 완료: {total_pages}페이지 ({elapsed:.1f}초, {pages_per_sec:.1f}페이지/초)")
+        self.last_throughput = {'pages': total_pages, 'seconds': elapsed, 'pages_per_sec': pages_per_sec}
+        return pd.DataFrame(results, columns=['arxiv_id', 'full_text', 'page_count', 'full_text_words'])
+
+    def make_chunks(self, fulltext_df):
+        """본문을 임베딩용 청크 테이블(arxiv_id, chunk_index, text)로 변환"""
+        rows = []
+        for arxiv_id, text in zip(fulltext_df['arxiv_id'], fulltext_df['full_text']):
+            for chunk_index, chunk in enumerate(chunk_text(text)):
+                rows.append({'arxiv_id': arxiv_id, 'chunk_index': chunk_index, 'text': chunk})
+        print(f"🧩 청크 생성: {len(rows)}개 (논문 {len(fulltext_df)}개)")
+        return pd.DataFrame(rows, columns=['arxiv_id', 'chunk_index', 'text'])
+
+    def run(self, papers_df):
+        """다운로드 → 추출 → 청크 분할 전체 실행"""
+        self.failed = RetryQueue()
+        self.download(papers_df)
+        fulltext_df = self.extract(papers_df['arxiv_id'].dropna().tolist())
+        chunks_df = self.make_chunks(fulltext_df)
+        self.failed.report()
+        return fulltext_df, chunks_df
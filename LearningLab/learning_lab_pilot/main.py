@@ -5,7 +5,6 @@ Learning Lab 파일럿 프로젝트
 
 from config import Config
 from paper_collector import PaperCollector
-from paper_analyzer import PaperAnalyzer
 import time
 
 def main():
@@ -42,6 +41,8 @@ def main():
     print("\n🤖 2단계: AI 분석")
     print("-" * 40)
     
+    # 분석 모듈(openai, numpy)은 데모 경로에서 필요 없으므로 여기서 로드
+    from paper_analyzer import PaperAnalyzer
     analyzer = PaperAnalyzer()
     
     # 수집된 논문 로드
@@ -57,11 +58,22 @@ def main():
     
     # 임베딩 생성
     print("\n🔢 임베딩 생성...")
-    analyzer.create_embeddings()
+    analyzer.create_embeddings(fit_reducer=True)
+    
+    # 'Other' 논문 카테고리 보정 (임베딩 프로토타입, API 호출 없음)
+    analyzer.refine_other_categories()
     
     # 클러스터링 수행
     print("\n🎯 클러스터링...")
-    analyzer.perform_clustering()
+    if Config.CLUSTERING_CONFIG['hierarchical']:
+        analyzer.perform_hierarchical_clustering()
+    else:
+        analyzer.perform_clustering()
+    
+    # 클러스터 단위 이름/키워드 생성 (논문별 키워드 추출 대신)
+    if Config.GPT_CONFIG['insight_mode'] == 'cluster':
+        print("\n🏷️ 클러스터 이름 생성...")
+        analyzer.name_clusters_with_gpt()
     
     # 클러스터 분석
     print("\n🔍 클러스터 분석...")
@@ -77,6 +89,13 @@ def main():
     # 최종 결과 저장
     analyzer.save_analysis_results()
     
+    # 조회 서비스(query_service)가 사용할 스냅샷
+    analyzer.save_snapshot()
+    
+    # 재시도 후에도 실패한 항목은 파일로 남겨 다시 처리할 수 있게 함
+    if len(analyzer.retry_queue):
+        print(f"📮 실패 항목 {len(analyzer.retry_queue)}건 기록: {analyzer.retry_queue.save()}")
+    
     # 5. 최종 리포트
     print("\n" + "=" * 60)
     print("🎉 분석 완료! 최종 리포트")
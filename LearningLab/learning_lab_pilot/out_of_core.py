@@ -0,0 +1,290 @@
+"""
+메모리보다 큰 논문 저장소의 청크 단위 분석 (out-of-core)
+PaperAnalyzer는 전체 papers_df와 임베딩을 메모리에 올리지만, 이 모드는 PaperStore를 처음부터 끝까지
+고정 크기 청크로만 처리합니다.
+
+1. 임베딩: part 파일을 청크 단위로 읽어 임베딩 → 디스크의 np.memmap에 이어 쓰기 (중단 후 이어서 실행 가능)
+2. 클러스터링: memmap 청크로 MiniBatchKMeans.partial_fit (여러 epoch) → 청크별 predict
+3. 출력: 청크마다 cluster 컬럼을 붙여 출력 저장소에 part 파일로 쓰고, 클러스터 통계는 누적 집계
+
+청크 크기는 memory_limit_mb와 임베딩 차원으로 정합니다 (목표: 16GB 장비에서 500만 편).
+
+사용 예:
+    python cli.py analyze-store --store paper_store --n-clusters 50 --memory-limit-mb 8000
+"""
+
+import json
+import os
+import time
+from collections import Counter
+import numpy as np
+import pandas as pd
+from config import Config
+from paper_analyzer import embedding_text
+from paper_store import PaperStore
+from text_normalization import normalize_abstracts
+
+
+def peak_memory_mb():
+    """프로세스 최대 RSS (MB)"""
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        return float('nan')
+
+
+class OutOfCoreAnalyzer:
+    """PaperStore → 임베딩 memmap → 스트리밍 K-means → 청크별 출력"""
+
+    def __init__(self, store=None, work_dir=None, n_clusters=None, memory_limit_mb=None, chunk_size=None):
+        self.config = Config.OUT_OF_CORE_CONFIG
+        self.store = store or PaperStore()
+        self.work_dir = work_dir or self.config['work_dir']
+        self.n_clusters = n_clusters or Config.CLUSTERING_CONFIG['n_clusters']
+        self.memory_limit_mb = memory_limit_mb or self.config['memory_limit_mb']
+        self.chunk_size = chunk_size  # None이면 메모리 한도로 계산
+        os.makedirs(self.work_dir, exist_ok=True)
+
+        self.state_file = os.path.join(self.work_dir, 'state.json')
+        self.embeddings_file = os.path.join(self.work_dir, 'embeddings.f32')
+        self.labels_file = os.path.join(self.work_dir, 'labels.i16')
+        self.centers_file = os.path.join(self.work_dir, 'centers.npy')
+        self.state = self._load_state()
+        self._analyzer = None
+
+    def _load_state(self):
+        if os.path.exists(self.state_file):
+            with open(self.state_file, encoding='utf-8') as f:
+                return json.load(f)
+        return {'n_rows': None, 'dimensions': None, 'embedded_rows': 0}
+
+    def _save_state(self):
+        tmp_path = self.state_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    @property
+    def analyzer(self):
+        """임베딩 요청용 PaperAnalyzer (OpenAI 클라이언트는 필요할 때만 생성)"""
+        if self._analyzer is None:
+            from paper_analyzer import PaperAnalyzer
+            self._analyzer = PaperAnalyzer()
+        return self._analyzer
+
+    def rows_per_chunk(self):
+        """메모리 한도의 절반을 청크 작업 공간으로 사용 (행마다 임베딩 사본 4개 + 텍스트 4KB 가정)"""
+        if self.chunk_size:
+            return self.chunk_size
+        dimensions = (self.state['dimensions'] or Config.CLUSTERING_CONFIG['embedding_dimensions'] or 1536)
+        bytes_per_row = dimensions * 4 * 4 + 4096
+        return max(self.n_clusters * 10, int(self.memory_limit_mb * 1024 * 1024 * 0.5 / bytes_per_row))
+
+    def _open_embeddings(self, mode='r'):
+        return np.memmap(self.embeddings_file, dtype=np.float32, mode=mode,
+                         shape=(self.state['n_rows'], self.state['dimensions']))
+
+    def _chunk_ranges(self):
+        step = self.rows_per_chunk()
+        return [(start, min(start + step, self.state['n_rows'])) for start in range(0, self.state['n_rows'], step)]
+
+    # 1. 임베딩 ------------------------------------------------------------------
+    def _embed_texts(self, texts):
+        """텍스트 청크 임베딩 (실패한 배치는 NaN 행)"""
+        batch_size = self.config['embedding_batch_size']
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            try:
+                vectors.extend(self.analyzer._embed_texts(batch))
+            except Exception as e:
+                print(f"⚠️ 임베딩 배치 실패 ({len(batch)}개): {e}")
+                vectors.extend([None] * len(batch))
+        dimension = next((len(v) for v in vectors if v is not None), None)
+        if dimension is None:
+            raise RuntimeError("청크의 모든 임베딩 요청이 실패했습니다")
+        return np.array([v if v is not None else np.full(dimension, np.nan) for v in vectors], dtype=np.float32)
+
+    def embed(self):
+        """저장소 전체를 청크 단위로 임베딩해 memmap에 기록 (이미 기록한 행은 건너뜀)"""
+        import pyarrow.parquet as pq
+
+        n_rows = self.store.count()
+        if self.state['n_rows'] not in (None, n_rows):
+            print(f"⚠️ 저장소 크기가 바뀌어({self.state['n_rows']} → {n_rows}) 임베딩을 처음부터 다시 만듭니다")
+            self.state = {'n_rows': None, 'dimensions': None, 'embedded_rows': 0}
+            if os.path.exists(self.embeddings_file):
+                os.remove(self.embeddings_file)
+        self.state['n_rows'] = n_rows
+        if self.state['embedded_rows'] >= n_rows:
+            print(f"✅ 임베딩 memmap 재사용: {self.embeddings_file} ({n_rows}개)")
+            return
+
+        print(f"🔢 청크 단위 임베딩: {n_rows}개 (이미 완료 {self.state['embedded_rows']}개, "
+              f"청크 {self.rows_per_chunk()}개) → {self.embeddings_file}")
+        start_time = time.time()
+        reducer = self.analyzer.reducer
+        memmap = None
+        offset = 0
+        for path in self.store.part_files():
+            parquet_file = pq.ParquetFile(path)
+            part_rows = parquet_file.metadata.num_rows
+            if offset + part_rows <= self.state['embedded_rows']:
+                offset += part_rows
+                continue
+
+            # watch 모드 저장소처럼 part별 임베딩(.npy)이 있으면 API 호출 없이 사용
+            npy_path = path[:-len('.parquet')] + '.npy'
+            stored = np.load(npy_path, mmap_mode='r') if os.path.exists(npy_path) else None
+
+            part_offset = 0
+            for batch in parquet_file.iter_batches(batch_size=self.rows_per_chunk(), columns=['title', 'abstract']):
+                start, end = offset + part_offset, offset + part_offset + batch.num_rows
+                if end > self.state['embedded_rows']:
+                    if stored is not None:
+                        embeddings = np.asarray(stored[part_offset:part_offset + batch.num_rows], dtype=np.float32)
+                    else:
+                        titles = batch.column('title').to_pylist()
+                        abstracts = batch.column('abstract').to_pandas()
+                        if Config.GPT_CONFIG['normalize_abstracts']:
+                            abstracts = normalize_abstracts(abstracts)
+                        embeddings = self._embed_texts([embedding_text(t, a) for t, a in zip(titles, abstracts)])
+                    if reducer.enabled:
+                        if memmap is None:
+                            # 배치 경로: 투영이 없으면 첫 청크로 학습 (이어서 실행하면 저장된 투영 재사용)
+                            reducer.fit_if_missing(embeddings)
+                        embeddings = reducer.reduce(embeddings)
+
+                    if memmap is None:
+                        self.state['dimensions'] = self.state['dimensions'] or embeddings.shape[1]
+                        memmap = self._open_embeddings('r+' if os.path.exists(self.embeddings_file) else 'w+')
+                    memmap[start:end] = embeddings
+                    memmap.flush()
+                    self.state['embedded_rows'] = end
+                    self._save_state()  # 청크마다 진행 상황 저장 → 중단 후 이어서 실행
+                    print(f"  📊 {end}/{n_rows} (최대 메모리 {peak_memory_mb():.0f}MB)")
+                part_offset += batch.num_rows
+            offset += part_rows
+
+        del memmap
+        print(f"✅ 임베딩 완료 ({time.time() - start_time:.1f}초)")
+
+    # 2. 클러스터링 --------------------------------------------------------------
+    def cluster(self):
+        """memmap 청크로 MiniBatchKMeans를 partial_fit 한 뒤 청크별로 배정"""
+        from sklearn.cluster import MiniBatchKMeans
+
+        embeddings = self._open_embeddings('r')
+        ranges = self._chunk_ranges()
+        epochs = self.config['kmeans_epochs']
+        print(f"🎯 스트리밍 K-means: {self.n_clusters}개 클러스터, 청크 {len(ranges)}개 x {epochs} epoch")
+        start_time = time.time()
+
+        kmeans = MiniBatchKMeans(n_clusters=self.n_clusters, random_state=42, n_init=3)
+        rng = np.random.default_rng(42)
+        fitted = False
+        for epoch in range(epochs):
+            for index in rng.permutation(len(ranges)):
+                start, end = ranges[index]
+                chunk = np.asarray(embeddings[start:end])
+                chunk = chunk[np.isfinite(chunk).all(axis=1)]
+                if len(chunk) < self.n_clusters:
+                    continue  # 초기화에 필요한 샘플보다 적은 청크는 건너뜀
+                kmeans.partial_fit(chunk)
+                fitted = True
+        if not fitted:
+            raise RuntimeError("클러스터링할 임베딩이 부족합니다")
+
+        labels = np.memmap(self.labels_file, dtype=np.int16, mode='w+', shape=(self.state['n_rows'],))
+        for start, end in ranges:
+            chunk = np.asarray(embeddings[start:end])
+            valid = np.isfinite(chunk).all(axis=1)
+            chunk_labels = np.full(len(chunk), -1, dtype=np.int16)
+            if valid.any():
+                chunk_labels[valid] = kmeans.predict(chunk[valid])
+            labels[start:end] = chunk_labels
+        labels.flush()
+        np.save(self.centers_file, kmeans.cluster_centers_.astype(np.float32))
+
+        counts = np.bincount(labels[labels >= 0], minlength=self.n_clusters)
+        print("📊 클러스터별 논문 수:")
+        for cluster_id, count in enumerate(counts):
+            print(f"  클러스터 {cluster_id}: {count}개")
+        print(f"✅ 클러스터링 완료! ({time.time() - start_time:.1f}초, 최대 메모리 {peak_memory_mb():.0f}MB)")
+
+    # 3. 출력 --------------------------------------------------------------------
+    def write_outputs(self, output_dir=None, summary_filename=None):
+        """청크마다 cluster 컬럼을 붙여 출력 저장소에 쓰고, 클러스터 요약을 누적해 엑셀로 저장"""
+        output_store = PaperStore(output_dir or self.config['output_dir'])
+        for path in output_store.part_files():
+            os.remove(path)  # 이전 실행의 출력 교체
+        summary_filename = summary_filename or self.config['summary_filename']
+
+        labels = np.memmap(self.labels_file, dtype=np.int16, mode='r', shape=(self.state['n_rows'],))
+        embeddings = self._open_embeddings('r')
+        centers = np.load(self.centers_file)
+
+        counts = Counter()
+        category_counts = Counter()  # (cluster, main_category) → 논문 수
+        year_sums = Counter()
+        year_counts = Counter()
+        best_distance = np.full(len(centers), np.inf)
+        best_title = [''] * len(centers)
+
+        print(f"💾 청크별 결과 저장 → {output_store.store_dir}")
+        offset = 0
+        for chunk in self.store.iter_batches(self.rows_per_chunk()):
+            end = offset + len(chunk)
+            chunk_labels = np.asarray(labels[offset:end])
+            chunk['cluster'] = chunk_labels
+            output_store.append(chunk)
+
+            # 클러스터 통계 누적 (청크 크기만큼의 메모리만 사용)
+            clustered = chunk[chunk_labels >= 0]
+            counts.update(clustered['cluster'].value_counts().to_dict())
+            if 'main_category' in clustered.columns:
+                category_counts.update(
+                    clustered.groupby(['cluster', 'main_category'], observed=True).size().to_dict())
+            years = pd.to_datetime(clustered['published_date'], errors='coerce').dt.year
+            year_sums.update(years.groupby(clustered['cluster']).sum().to_dict())
+            year_counts.update(years.groupby(clustered['cluster']).count().to_dict())
+
+            # 클러스터 중심에 가장 가까운 논문을 대표 논문으로
+            positions = np.flatnonzero(chunk_labels >= 0)
+            if len(positions):
+                vectors = np.asarray(embeddings[offset:end])[positions]
+                distances = ((vectors - centers[chunk_labels[positions]]) ** 2).sum(axis=1)
+                for position, label, distance in zip(positions, chunk_labels[positions], distances):
+                    if distance < best_distance[label]:
+                        best_distance[label] = distance
+                        best_title[label] = chunk['title'].iloc[position]
+            offset = end
+
+        rows = []
+        for cluster_id in range(len(centers)):
+            categories = sorted(((count, category) for (label, category), count in category_counts.items()
+                                 if label == cluster_id and count > 0), reverse=True)
+            rows.append({
+                '클러스터': cluster_id,
+                '논문수': counts[cluster_id],
+                '주요카테고리': ', '.join(str(category) for _, category in categories[:3]),
+                '평균발행년도': year_sums[cluster_id] / year_counts[cluster_id] if year_counts[cluster_id] else np.nan,
+                '대표논문': best_title[cluster_id],
+            })
+        summary_df = pd.DataFrame(rows)
+        summary_df.to_excel(summary_filename, sheet_name='클러스터요약', index=False)
+        print(f"✅ 결과 저장 완료: {output_store.store_dir} ({offset}개), 요약: {summary_filename}")
+        return summary_df
+
+    def run(self, output_dir=None):
+        """임베딩 → 클러스터링 → 출력 전체 실행"""
+        start_time = time.time()
+        print(f"🧱 out-of-core 분석: 저장소 {self.store.store_dir}, 메모리 한도 {self.memory_limit_mb}MB")
+        self.embed()
+        self.cluster()
+        summary_df = self.write_outputs(output_dir)
+        print(f"⏱️ 총 소요시간: {time.time() - start_time:.1f}초, 최대 메모리 {peak_memory_mb():.0f}MB")
+        return summary_df
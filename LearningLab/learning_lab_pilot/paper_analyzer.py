@@ -1,137 +1,415 @@
 import pandas as pd
 import numpy as np
-from openai import OpenAI
+import os
+import shutil
 import time
-from sklearn.cluster import KMeans
+from concurrent.futures import ProcessPoolExecutor
+from category_classifier import OTHER_LABEL, PrototypeClassifier
 from config import Config
+from embedding_reduction import EmbeddingReducer
+from schema import apply_schema, apply_schema_with_report
+from summary_router import TIER_LLM, TIER_LOCAL, ExtractiveSummarizer, report_tiers, route_papers
+from text_normalization import normalize_abstracts, report_token_reduction
+from transport import RetryQueue, call_with_retry, create_openai_client
+
+
+# 프롬프트/입력 텍스트는 실제 요청과 비용 추정(cost_planner)이 같은 문자열을 쓰도록 함수로 분리
+def summary_prompt(title, abstract):
+    """요약 프롬프트"""
+    return f"""
+다음 논문 초록을 한국어로 간단히 요약해주세요 (2-3문장):
+
+제목: {title}
+초록: {abstract}
+
+요약:"""
+
+
+def insight_prompt(title, abstract):
+    """핵심 인사이트(키워드) 추출 프롬프트"""
+    return f"""
+다음 논문에서 핵심 기술이나 방법론을 1-2개 키워드로 추출해주세요:
+
+제목: {title}
+초록: {abstract}
+
+키워드 (쉼표로 구분):"""
+
+
+def cluster_naming_prompt(papers):
+    """클러스터 이름/키워드 프롬프트 (papers: 중심 근처 논문의 (제목, 초록) 목록)"""
+    papers_text = "\n\n".join(f"제목: {title}\n초록: {abstract}" for title, abstract in papers)
+    return f"""
+다음은 같은 연구 주제로 묶인 논문들입니다. 이 논문 그룹을 대표하는 짧은 이름과
+핵심 기술이나 방법론 키워드 3-5개를 추출해주세요.
+
+{papers_text}
+
+아래 형식으로만 답해주세요:
+이름: <클러스터 이름>
+키워드: <키워드1>, <키워드2>, <키워드3>"""
+
+
+def embedding_text(title, abstract):
+    """임베딩 입력: 제목 + 초록"""
+    return f"{title} {abstract}"
+
+
+def work_keys(papers_df):
+    """작업 큐 항목 key: arxiv_id (없으면 행 인덱스)"""
+    if 'arxiv_id' in papers_df.columns:
+        return [str(arxiv_id) if pd.notna(arxiv_id) else f"row:{index}"
+                for index, arxiv_id in zip(papers_df.index, papers_df['arxiv_id'])]
+    return [f"row:{index}" for index in papers_df.index]
+
+
+def make_kmeans(n_clusters, method=None, n_jobs=None):
+    """클러스터링 방식(CLUSTERING_CONFIG['clustering_method'])에 맞는 K-means 추정기"""
+    method = method or Config.CLUSTERING_CONFIG['clustering_method']
+    if method == 'spherical':
+        from spherical_kmeans import SphericalKMeans
+        return SphericalKMeans(n_clusters, n_jobs=n_jobs)
+    # sklearn은 임포트 비용이 커서 클러스터링 시점에 로드
+    from sklearn.cluster import KMeans
+    return KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+
+
+def _subcluster_partition(args):
+    """상위 클러스터 하나를 독립적으로 하위 클러스터링 (프로세스 풀 작업 함수)"""
+    cluster_id, embeddings, n_subclusters, method = args
+    
+    n_subclusters = min(n_subclusters, len(embeddings))
+    if n_subclusters <= 1:
+        return cluster_id, np.zeros(len(embeddings), dtype=np.int32), embeddings.mean(axis=0, keepdims=True)
+    
+    # 하위 클러스터는 이미 프로세스별로 나눠 돌리므로 재시작은 순차 실행
+    kmeans = make_kmeans(n_subclusters, method, n_jobs=1)
+    labels = kmeans.fit_predict(embeddings)
+    return cluster_id, labels.astype(np.int32), kmeans.cluster_centers_
+
 
 class PaperAnalyzer:
-    """논문 분석기: GPT 요약 + 클러스터링 (시각화 제거)"""
+    """논문 분석기: GPT 요약 + 클러스터링 + 시각화"""
     
     def __init__(self):
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        self.client = create_openai_client()
+        self.retry_queue = RetryQueue()  # 재시도 후에도 실패한 항목
+        self.reducer = EmbeddingReducer()  # 임베딩 차원 축소 (CLUSTERING_CONFIG['embedding_dimensions'])
         self.papers_df = None
         self.embeddings = None
         self.clusters = None
+        self.cluster_centers = None
+        self.subcluster_centers = {}  # 상위 클러스터 id → 하위 클러스터 중심
+        self.cluster_names = {}
         
     def load_papers(self, excel_file):
-        """엑셀 파일에서 논문 데이터 로드"""
+        """엑셀 파일에서 논문 데이터 로드 (증분 내보내기 디렉토리면 파티션을 합쳐 최신 행 로드)
+
+        delta 모드에서는 통합 파일 이름(collected_papers.xlsx)을 주어도 대응하는 증분 내보내기 디렉토리를 읽습니다.
+        """
         try:
-            self.papers_df = pd.read_excel(excel_file, sheet_name='전체논문')
+            from delta_export import read_papers
+            self.papers_df = read_papers(excel_file)
             print(f"📚 {len(self.papers_df)}개 논문 데이터 로드 완료!")
+            self.papers_df = apply_schema_with_report(self.papers_df)
             return True
         except Exception as e:
             print(f"❌ 파일 로드 실패: {e}")
             return False
     
+    def _request_abstracts(self):
+        """요청에 보낼 초록 (정규화 사용 시 clean_abstract 컬럼을 한 번만 계산해 추가)"""
+        if not Config.GPT_CONFIG['normalize_abstracts']:
+            return self.papers_df['abstract']
+        if 'clean_abstract' not in self.papers_df.columns:
+            self.papers_df['clean_abstract'] = normalize_abstracts(self.papers_df['abstract'])
+            report_token_reduction(self.papers_df['abstract'], self.papers_df['clean_abstract'])
+        return self.papers_df['clean_abstract']
+    
     def summarize_abstracts_with_gpt(self):
         """GPT를 사용한 초록 요약"""
         if self.papers_df is None:
             print("❌ 논문 데이터가 없습니다. 먼저 load_papers()를 실행하세요.")
             return
         
+        # 'cluster' 모드에서는 논문별 키워드 추출을 생략하고
+        # 클러스터링 이후 name_clusters_with_gpt()에서 클러스터 단위로 추출
+        per_paper_insight = Config.GPT_CONFIG.get('insight_mode', 'paper') == 'paper'
+        
+        abstracts = self._request_abstracts().tolist()
+        # 라우팅 규칙에 맞는 논문은 로컬 추출 요약, 나머지만 GPT 요청
+        local, local_summaries, local_keywords, local_seconds = self._summarize_local_tier(abstracts)
+        local_results = iter(zip(local_summaries, local_keywords))
         print("🤖 GPT로 초록 요약 중...")
         summaries = []
         key_insights = []
         
-        for i, row in self.papers_df.iterrows():
-            print(f"📝 {i+1}/{len(self.papers_df)}: {row['title'][:40]}...")
+        llm_start = time.perf_counter()
+        for position, (i, row) in enumerate(self.papers_df.iterrows()):
+            if local[position]:
+                summary, insight = next(local_results)
+                summaries.append(summary)
+                key_insights.append(insight if per_paper_insight else None)
+                continue
+            print(f"📝 {position+1}/{len(self.papers_df)}: {row['title'][:40]}...")
             
             try:
-                # 요약 프롬프트
-                summary_prompt = f"""
-다음 논문 초록을 한국어로 간단히 요약해주세요 (2-3문장):
-
-제목: {row['title']}
-초록: {row['abstract']}
-
-요약:"""
-
-                # 핵심 인사이트 추출 프롬프트
-                insight_prompt = f"""
-다음 논문에서 핵심 기술이나 방법론을 1-2개 키워드로 추출해주세요:
-
-제목: {row['title']}
-초록: {row['abstract']}
-
-키워드 (쉼표로 구분):"""
-
-                # GPT API 호출
-                summary_response = self.client.chat.completions.create(
-                    model=Config.GPT_CONFIG['model'],
-                    messages=[{"role": "user", "content": summary_prompt}],
-                    max_tokens=Config.GPT_CONFIG['max_tokens'],
-                    temperature=Config.GPT_CONFIG['temperature']
-                )
-                
-                time.sleep(1)  # API 제한 고려
-                
-                insight_response = self.client.chat.completions.create(
-                    model=Config.GPT_CONFIG['model'],
-                    messages=[{"role": "user", "content": insight_prompt}],
-                    max_tokens=50,
-                    temperature=Config.GPT_CONFIG['temperature']
-                )
-                
-                summary = summary_response.choices[0].message.content.strip()
-                insight = insight_response.choices[0].message.content.strip()
-                
+                paper = {'title': row['title'], 'abstract': abstracts[position]}
+                summary, insight = self._summarize_paper(paper, per_paper_insight)
                 summaries.append(summary)
                 key_insights.append(insight)
                 
-                time.sleep(1)  # API 제한 고려
+                time.sleep(Config.GPT_CONFIG['request_interval'])  # API 제한 고려
                 
             except Exception as e:
-                print(f"⚠️ {i+1}번 논문 요약 실패: {e}")
-                summaries.append("요약 생성 실패")
-                key_insights.append("키워드 추출 실패")
+                # 재시도 후에도 실패한 논문은 빈 값으로 두고 재시도 큐에 기록
+                print(f"⚠️ {position+1}번 논문 요약 실패: {e}")
+                self.retry_queue.add('summary', i, e)
+                summaries.append(None)
+                key_insights.append(None)
+        
+        llm_seconds = time.perf_counter() - llm_start
         
         # 결과를 데이터프레임에 추가
         self.papers_df['gpt_summary'] = summaries
-        self.papers_df['key_insights'] = key_insights
+        if per_paper_insight:
+            self.papers_df['key_insights'] = key_insights
+        if Config.SUMMARY_ROUTING_CONFIG['enabled']:
+            self.papers_df['summary_tier'] = np.where(local, TIER_LOCAL, TIER_LLM)
+            report_tiers(self.papers_df['summary_tier'], {TIER_LOCAL: local_seconds, TIER_LLM: llm_seconds})
+        self.papers_df = apply_schema(self.papers_df)
         
         print("✅ GPT 요약 완료!")
+        self.retry_queue.report()
         return self.papers_df
     
-    def create_embeddings(self):
-        """OpenAI 임베딩 생성"""
+    def _summarize_local_tier(self, abstracts):
+        """라우팅 규칙(SUMMARY_ROUTING_CONFIG)에 맞는 논문을 로컬 추출 요약 (반환: 로컬 마스크, 요약, 키워드, 소요 시간)"""
+        local = route_papers(self.papers_df)
+        if not local.any():
+            return local, [], [], 0.0
+        
+        start_time = time.perf_counter()
+        summaries, keywords = ExtractiveSummarizer().summarize(
+            self.papers_df['title'].to_numpy(dtype=object)[local], np.asarray(abstracts, dtype=object)[local])
+        elapsed = time.perf_counter() - start_time
+        print(f"🪶 로컬 추출 요약: {int(local.sum())}/{len(local)}개 ({elapsed:.2f}초, API 호출 없음)")
+        return local, summaries, keywords, elapsed
+    
+    def _summarize_paper(self, row, per_paper_insight):
+        """논문 하나의 요약(+키워드) 생성. 호출마다 일시적 오류는 재시도"""
+        # GPT API 호출
+        summary_response = call_with_retry(
+            self.client.chat.completions.create,
+            model=Config.GPT_CONFIG['model'],
+            messages=[{"role": "user", "content": summary_prompt(row['title'], row['abstract'])}],
+            max_tokens=Config.GPT_CONFIG['max_tokens'],
+            temperature=Config.GPT_CONFIG['temperature'],
+            description='GPT 요약'
+        )
+        
+        insight = None
+        if per_paper_insight:
+            time.sleep(Config.GPT_CONFIG['request_interval'])  # API 제한 고려
+            
+            insight_response = call_with_retry(
+                self.client.chat.completions.create,
+                model=Config.GPT_CONFIG['model'],
+                messages=[{"role": "user", "content": insight_prompt(row['title'], row['abstract'])}],
+                max_tokens=Config.GPT_CONFIG['insight_max_tokens'],
+                temperature=Config.GPT_CONFIG['temperature'],
+                description='GPT 키워드'
+            )
+            insight = insight_response.choices[0].message.content.strip()
+        
+        summary = summary_response.choices[0].message.content.strip()
+        return summary, insight
+    
+    def _embed_texts(self, texts):
+        """텍스트 목록의 임베딩 요청 (일시적 오류는 재시도)"""
+        response = call_with_retry(
+            self.client.embeddings.create,
+            model=Config.CLUSTERING_CONFIG['embedding_model'],
+            input=texts,
+            description='임베딩',
+            **self.reducer.request_kwargs()
+        )
+        return [embedding_obj.embedding for embedding_obj in response.data]
+    
+    def create_embeddings(self, fit_reducer=False):
+        """OpenAI 임베딩 생성
+
+        fit_reducer=True: 배치 분석 경로에서 PCA 투영이 없으면 이 임베딩으로 학습 (watch 등 소량 경로는 False)
+        """
         if self.papers_df is None:
             print("❌ 논문 데이터가 없습니다.")
             return
             
         print("🔢 임베딩 생성 중...")
         
-        # 제목 + 초록을 결합한 텍스트로 임베딩 생성
-        texts = []
-        for _, row in self.papers_df.iterrows():
-            combined_text = f"{row['title']} {row['abstract']}"
-            texts.append(combined_text)
+        # 제목 + (정규화한) 초록을 결합한 텍스트로 임베딩 생성
+        texts = [embedding_text(title, abstract)
+                 for title, abstract in zip(self.papers_df['title'], self._request_abstracts())]
         
-        try:
-            embeddings = []
-            batch_size = 10  # 배치 처리로 API 호출 최적화
-            
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i+batch_size]
-                print(f"📊 임베딩 생성: {i+1}-{min(i+batch_size, len(texts))}/{len(texts)}")
-                
-                response = self.client.embeddings.create(
-                    model=Config.CLUSTERING_CONFIG['embedding_model'],
-                    input=batch
-                )
-                
-                for embedding_obj in response.data:
-                    embeddings.append(embedding_obj.embedding)
-                
-                time.sleep(1)  # API 제한 고려
+        embeddings = [None] * len(texts)
+        batch_size = Config.CLUSTERING_CONFIG['embedding_batch_size']  # 배치 처리로 API 호출 최적화
+        
+        for i in range(0, len(texts), batch_size):
+            batch = texts[i:i+batch_size]
+            print(f"📊 임베딩 생성: {i+1}-{min(i+batch_size, len(texts))}/{len(texts)}")
             
-            self.embeddings = np.array(embeddings)
-            print(f"✅ 임베딩 생성 완료! 차원: {self.embeddings.shape}")
-            return self.embeddings
+            try:
+                embeddings[i:i+len(batch)] = self._embed_texts(batch)
+            except Exception as e:
+                # 배치 실패 시 전체를 버리지 않고 해당 배치의 논문만 하나씩 재요청
+                print(f"⚠️ 배치 임베딩 실패, 논문별로 재시도: {e}")
+                for offset, text in enumerate(batch):
+                    try:
+                        embeddings[i + offset] = self._embed_texts([text])[0]
+                    except Exception as item_error:
+                        self.retry_queue.add('embedding', self.papers_df.index[i + offset], item_error)
             
-        except Exception as e:
-            print(f"❌ 임베딩 생성 실패: {e}")
+            time.sleep(Config.GPT_CONFIG['request_interval'])  # API 제한 고려
+        
+        succeeded = [e for e in embeddings if e is not None]
+        if not succeeded:
+            print("❌ 임베딩 생성 실패")
             return None
+        
+        # 실패한 논문은 NaN 행으로 두고 클러스터링에서 제외
+        dimension = len(succeeded[0])
+        self.embeddings = np.array([e if e is not None else [np.nan] * dimension for e in embeddings])
+        if self.reducer.enabled:
+            if fit_reducer:
+                self.reducer.fit_if_missing(self.embeddings)
+            self.embeddings = self.reducer.reduce(self.embeddings)
+        print(f"✅ 임베딩 생성 완료! 차원: {self.embeddings.shape}")
+        self.retry_queue.report()
+        return self.embeddings
+    
+    def submit_to_queue(self, queue):
+        """요약/임베딩 작업을 작업 큐(work_queue.WorkQueue)에 등록 (이미 등록된 논문은 건너뜀)"""
+        keys = work_keys(self.papers_df)
+        titles = self.papers_df['title'].tolist()
+        abstracts = self._request_abstracts().tolist()
+        
+        # 로컬 추출 요약 티어는 큐에 넣지 않고 바로 채움 (load_queue_results에서 유지)
+        local, local_summaries, local_keywords, _ = self._summarize_local_tier(abstracts)
+        if Config.SUMMARY_ROUTING_CONFIG['enabled']:
+            self.papers_df['summary_tier'] = np.where(local, TIER_LOCAL, TIER_LLM)
+            self.papers_df['gpt_summary'] = None
+            self.papers_df.loc[local, 'gpt_summary'] = local_summaries
+            if Config.GPT_CONFIG.get('insight_mode', 'paper') == 'paper':
+                self.papers_df['key_insights'] = None
+                self.papers_df.loc[local, 'key_insights'] = local_keywords
+        
+        added_summary = queue.enqueue('summary', [
+            (key, {'title': title, 'abstract': abstract})
+            for key, title, abstract, is_local in zip(keys, titles, abstracts, local) if not is_local
+        ])
+        added_embedding = queue.enqueue('embedding', [
+            (key, {'text': embedding_text(title, abstract)}) for key, title, abstract in zip(keys, titles, abstracts)
+        ])
+        print(f"📥 작업 큐 등록: 요약 {added_summary}개, 임베딩 {added_embedding}개 (신규)")
+    
+    def wait_for_queue(self, queue, poll_interval=None, workers=None):
+        """모든 워커가 요약/임베딩을 끝낼 때까지 진행 상황 출력
+
+        workers(start_local_workers 반환값)를 주면 로컬 워커가 모두 끝났는데 항목이 남은 경우
+        (워커 예외) 계속 기다리지 않고 워커 예외를 발생시킴
+        """
+        from work_queue import STAGES
+        poll_interval = poll_interval or Config.WORK_QUEUE_CONFIG['poll_interval']
+        while True:
+            counts = {stage: queue.counts(stage) for stage in STAGES}
+            progress = ', '.join(
+                f"{stage} {c['done']}/{sum(c.values())} (실패 {c['failed']})" for stage, c in counts.items())
+            print(f"⏳ 작업 큐 진행: {progress}")
+            if all(c['pending'] == 0 and c['leased'] == 0 for c in counts.values()):
+                return
+            if workers is not None and workers.ready():
+                workers.join()  # 워커가 예외로 끝났으면 여기서 발생
+            time.sleep(poll_interval)
+    
+    def load_queue_results(self, queue, fit_reducer=False):
+        """작업 큐의 결과를 papers_df/embeddings에 반영 (실패 항목은 재시도 큐로, fit_reducer는 create_embeddings와 같음)"""
+        import json
+        from work_queue import decode_embedding
+        
+        keys = work_keys(self.papers_df)
+        per_paper_insight = Config.GPT_CONFIG.get('insight_mode', 'paper') == 'paper'
+        
+        summary_results = queue.results('summary')
+        parsed = [json.loads(summary_results[key]) if key in summary_results else {} for key in keys]
+        if 'summary_tier' in self.papers_df.columns:
+            # 로컬 추출 요약 티어는 큐에 등록하지 않았으므로 submit_to_queue에서 채운 값 유지
+            for position in np.flatnonzero((self.papers_df['summary_tier'] == TIER_LOCAL).to_numpy()):
+                parsed[position] = {column: self.papers_df[column].iat[position]
+                                    for column in ('gpt_summary', 'key_insights') if column in self.papers_df.columns}
+        self.papers_df['gpt_summary'] = [result.get('gpt_summary') for result in parsed]
+        if per_paper_insight:
+            self.papers_df['key_insights'] = [result.get('key_insights') for result in parsed]
+        self.papers_df = apply_schema(self.papers_df)
+        
+        embedding_results = queue.results('embedding')
+        vectors = [decode_embedding(embedding_results[key]) if key in embedding_results else None
+                   for key in keys]
+        dimension = next((len(v) for v in vectors if v is not None), 0)
+        if dimension:
+            self.embeddings = np.array([v if v is not None else np.full(dimension, np.nan) for v in vectors])
+            if self.reducer.enabled:
+                if fit_reducer:
+                    self.reducer.fit_if_missing(self.embeddings)
+                self.embeddings = self.reducer.reduce(self.embeddings)
+        
+        # 최종 실패한 항목은 재시도 큐에 기록 (retry_failed_items()로 재처리 가능)
+        index_of = dict(zip(keys, self.papers_df.index))
+        for stage in ('summary', 'embedding'):
+            for key, error in queue.failures(stage).items():
+                if key in index_of:
+                    self.retry_queue.add(stage, index_of[key], error)
+        
+        print(f"✅ 작업 큐 결과 반영: 요약 {len(summary_results)}개, 임베딩 {len(embedding_results)}개")
+        self.retry_queue.report()
+        return self.papers_df
+    
+    def retry_failed_items(self):
+        """재시도 큐에 남은 요약/임베딩 항목만 다시 처리"""
+        if not len(self.retry_queue):
+            print("✅ 재시도할 항목이 없습니다.")
+            return
+        
+        print(f"🔁 실패 항목 {len(self.retry_queue)}건 재처리 중...")
+        per_paper_insight = 'key_insights' in self.papers_df.columns
+        abstracts = self._request_abstracts()
+        
+        recovered = []
+        for item in self.retry_queue.by_stage('summary'):
+            try:
+                paper = {'title': self.papers_df.at[item['key'], 'title'], 'abstract': abstracts.loc[item['key']]}
+                summary, insight = self._summarize_paper(paper, per_paper_insight)
+                self.papers_df.at[item['key'], 'gpt_summary'] = summary
+                if per_paper_insight:
+                    self.papers_df.at[item['key'], 'key_insights'] = insight
+                recovered.append(item['key'])
+            except Exception as e:
+                print(f"⚠️ 요약 재시도 실패 ({item['key']}): {e}")
+        self.retry_queue.remove('summary', recovered)
+        
+        recovered = []
+        for item in self.retry_queue.by_stage('embedding'):
+            row = self.papers_df.loc[item['key']]
+            try:
+                position = self.papers_df.index.get_loc(item['key'])
+                embedding = self._embed_texts([embedding_text(row['title'], abstracts.loc[item['key']])])
+                self.embeddings[position] = self.reducer.reduce(embedding)[0] if self.reducer.enabled else embedding[0]
+                recovered.append(item['key'])
+            except Exception as e:
+                print(f"⚠️ 임베딩 재시도 실패 ({item['key']}): {e}")
+        self.retry_queue.remove('embedding', recovered)
+        
+        print(f"✅ 재처리 완료 (남은 실패 {len(self.retry_queue)}건)")
+        self.retry_queue.report()
     
     def perform_clustering(self, n_clusters=None):
         """K-means 클러스터링 수행"""
@@ -145,13 +423,18 @@ class PaperAnalyzer:
         print(f"🎯 {n_clusters}개 클러스터로 분류 중...")
         
         try:
-            # K-means 클러스터링
-            kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-            cluster_labels = kmeans.fit_predict(self.embeddings)
+            # 임베딩 생성에 실패한(NaN) 논문은 클러스터 -1로 제외
+            valid = ~np.isnan(self.embeddings).any(axis=1)
+            
+            # K-means 클러스터링 ('spherical'이면 정규화 float32 임베딩의 코사인 K-means)
+            kmeans = make_kmeans(n_clusters)
+            cluster_labels = np.full(len(self.embeddings), -1, dtype=np.int32)
+            cluster_labels[valid] = kmeans.fit_predict(self.embeddings[valid])
             
             # 결과를 데이터프레임에 추가
-            self.papers_df['cluster'] = cluster_labels
+            self.papers_df['cluster'] = cluster_labels.astype(np.int16)
             self.clusters = cluster_labels
+            self.cluster_centers = kmeans.cluster_centers_
             
             # 클러스터별 통계
             cluster_stats = pd.Series(cluster_labels).value_counts().sort_index()
@@ -166,6 +449,166 @@ class PaperAnalyzer:
             print(f"❌ 클러스터링 실패: {e}")
             return None
     
+    def assign_to_clusters(self, centers):
+        """재학습 없이 기존 클러스터 중심 중 가장 가까운 곳에 배정 (K-means와 같은 유클리드 거리)"""
+        if self.embeddings is None:
+            print("❌ 임베딩이 없습니다. 먼저 create_embeddings()를 실행하세요.")
+            return None
+        
+        centers = np.asarray(centers)
+        labels = np.full(len(self.embeddings), -1, dtype=np.int32)
+        valid = ~np.isnan(self.embeddings).any(axis=1)
+        if valid.any():
+            distances = (centers ** 2).sum(axis=1) - 2 * (self.embeddings[valid] @ centers.T)
+            labels[valid] = distances.argmin(axis=1)
+        
+        self.papers_df['cluster'] = labels.astype(np.int16)
+        self.clusters = labels
+        self.cluster_centers = centers
+        return labels
+
+    def refine_other_categories(self):
+        """'Other' 논문을 분류된 논문 임베딩의 카테고리 프로토타입으로 재분류 (API 호출 없음)"""
+        if self.embeddings is None or 'main_category' not in self.papers_df.columns:
+            return 0
+        if not Config.CATEGORY_CLASSIFIER_CONFIG['enabled']:
+            return 0
+
+        other_count = int((self.papers_df['main_category'] == OTHER_LABEL).sum())
+        if other_count == 0:
+            return 0
+
+        classifier = PrototypeClassifier()
+        refined = classifier.refine(self.papers_df, self.embeddings)
+        if classifier.prototypes is None:
+            print(f"⚠️ 프로토타입을 만들 분류된 논문이 부족해 'Other' {other_count}개를 유지합니다.")
+            return 0
+        print(f"🧭 'Other' {other_count}개 중 {refined}개를 카테고리 프로토타입으로 재분류 "
+              f"(프로토타입 {len(classifier.labels)}개, 최소 유사도 {classifier.min_confidence})")
+        return refined
+
+    def perform_hierarchical_clustering(self, n_clusters=None, n_subclusters=None, max_workers=None):
+        """2단계 클러스터링: 상위 K-means 후 각 상위 클러스터를 프로세스 풀에서 독립적으로 하위 분류"""
+        if n_subclusters is None:
+            n_subclusters = Config.CLUSTERING_CONFIG['n_subclusters']
+        if max_workers is None:
+            max_workers = Config.CLUSTERING_CONFIG['subcluster_workers'] or os.cpu_count()
+        
+        # 1단계: 상위 클러스터
+        coarse_labels = self.perform_clustering(n_clusters)
+        if coarse_labels is None:
+            return None
+        
+        print(f"🌳 상위 클러스터별 하위 클러스터링 중... (클러스터당 최대 {n_subclusters}개, 프로세스 {max_workers}개)")
+        start_time = time.time()
+        
+        # 2단계: 상위 클러스터마다 독립적으로 하위 클러스터링
+        jobs = []
+        member_index = {}
+        for cluster_id in np.unique(coarse_labels[coarse_labels >= 0]):
+            members = np.flatnonzero(coarse_labels == cluster_id)
+            member_index[cluster_id] = members
+            jobs.append((cluster_id, self.embeddings[members], n_subclusters,
+                         Config.CLUSTERING_CONFIG['clustering_method']))
+        
+        sub_labels = np.full(len(coarse_labels), -1, dtype=np.int32)
+        self.subcluster_centers = {}
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for cluster_id, labels, centers in executor.map(_subcluster_partition, jobs):
+                    sub_labels[member_index[cluster_id]] = labels
+                    self.subcluster_centers[cluster_id] = centers
+        except Exception as e:
+            print(f"❌ 하위 클러스터링 실패: {e}")
+            return None
+        
+        # 결과를 데이터프레임에 추가 (2단계 id: '상위.하위')
+        self.papers_df['subcluster'] = sub_labels.astype(np.int16)
+        self.papers_df['cluster_path'] = [
+            f"{c}.{s}" if c >= 0 else '-1' for c, s in zip(coarse_labels, sub_labels)
+        ]
+        
+        print("📊 상위/하위 클러스터별 논문 수:")
+        level_stats = self.papers_df.groupby(['cluster', 'subcluster']).size()
+        for cluster_id, sub_counts in level_stats.groupby(level=0):
+            details = ', '.join(f"{s}:{n}" for (_, s), n in sub_counts.items())
+            print(f"  클러스터 {cluster_id}: {sub_counts.sum()}개 → 하위 [{details}]")
+        
+        print(f"✅ 계층 클러스터링 완료! ({time.time() - start_time:.1f}초)")
+        return coarse_labels, sub_labels
+    
+    def name_clusters_with_gpt(self, sample_size=None):
+        """클러스터 중심에 가까운 초록으로 클러스터 이름/키워드 생성 (클러스터당 1회 호출)"""
+        if self.cluster_centers is None or 'cluster' not in self.papers_df.columns:
+            print("❌ 클러스터링이 완료되지 않았습니다. 먼저 perform_clustering()을 실행하세요.")
+            return
+        
+        if sample_size is None:
+            sample_size = Config.GPT_CONFIG['cluster_sample_size']
+        
+        print(f"🏷️ GPT로 클러스터 이름 생성 중... ({len(self.cluster_centers)}회 호출)")
+        
+        abstracts = self._request_abstracts()
+        self.cluster_names = {}
+        
+        for cluster_id, center in enumerate(self.cluster_centers):
+            member_idx = np.where(self.clusters == cluster_id)[0]
+            if len(member_idx) == 0:
+                continue
+            
+            # 중심점과의 거리가 가까운 순으로 대표 논문 선택
+            distances = np.linalg.norm(self.embeddings[member_idx] - center, axis=1)
+            central_idx = member_idx[np.argsort(distances)[:sample_size]]
+            central_papers = self.papers_df.iloc[central_idx]
+            
+            cluster_prompt = cluster_naming_prompt(
+                zip(central_papers['title'], abstracts.iloc[central_idx]))
+            
+            try:
+                response = call_with_retry(
+                    self.client.chat.completions.create,
+                    model=Config.GPT_CONFIG['model'],
+                    messages=[{"role": "user", "content": cluster_prompt}],
+                    max_tokens=Config.GPT_CONFIG['cluster_name_max_tokens'],
+                    temperature=Config.GPT_CONFIG['temperature'],
+                    description='클러스터 이름'
+                )
+                name, keywords = self._parse_cluster_naming(response.choices[0].message.content)
+                
+                time.sleep(Config.GPT_CONFIG['request_interval'])  # API 제한 고려
+                
+            except Exception as e:
+                print(f"⚠️ 클러스터 {cluster_id} 이름 생성 실패: {e}")
+                self.retry_queue.add('cluster_naming', cluster_id, e)
+                name, keywords = f"클러스터 {cluster_id}", []
+            
+            self.cluster_names[cluster_id] = {'name': name, 'keywords': keywords}
+            print(f"  클러스터 {cluster_id}: {name} ({', '.join(keywords)})")
+        
+        # 결과를 데이터프레임에 추가
+        self.papers_df['cluster_name'] = self.papers_df['cluster'].map(
+            lambda c: self.cluster_names.get(c, {}).get('name', ''))
+        self.papers_df['cluster_keywords'] = self.papers_df['cluster'].map(
+            lambda c: ', '.join(self.cluster_names.get(c, {}).get('keywords', [])))
+        self.papers_df = apply_schema(self.papers_df)
+        
+        print("✅ 클러스터 이름 생성 완료!")
+        return self.cluster_names
+    
+    def _parse_cluster_naming(self, text):
+        """'이름: ... / 키워드: ...' 형식의 GPT 응답 파싱"""
+        name = ''
+        keywords = []
+        for line in text.strip().splitlines():
+            if ':' not in line:
+                continue
+            label, value = line.split(':', 1)
+            if '이름' in label or 'name' in label.lower():
+                name = value.strip()
+            elif '키워드' in label or 'keyword' in label.lower():
+                keywords = [k.strip() for k in value.split(',') if k.strip()]
+        return name, keywords
+    
     def analyze_clusters(self):
         """클러스터별 주요 특징 분석"""
         if self.papers_df is None or 'cluster' not in self.papers_df.columns:
@@ -176,28 +619,62 @@ class PaperAnalyzer:
         
         cluster_analysis = []
         
-        for cluster_id in sorted(self.papers_df['cluster'].unique()):
-            cluster_papers = self.papers_df[self.papers_df['cluster'] == cluster_id]
-            
+        # 클러스터마다 전체를 다시 필터링하지 않고 groupby로 한 번에 분할
+        for cluster_id, cluster_papers in self.papers_df.groupby('cluster', sort=True):
             # 클러스터의 주요 특징 추출
+            category_counts = cluster_papers['main_category'].value_counts()
             analysis = {
                 'cluster_id': cluster_id,
                 'paper_count': len(cluster_papers),
-                'main_categories': cluster_papers['main_category'].value_counts().head(3).to_dict(),
-                'avg_year': cluster_papers['published_date'].apply(lambda x: int(x[:4])).mean(),
+                'main_categories': category_counts[category_counts > 0].head(3).to_dict(),
+                'avg_year': pd.to_datetime(cluster_papers['published_date']).dt.year.mean(),
                 'sample_titles': cluster_papers['title'].head(3).tolist(),
-                'common_keywords': self._extract_common_keywords(cluster_papers['key_insights'].tolist())
             }
             
+            # 클러스터 단위 키워드가 있으면 우선 사용, 없으면 논문별 키워드 집계
+            if cluster_id in self.cluster_names:
+                analysis['cluster_name'] = self.cluster_names[cluster_id]['name']
+                analysis['common_keywords'] = self.cluster_names[cluster_id]['keywords']
+            elif 'key_insights' in cluster_papers.columns:
+                analysis['common_keywords'] = self._extract_common_keywords(cluster_papers['key_insights'].tolist())
+            else:
+                analysis['common_keywords'] = []
+            
+            # 하위 클러스터 단위 통계 (계층 클러스터링을 한 경우)
+            if 'subcluster' in cluster_papers.columns:
+                analysis['subclusters'] = self._analyze_subclusters(cluster_papers)
+            
             cluster_analysis.append(analysis)
             
             print(f"\n🎯 클러스터 {cluster_id} ({len(cluster_papers)}개 논문):")
+            if 'cluster_name' in analysis:
+                print(f"  클러스터 이름: {analysis['cluster_name']}")
             print(f"  주요 카테고리: {list(analysis['main_categories'].keys())[:2]}")
             print(f"  평균 발행년도: {analysis['avg_year']:.1f}")
             print(f"  공통 키워드: {analysis['common_keywords'][:3]}")
+            for sub in analysis.get('subclusters', []):
+                print(f"    └ 하위 {sub['cluster_path']} ({sub['paper_count']}개): "
+                      f"{sub['top_category']} / {sub['sample_title'][:40]}")
         
         return cluster_analysis
     
+    def _analyze_subclusters(self, cluster_papers):
+        """상위 클러스터 안의 하위 클러스터별 요약"""
+        subclusters = []
+        for sub_id, sub_papers in cluster_papers.groupby('subcluster', sort=True):
+            category_counts = sub_papers['main_category'].value_counts()
+            sub_analysis = {
+                'cluster_path': sub_papers['cluster_path'].iloc[0],
+                'subcluster_id': sub_id,
+                'paper_count': len(sub_papers),
+                'top_category': category_counts.index[0] if len(category_counts) else '',
+                'sample_title': sub_papers['title'].iloc[0],
+            }
+            if 'key_insights' in sub_papers.columns:
+                sub_analysis['common_keywords'] = self._extract_common_keywords(sub_papers['key_insights'].tolist())
+            subclusters.append(sub_analysis)
+        return subclusters
+    
     def _extract_common_keywords(self, keyword_lists):
         """공통 키워드 추출"""
         all_keywords = []
@@ -216,7 +693,7 @@ class PaperAnalyzer:
         return [kw[0] for kw in sorted_keywords[:5]]
     
     def visualize_clusters(self):
-        """클러스터링 결과 텍스트로 표시 (matplotlib 사용 안함)"""
+        """클러스터링 결과 요약 + PCA 2D 차트 저장 (헤드리스 Agg 렌더링)"""
         if self.embeddings is None or self.clusters is None:
             print("❌ 클러스터링 결과가 없습니다.")
             return
@@ -224,13 +701,159 @@ class PaperAnalyzer:
         print("📊 클러스터링 결과 요약:")
         print("-" * 40)
         
-        unique_clusters = np.unique(self.clusters)
-        for cluster_id in unique_clusters:
-            cluster_papers = self.papers_df[self.papers_df['cluster'] == cluster_id]
-            print(f"클러스터 {cluster_id}: {len(cluster_papers)}개 논문")
-            print(f"  대표 논문: {cluster_papers.iloc[0]['title'][:50]}...")
+        cluster_summary = self.papers_df.groupby('cluster')['title'].agg(['size', 'first'])
+        for cluster_id, row in cluster_summary.iterrows():
+            print(f"클러스터 {cluster_id}: {row['size']}개 논문")
+            print(f"  대표 논문: {row['first'][:50]}...")
+        
+        try:
+            self._render_cluster_chart(Config.OUTPUT_CONFIG['charts_filename'])
+        except Exception as e:
+            print(f"⚠️ 시각화 차트 생성 실패: {e}")
+    
+    def _project_2d(self):
+        """샘플로 학습한 randomized PCA로 전체 임베딩을 청크 단위 2D 투영"""
+        from sklearn.decomposition import PCA
+        
+        viz_config = Config.VISUALIZATION_CONFIG
+        n_points = len(self.embeddings)
+        
+        # 대규모 데이터는 샘플로만 PCA 학습 (임베딩 실패 행 제외)
+        rng = np.random.default_rng(42)
+        valid_idx = np.flatnonzero(np.isfinite(self.embeddings[:, 0]))
+        sample_size = min(len(valid_idx), viz_config['pca_sample_size'])
+        sample_idx = np.sort(rng.choice(valid_idx, size=sample_size, replace=False))
         
-        print("📊 시각화 차트는 matplotlib 오류로 생략됨")
+        pca = PCA(n_components=2, svd_solver='randomized', random_state=42)
+        pca.fit(self.embeddings[sample_idx])
+        
+        # 전체 변환은 청크 단위로 수행해 중간 배열 메모리 제한
+        # (pca.transform은 NaN 행을 거부하므로 직접 투영, 실패 행은 NaN으로 남음)
+        chunk_size = viz_config['transform_chunk_size']
+        points_2d = np.empty((n_points, 2), dtype=np.float32)
+        for start in range(0, n_points, chunk_size):
+            end = start + chunk_size
+            points_2d[start:end] = (self.embeddings[start:end] - pca.mean_) @ pca.components_.T
+        
+        return pca, points_2d
+    
+    def _render_cluster_chart(self, filename):
+        """PCA 2D 차트를 파일로 저장 (plt.show() 없이)"""
+        import matplotlib
+        matplotlib.use('Agg')  # GUI 백엔드 없이 렌더링
+        import matplotlib.pyplot as plt
+        
+        viz_config = Config.VISUALIZATION_CONFIG
+        start_time = time.time()
+        
+        pca, points_2d = self._project_2d()
+        labels = np.asarray(self.clusters)
+        
+        # 클러스터에서 제외된(-1) 논문은 차트에서도 제외
+        keep = labels >= 0
+        if not keep.all():
+            points_2d, labels = points_2d[keep], labels[keep]
+        unique_clusters = np.unique(labels)
+        cmap = plt.get_cmap('tab10' if len(unique_clusters) <= 10 else 'tab20')
+        
+        fig, ax = plt.subplots(figsize=(12, 8))
+        
+        if len(points_2d) <= viz_config['scatter_max_points']:
+            # 소규모: 래스터화된 산점도
+            scatter = ax.scatter(
+                points_2d[:, 0],
+                points_2d[:, 1],
+                c=labels,
+                cmap=cmap,
+                alpha=0.7,
+                s=50 if len(points_2d) < 1000 else 4,
+                linewidths=0,
+                rasterized=True
+            )
+            fig.colorbar(scatter, ax=ax)
+            mode = 'scatter'
+        else:
+            # 대규모: 밀도 격자 이미지 (칸별 최다 클러스터 색 + 로그 밀도 투명도)
+            ax.imshow(self._density_image(points_2d, labels, unique_clusters, cmap),
+                      origin='lower', aspect='auto', interpolation='nearest',
+                      extent=self._density_extent(points_2d))
+            mode = 'density'
+        
+        ax.set_title('Paper clusters (PCA 2D)', fontsize=16, pad=20)
+        ax.set_xlabel(f'PC1 (explained variance: {pca.explained_variance_ratio_[0]:.1%})', fontsize=12)
+        ax.set_ylabel(f'PC2 (explained variance: {pca.explained_variance_ratio_[1]:.1%})', fontsize=12)
+        
+        # 클러스터 중심점 표시
+        if self.cluster_centers is not None and len(self.cluster_centers) == len(unique_clusters):
+            centers_2d = pca.transform(self.cluster_centers)
+        else:
+            centers_2d = np.array([points_2d[labels == c].mean(axis=0) for c in unique_clusters])
+        for cluster_id, center in zip(unique_clusters, centers_2d):
+            ax.annotate(f'C{cluster_id}', center, fontsize=12, fontweight='bold',
+                        bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8))
+        
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        fig.savefig(filename, dpi=viz_config['dpi'], bbox_inches='tight')
+        plt.close(fig)
+        
+        print(f"📊 시각화 저장: {filename} ({len(points_2d)}개 점, {mode}, {time.time() - start_time:.1f}초)")
+    
+    def _density_extent(self, points_2d):
+        """밀도 격자 범위 (극단값 제외)"""
+        x_min, x_max = np.percentile(points_2d[:, 0], [0.5, 99.5])
+        y_min, y_max = np.percentile(points_2d[:, 1], [0.5, 99.5])
+        return [x_min, x_max, y_min, y_max]
+    
+    def _density_image(self, points_2d, labels, unique_clusters, cmap):
+        """클러스터별 2D 히스토그램으로 RGBA 밀도 이미지 생성"""
+        bins = Config.VISUALIZATION_CONFIG['density_bins']
+        x_min, x_max, y_min, y_max = self._density_extent(points_2d)
+        
+        counts = np.zeros((len(unique_clusters), bins, bins), dtype=np.int32)
+        for i, cluster_id in enumerate(unique_clusters):
+            mask = labels == cluster_id
+            counts[i], _, _ = np.histogram2d(
+                points_2d[mask, 1], points_2d[mask, 0],
+                bins=bins, range=[[y_min, y_max], [x_min, x_max]]
+            )
+        
+        total = counts.sum(axis=0)
+        dominant = counts.argmax(axis=0)
+        
+        colors = np.array([cmap(i % cmap.N) for i in range(len(unique_clusters))])
+        image = colors[dominant]
+        image[..., 3] = np.log1p(total) / max(np.log1p(total.max()), 1e-9)
+        return image
+    
+    def _summary_sheets(self):
+        """전체 분석 결과 기준 요약 시트 {시트명: 데이터프레임} (하위클러스터, 요약통계)"""
+        sheets = {}
+        # 하위 클러스터 요약 시트 (계층 클러스터링을 한 경우)
+        if 'subcluster' in self.papers_df.columns:
+            sheets['하위클러스터'] = (
+                self.papers_df.groupby(['cluster', 'subcluster', 'cluster_path'], observed=True)
+                .agg(논문수=('title', 'size'),
+                     주요카테고리=('main_category', lambda c: c.value_counts().index[0]),
+                     대표논문=('title', 'first'))
+                .reset_index()
+            )
+        
+        # 요약 통계
+        summary_stats = {
+            '항목': ['총 논문수', '평균 초록 길이', '클러스터 수', '분석 완료 시간'],
+            '값': [
+                len(self.papers_df),
+                self.papers_df['word_count'].mean(),
+                len(self.papers_df['cluster'].unique()) if 'cluster' in self.papers_df.columns else 0,
+                pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+            ]
+        }
+        if 'subcluster' in self.papers_df.columns:
+            summary_stats['항목'].insert(3, '하위 클러스터 수')
+            summary_stats['값'].insert(3, self.papers_df['cluster_path'].nunique())
+        sheets['요약통계'] = pd.DataFrame(summary_stats)
+        return sheets
     
     def save_analysis_results(self):
         """분석 결과를 엑셀로 저장"""
@@ -240,6 +863,14 @@ class PaperAnalyzer:
         
         filename = Config.OUTPUT_CONFIG['excel_filename']
         
+        if Config.DELTA_EXPORT_CONFIG['enabled']:
+            # 통합 엑셀을 다시 쓰지 않고 새/변경 행만 이번 실행 파티션으로 저장 (요약 시트는 전체 기준으로 함께 저장)
+            from delta_export import DeltaExporter
+            exporter = DeltaExporter(os.path.splitext(os.path.basename(filename))[0])
+            return exporter.export(self.papers_df,
+                                   group_sheets=[('cluster', lambda cluster_id: f'클러스터_{cluster_id}')],
+                                   extra_sheets=self._summary_sheets())
+        
         try:
             with pd.ExcelWriter(filename, engine='openpyxl') as writer:
                 # 전체 분석 결과
@@ -247,24 +878,53 @@ class PaperAnalyzer:
                 
                 # 클러스터별 시트
                 if 'cluster' in self.papers_df.columns:
-                    for cluster_id in sorted(self.papers_df['cluster'].unique()):
-                        cluster_data = self.papers_df[self.papers_df['cluster'] == cluster_id]
+                    for cluster_id, cluster_data in self.papers_df.groupby('cluster', sort=True):
                         sheet_name = f'클러스터_{cluster_id}'
                         cluster_data.to_excel(writer, sheet_name=sheet_name, index=False)
                 
-                # 요약 통계
-                summary_stats = {
-                    '항목': ['총 논문수', '평균 초록 길이', '클러스터 수', '분석 완료 시간'],
-                    '값': [
-                        len(self.papers_df),
-                        self.papers_df['word_count'].mean(),
-                        len(self.papers_df['cluster'].unique()) if 'cluster' in self.papers_df.columns else 0,
-                        pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
-                    ]
-                }
-                pd.DataFrame(summary_stats).to_excel(writer, sheet_name='요약통계', index=False)
+                # 하위 클러스터 요약 / 요약 통계
+                for sheet_name, sheet in self._summary_sheets().items():
+                    sheet.to_excel(writer, sheet_name=sheet_name, index=False)
             
             print(f"💾 분석 결과 저장 완료: {filename}")
             
         except Exception as e:
-            print(f"❌ 파일 저장 실패: {e}")
\ No newline at end of file
+            print(f"❌ 파일 저장 실패: {e}")
+    
+    def save_snapshot(self, snapshot_dir=None):
+        """조회 서비스용 스냅샷 저장 (논문 Parquet + 임베딩/클러스터 중심 .npy)
+        
+        snapshot_dir 아래에 버전 디렉토리를 만들고 CURRENT 파일을 원자적으로 교체하므로
+        실행 중인 query_service는 다음 요청부터 새 스냅샷을 사용합니다.
+        """
+        if self.papers_df is None or self.embeddings is None or self.cluster_centers is None:
+            print("❌ 스냅샷을 만들 분석 결과가 없습니다.")
+            return None
+        
+        snapshot_dir = snapshot_dir or Config.SERVICE_CONFIG['snapshot_dir']
+        version = pd.Timestamp.now().strftime('%Y%m%d-%H%M%S-%f')
+        version_dir = os.path.join(snapshot_dir, version)
+        os.makedirs(version_dir, exist_ok=True)
+        
+        # 코사인 유사도를 내적 한 번으로 계산하도록 정규화해서 저장 (임베딩 실패 행은 0 벡터)
+        embeddings = np.nan_to_num(np.asarray(self.embeddings, dtype=np.float32))
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        np.divide(embeddings, norms, out=embeddings, where=norms > 0)
+        
+        np.save(os.path.join(version_dir, 'embeddings.npy'), embeddings)
+        np.save(os.path.join(version_dir, 'centers.npy'), np.asarray(self.cluster_centers, dtype=np.float32))
+        self.papers_df.to_parquet(os.path.join(version_dir, 'papers.parquet'), index=False)
+        
+        current_tmp = os.path.join(snapshot_dir, 'CURRENT.tmp')
+        with open(current_tmp, 'w', encoding='utf-8') as f:
+            f.write(version)
+        os.replace(current_tmp, os.path.join(snapshot_dir, 'CURRENT'))
+        
+        # 오래된 버전 정리
+        versions = sorted(name for name in os.listdir(snapshot_dir)
+                          if os.path.isdir(os.path.join(snapshot_dir, name)))
+        for old_version in versions[:-Config.SERVICE_CONFIG['keep_snapshots']]:
+            shutil.rmtree(os.path.join(snapshot_dir, old_version), ignore_errors=True)
+        
+        print(f"📸 조회 서비스 스냅샷 저장: {version_dir}")
+        return version_dir
\ No newline at end of file
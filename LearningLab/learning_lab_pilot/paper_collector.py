@@ -1,14 +1,159 @@
 import arxiv
+import numpy as np
+import os
 import pandas as pd
-import requests
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-import re
-import os
+from config import Config
+from schema import apply_schema, text_dtype
+from transport import RetryQueue, call_with_retry, get_http_session
+
+
+def base_arxiv_id(arxiv_id):
+    """'2401.00001v2' → '2401.00001' (버전 접미사 제거)"""
+    head, _, version = arxiv_id.rpartition('v')
+    return head if head and version.isdigit() else arxiv_id
+
+
+class RateLimiter:
+    """여러 스레드가 공유하는 전역 요청 간격 제한기"""
+    
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+    
+    def wait(self):
+        """직전 요청으로부터 min_interval이 지날 때까지 대기"""
+        with self._lock:
+            now = time.monotonic()
+            scheduled = max(now, self._next_time)
+            self._next_time = scheduled + self.min_interval
+        if scheduled > now:
+            time.sleep(scheduled - now)
+
+
+class RateLimitedClient(arxiv.Client):
+    """공유 HTTP 세션을 쓰고, 페이지 요청(재시도 포함)마다 공유 RateLimiter를 거치는 arXiv 클라이언트"""
+    
+    def __init__(self, rate_limiter, page_size=100, query_url_format=None):
+        # 요청 간격은 공유 제한기가, 재시도는 call_with_retry가 관리하므로 클라이언트 자체 지연/재시도는 0
+        super().__init__(page_size=page_size, delay_seconds=0, num_retries=0)
+        self._session = get_http_session()
+        self.rate_limiter = rate_limiter
+        if query_url_format:
+            # arXiv API 대신 같은 Atom 형식을 주는 로컬 피드 (예: 'http://127.0.0.1:8000/feed.xml?{}')
+            self.query_url_format = query_url_format
+    
+    def _fetch_page(self, url, first_page):
+        self.rate_limiter.wait()
+        return super()._parse_feed(url, first_page=first_page)
+    
+    def _parse_feed(self, url, first_page=True, _try_index=0):
+        return call_with_retry(self._fetch_page, url, first_page, description='arXiv 페이지 요청')
+
+
+class PaperRecordBuffer:
+    """수집 논문을 컬럼별 리스트에 쌓고 chunk_size마다 압축된 데이터프레임 청크로 변환
+    
+    논문마다 dict를 만드는 대신 컬럼 단위로 모으고, 카테고리 문자열은 intern,
+    날짜는 datetime64로 보관해 대량 수집 시 메모리를 줄입니다.
+    """
+    
+    TEXT_COLUMNS = ['arxiv_id', 'title', 'authors', 'abstract', 'pdf_url', 'arxiv_url',
+                    'comment', 'journal_ref', 'doi']
+    CATEGORY_COLUMNS = ['categories', 'primary_category']
+    
+    def __init__(self, chunk_size=None):
+        self.chunk_size = chunk_size or Config.STORE_CONFIG['chunk_size']
+        self.collected_at = np.datetime64(datetime.now(), 's')  # 수집 시각은 한 번만 계산
+        self.extra_columns = {}  # 병합 후 추가할 컬럼 (예: matched_queries)
+        self._chunks = []
+        self._count = 0
+        self._text_dtype = text_dtype()
+        self._reset()
+    
+    def _reset(self):
+        self._columns = {name: [] for name in self.TEXT_COLUMNS + self.CATEGORY_COLUMNS}
+        self._published = []
+        self._word_count = []
+    
+    def append(self, paper):
+        """arxiv.Result 하나를 버퍼에 추가하고 행 번호 반환
+        
+        모든 값을 먼저 계산한 뒤 한 번에 추가하므로, 중간에 예외가 나도
+        버퍼 컬럼 길이가 어긋나지 않습니다.
+        """
+        summary = paper.summary
+        row = {
+            'arxiv_id': paper.get_short_id(),
+            'title': paper.title.strip(),
+            'authors': ', '.join([author.name for author in paper.authors]),
+            'abstract': summary.strip().replace('\n', ' '),
+            'pdf_url': paper.pdf_url,
+            'arxiv_url': paper.entry_id,
+            'comment': getattr(paper, 'comment', ''),
+            'journal_ref': getattr(paper, 'journal_ref', ''),
+            'doi': getattr(paper, 'doi', ''),
+            # 같은 카테고리 조합은 하나의 문자열 객체를 공유
+            'categories': sys.intern(', '.join(paper.categories)),
+            'primary_category': sys.intern(paper.primary_category),
+        }
+        published = np.datetime64(paper.published.date(), 'D')
+        word_count = len(summary.split())
+        
+        for name, value in row.items():
+            self._columns[name].append(value)
+        self._published.append(published)
+        self._word_count.append(word_count)
+        
+        self._count += 1
+        if len(self._word_count) >= self.chunk_size:
+            self._flush()
+        return self._count - 1
+    
+    def _flush(self):
+        """현재 컬럼 리스트를 타입이 지정된 데이터프레임 청크로 변환"""
+        if not self._word_count:
+            return
+        start = self._count - len(self._word_count)
+        chunk = pd.DataFrame({
+            'id': np.arange(start + 1, self._count + 1, dtype=np.int32),
+            'published_date': np.array(self._published, dtype='datetime64[ns]'),
+            'word_count': np.array(self._word_count, dtype=np.int32),
+        })
+        for name in self.TEXT_COLUMNS:
+            chunk[name] = pd.array(self._columns[name], dtype=self._text_dtype)
+        for name in self.CATEGORY_COLUMNS:
+            chunk[name] = pd.Categorical(self._columns[name])
+        chunk['collected_at'] = self.collected_at
+        self._chunks.append(chunk)
+        self._reset()
+    
+    def to_frame(self):
+        """모든 청크를 합친 데이터프레임"""
+        self._flush()
+        if not self._chunks:
+            return pd.DataFrame()
+        df = pd.concat(self._chunks, ignore_index=True)
+        # 청크마다 카테고리 목록이 달라 concat 후 object가 되므로 다시 category로
+        for name in self.CATEGORY_COLUMNS:
+            df[name] = df[name].astype('category')
+        for name, values in self.extra_columns.items():
+            df[name] = values
+        return df
+    
+    def __len__(self):
+        return self._count
+
 
 class PaperCollector:
     def __init__(self):
         self.papers = []
+        self.retry_queue = RetryQueue()  # 재시도 후에도 실패한 요청/레코드
         
     def search_arxiv_papers(self, query, max_results=30):
         """arXiv에서 논문 검색 및 메타데이터 수집"""
@@ -22,41 +167,149 @@ class PaperCollector:
             sort_order=arxiv.SortOrder.Descending
         )
         
-        papers_data = []
+        rate_limiter = RateLimiter(Config.ARXIV_SEARCH_CONFIG['min_request_interval'])
+        client = RateLimitedClient(rate_limiter, page_size=min(max_results, 100))
+        
+        papers_data = PaperRecordBuffer()
         
         try:
-            for i, paper in enumerate(search.results(), 1):
+            for i, paper in enumerate(client.results(search), 1):
                 print(f"📄 {i}/{max_results}: {paper.title[:50]}...")
                 
-                # 메타데이터 추출
-                paper_info = {
-                    'id': i,
-                    'arxiv_id': paper.get_short_id(),
-                    'title': paper.title.strip(),
-                    'authors': ', '.join([author.name for author in paper.authors]),
-                    'published_date': paper.published.strftime('%Y-%m-%d'),
-                    'categories': ', '.join(paper.categories),
-                    'primary_category': paper.primary_category,
-                    'abstract': paper.summary.strip().replace('\n', ' '),
-                    'pdf_url': paper.pdf_url,
-                    'arxiv_url': paper.entry_id,
-                    'comment': getattr(paper, 'comment', ''),
-                    'journal_ref': getattr(paper, 'journal_ref', ''),
-                    'doi': getattr(paper, 'doi', ''),
-                    'word_count': len(paper.summary.split()),
-                    'collected_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-                
-                papers_data.append(paper_info)
+                # 메타데이터 추출 (레코드 하나가 잘못돼도 수집은 계속)
+                try:
+                    papers_data.append(paper)
+                except Exception as e:
+                    print(f"⚠️ {i}번 논문 메타데이터 변환 실패: {e}")
+                    self.retry_queue.add('collect_record', paper.entry_id, e)
+                    continue
                 
                 # API 제한 고려한 딜레이
                 time.sleep(0.5)
                 
         except Exception as e:
+            # 페이지 요청이 재시도 후에도 실패하면 남은 구간을 재시도 큐에 기록
             print(f"❌ 오류 발생: {e}")
+            self.retry_queue.add('collect_page', query, e,
+                                 payload={'offset': len(papers_data), 'max_results': max_results})
             
         self.papers = papers_data
         print(f"✅ 총 {len(papers_data)}개 논문 수집 완료!")
+        self.retry_queue.report()
+        return papers_data
+    
+    def fetch_new_papers(self, query, since=None, seen_ids=(), max_results=200, feed_url=None):
+        """제출일 최신순으로 검색해 since 이후의 새 논문만 수집 (이전 논문이 나오면 중단)"""
+        print(f"🛰️ '{query}' 새 논문 확인 중 (기준: {since or '처음'})...")
+        
+        search = arxiv.Search(
+            query=query,
+            max_results=max_results,
+            sort_by=arxiv.SortCriterion.SubmittedDate,
+            sort_order=arxiv.SortOrder.Descending
+        )
+        rate_limiter = RateLimiter(Config.ARXIV_SEARCH_CONFIG['min_request_interval'])
+        client = RateLimitedClient(rate_limiter, page_size=min(max_results, 100), query_url_format=feed_url)
+        
+        papers_data = PaperRecordBuffer()
+        seen_ids = set(seen_ids)
+        self.latest_published = since  # 수집한 논문 중 가장 늦은 제출 시각 (다음 확인의 기준)
+        try:
+            for paper in client.results(search):
+                # 최신순이므로 기준 시각보다 오래된 논문이 나오면 뒤 페이지는 요청하지 않음
+                if since is not None and paper.published < since:
+                    break
+                if base_arxiv_id(paper.get_short_id()) in seen_ids:
+                    continue
+                try:
+                    papers_data.append(paper)
+                except Exception as e:
+                    self.retry_queue.add('collect_record', paper.entry_id, e)
+                    continue
+                if self.latest_published is None or paper.published > self.latest_published:
+                    self.latest_published = paper.published
+        except Exception as e:
+            print(f"❌ 오류 발생: {e}")
+            self.retry_queue.add('collect_page', query, e, payload={'since': str(since)})
+        
+        self.papers = papers_data
+        print(f"✅ 새 논문 {len(papers_data)}개")
+        return papers_data
+    
+    def collect_from_sources(self, query, source_names=None, max_results_per_source=30):
+        """arXiv 외 여러 출처(KCI, Crossref 등)를 동시에 검색하고 DOI/제목 기준으로 병합"""
+        from sources import collect_from_sources
+        
+        papers, failures = collect_from_sources(query, source_names, max_results_per_source)
+        for source_name, error in failures.items():
+            self.retry_queue.add('collect_source', source_name, error, payload={'query': query})
+        
+        self.papers = papers
+        self.retry_queue.report()
+        return papers
+    
+    def category_queries(self):
+        """Config.CATEGORY_MAPPING의 카테고리별 arXiv 검색 쿼리 생성"""
+        return [f"cat:{category}" for category in Config.CATEGORY_MAPPING]
+    
+    def search_multiple_queries(self, queries, max_results_per_query=30, max_workers=None):
+        """여러 쿼리를 공유 속도 제한 아래 동시에 검색하고 arxiv_id로 병합"""
+        if max_workers is None:
+            max_workers = Config.ARXIV_SEARCH_CONFIG['max_workers']
+        
+        print(f"🔍 arXiv에서 {len(queries)}개 쿼리 동시 검색 중 (쿼리당 최대 {max_results_per_query}개, 동시 {max_workers}개)...")
+        
+        rate_limiter = RateLimiter(Config.ARXIV_SEARCH_CONFIG['min_request_interval'])
+        page_size = min(max_results_per_query, 100)
+        
+        def run_query(query):
+            client = RateLimitedClient(rate_limiter, page_size=page_size)
+            search = arxiv.Search(
+                query=query,
+                max_results=max_results_per_query,
+                sort_by=arxiv.SortCriterion.Relevance,
+                sort_order=arxiv.SortOrder.Descending
+            )
+            return list(client.results(search))
+        
+        papers_data = PaperRecordBuffer()
+        row_of = {}  # arxiv_id → 버퍼 행 번호
+        matched_queries = []
+        start_time = time.time()
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(run_query, query): query for query in queries}
+            for future in as_completed(futures):
+                query = futures[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    print(f"❌ '{query}' 검색 실패: {e}")
+                    self.retry_queue.add('collect_query', query, e)
+                    continue
+                
+                new_count = 0
+                for paper in results:
+                    arxiv_id = paper.get_short_id()
+                    if arxiv_id not in row_of:
+                        try:
+                            row_of[arxiv_id] = papers_data.append(paper)
+                        except Exception as e:
+                            self.retry_queue.add('collect_record', paper.entry_id, e)
+                            continue
+                        matched_queries.append(set())
+                        new_count += 1
+                    matched_queries[row_of[arxiv_id]].add(query)
+                print(f"📄 '{query}': {len(results)}개 (신규 {new_count}개)")
+        
+        # 매칭된 쿼리는 입력 쿼리 순서대로 기록
+        papers_data.extra_columns['matched_queries'] = [
+            ', '.join(q for q in queries if q in matched) for matched in matched_queries
+        ]
+        
+        self.papers = papers_data
+        print(f"✅ 총 {len(papers_data)}개 논문 수집 완료! (중복 제거, {time.time() - start_time:.1f}초)")
+        self.retry_queue.report()
         return papers_data
     
     def classify_papers_by_category(self):
@@ -65,7 +318,10 @@ class PaperCollector:
             print("❌ 수집된 논문이 없습니다.")
             return None
             
-        df = pd.DataFrame(self.papers)
+        if isinstance(self.papers, PaperRecordBuffer):
+            df = self.papers.to_frame()
+        else:
+            df = pd.DataFrame(self.papers)
         
         # 주요 카테고리별 분류
         category_mapping = {
@@ -87,7 +343,9 @@ class PaperCollector:
                     return category_mapping[cat]
             return 'Other'
         
-        df['main_category'] = df['categories'].apply(get_main_category)
+        # categories가 category 타입이면 고유 조합마다 한 번만 계산됨
+        df = apply_schema(df)
+        df['main_category'] = df['categories'].map(get_main_category).astype('category')
         
         # 카테고리별 통계
         category_stats = df['main_category'].value_counts()
@@ -107,8 +365,30 @@ class PaperCollector:
                 'arxiv_id', 'pdf_url', 'arxiv_url', 'journal_ref', 'doi', 
                 'comment', 'collected_at'
             ]
+            for column in ('matched_queries', 'sources'):
+                if column in df.columns:
+                    columns_order.append(column)
             
-            df_ordered = df[columns_order]
+            df_ordered = df[columns_order].copy()
+            
+            # 엑셀에는 기존과 같은 문자열 날짜 형식으로 기록
+            for column, date_format in (('published_date', '%Y-%m-%d'), ('collected_at', '%Y-%m-%d %H:%M:%S')):
+                if pd.api.types.is_datetime64_any_dtype(df_ordered[column]):
+                    df_ordered[column] = df_ordered[column].dt.strftime(date_format)
+            
+            # 통계 시트 (전체 수집 결과 기준)
+            stats_df = df['main_category'].value_counts().reset_index()
+            stats_df.columns = ['카테고리', '논문수']
+            
+            if Config.DELTA_EXPORT_CONFIG['enabled']:
+                # 통합 엑셀을 다시 쓰지 않고 새/변경 행만 이번 실행 파티션으로 저장
+                # (load_papers 등은 delta_export.resolve_input으로 이 디렉토리를 읽음)
+                from delta_export import DeltaExporter
+                exporter = DeltaExporter(os.path.splitext(os.path.basename(filename))[0])
+                exporter.export(df_ordered, group_sheets=[
+                    ('main_category', lambda category: category.replace('/', '_')[:30])],
+                    extra_sheets={'통계': stats_df})
+                return
             
             # 엑셀 저장
             with pd.ExcelWriter(filename, engine='openpyxl') as writer:
@@ -116,14 +396,12 @@ class PaperCollector:
                 df_ordered.to_excel(writer, sheet_name='전체논문', index=False)
                 
                 # 카테고리별 시트
-                for category in df['main_category'].unique():
+                for category in df['main_category'].dropna().unique():
                     category_df = df_ordered[df_ordered['main_category'] == category]
                     sheet_name = category.replace('/', '_')[:30]  # 시트명 길이 제한
                     category_df.to_excel(writer, sheet_name=sheet_name, index=False)
                 
                 # 통계 시트
-                stats_df = df['main_category'].value_counts().reset_index()
-                stats_df.columns = ['카테고리', '논문수']
                 stats_df.to_excel(writer, sheet_name='통계', index=False)
             
             print(f"💾 엑셀 파일 저장 완료: {filename}")
@@ -139,7 +417,7 @@ class PaperCollector:
         
         print(f"🔍 검색 키워드: AI technology")
         print(f"📚 총 수집 논문: {len(df)}개")
-        print(f"📅 수집 기간: {df['published_date'].min()} ~ {df['published_date'].max()}")
+        print(f"📅 수집 기간: {self._format_date(df['published_date'].min())} ~ {self._format_date(df['published_date'].max())}")
         print(f"📊 평균 초록 길이: {df['word_count'].mean():.0f} 단어")
         
         print(f"\n🏷️ 주요 카테고리:")
@@ -150,9 +428,14 @@ class PaperCollector:
         print(f"\n📝 최신 논문 5개:")
         latest_papers = df.nlargest(5, 'published_date')
         for _, paper in latest_papers.iterrows():
-            print(f"  • {paper['title'][:60]}... ({paper['published_date']})")
+            print(f"  • {paper['title'][:60]}... ({self._format_date(paper['published_date'])})")
         
         print("\n" + "="*60)
+    
+    @staticmethod
+    def _format_date(value):
+        """datetime이면 'YYYY-MM-DD' 문자열로, 문자열이면 그대로"""
+        return value.strftime('%Y-%m-%d') if hasattr(value, 'strftime') else value
 
 def main():
     """메인 실행 함수"""
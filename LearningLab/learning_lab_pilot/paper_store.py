@@ -0,0 +1,83 @@
+"""
+논문 저장소: 청크 단위 Parquet 파일 디렉토리
+대량 수집/적재 결과를 part-00000.parquet, part-00001.parquet ... 형태로 누적 저장합니다.
+(pyarrow 필요)
+"""
+
+import glob
+import os
+import numpy as np
+import pandas as pd
+from config import Config
+from schema import apply_schema
+
+
+class PaperStore:
+    """청크(part) 파일 단위로 추가/순회하는 논문 저장소"""
+
+    def __init__(self, store_dir=None):
+        self.store_dir = store_dir or Config.STORE_CONFIG['store_dir']
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    def part_files(self):
+        """저장된 청크 파일 목록 (추가 순서)"""
+        return sorted(glob.glob(os.path.join(self.store_dir, 'part-*.parquet')))
+
+    def _next_part_path(self):
+        parts = self.part_files()
+        next_index = 0
+        if parts:
+            last_name = os.path.basename(parts[-1])
+            next_index = int(last_name[len('part-'):-len('.parquet')]) + 1
+        return os.path.join(self.store_dir, f'part-{next_index:05d}.parquet')
+
+    def append(self, df, embeddings=None):
+        """데이터프레임 하나를 새 청크 파일로 추가 (임베딩은 같은 이름의 .npy로 함께 저장)"""
+        if df is None or len(df) == 0:
+            return None
+        path = self._next_part_path()
+        if embeddings is not None:
+            np.save(path[:-len('.parquet')] + '.npy', np.asarray(embeddings, dtype=np.float32))
+        # parquet을 마지막에 써서 part 목록에 보이는 청크는 임베딩까지 완성된 상태
+        df.to_parquet(path, index=False)
+        if Config.TREND_CONFIG['update_on_append']:
+            # 순환 임포트를 피하려고 지연 임포트 (trend_rollups는 store 객체만 받음)
+            from trend_rollups import TrendRollups
+            TrendRollups(self).add(path, df)
+        return path
+
+    def iter_chunks(self, columns=None):
+        """청크 파일을 하나씩 읽어 데이터프레임으로 반환"""
+        for path in self.part_files():
+            yield apply_schema(pd.read_parquet(path, columns=columns))
+
+    def iter_batches(self, batch_size, columns=None):
+        """part 파일 크기와 관계없이 batch_size 행씩 읽기 (한 번에 메모리에 올리는 양 제한)"""
+        import pyarrow.parquet as pq
+        for path in self.part_files():
+            parquet_file = pq.ParquetFile(path)
+            for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+                yield apply_schema(batch.to_pandas())
+
+    def load(self, columns=None):
+        """전체 청크를 하나의 데이터프레임으로 로드"""
+        chunks = list(self.iter_chunks(columns))
+        if not chunks:
+            return pd.DataFrame(columns=columns)
+        # 청크마다 카테고리 목록이 달라 concat 후 다시 스키마 적용
+        return apply_schema(pd.concat(chunks, ignore_index=True))
+
+    def load_embeddings(self):
+        """청크별 임베딩(.npy)을 순서대로 이어 붙임 (임베딩이 없는 청크가 있으면 None)"""
+        arrays = []
+        for path in self.part_files():
+            npy_path = path[:-len('.parquet')] + '.npy'
+            if not os.path.exists(npy_path):
+                return None
+            arrays.append(np.load(npy_path))
+        return np.concatenate(arrays) if arrays else None
+
+    def count(self):
+        """파일 메타데이터만 읽어 전체 논문 수 계산"""
+        import pyarrow.parquet as pq
+        return sum(pq.ParquetFile(path).metadata.num_rows for path in self.part_files())
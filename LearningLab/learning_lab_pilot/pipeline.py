@@ -0,0 +1,373 @@
+"""
+단계(Stage) 그래프 기반 파이프라인
+각 단계가 입력/출력/설정을 선언하고 지문(fingerprint)을 계산해
+입력이 바뀐 단계만 다시 실행합니다.
+
+예) CLUSTERING_CONFIG['n_clusters']만 바꾸면 cluster → export 단계만 재실행되고
+    summarize / embed 단계는 캐시된 결과를 그대로 사용합니다.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import time
+import uuid
+from config import Config
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """파일 내용 해시 (원본 데이터 지문)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_fingerprint(*funcs):
+    """함수 소스 해시 (프롬프트 템플릿이 바뀌면 해당 단계 재실행)"""
+    digest = hashlib.sha256()
+    for func in funcs:
+        digest.update(inspect.getsource(func).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def config_value(key):
+    """'SECTION' 또는 'SECTION.key' 형식으로 Config 값 조회"""
+    section, _, item = key.partition('.')
+    value = getattr(Config, section)
+    return value[item] if item else value
+
+
+class Stage:
+    """파이프라인 단계: 입력/출력 아티팩트와 의존하는 설정을 선언"""
+
+    def __init__(self, name, func, inputs=(), outputs=(), config_keys=(),
+                 params=None, source_files=(), output_files=()):
+        self.name = name
+        self.func = func                    # func(inputs: dict, params: dict) -> dict
+        self.inputs = list(inputs)          # 다른 단계가 만든 아티팩트 이름
+        self.outputs = list(outputs)        # 이 단계가 만드는 아티팩트 이름
+        self.config_keys = list(config_keys)  # 예: 'GPT_CONFIG.model'
+        self.params = params or {}          # 실행 인자 (쿼리, 클러스터 수 등)
+        self.source_files = list(source_files)  # 내용 해시를 지문에 포함할 원본 파일
+        self.output_files = list(output_files)  # 단계가 쓰는 파일 (없으면 재실행)
+
+
+class StageGraph:
+    """단계 그래프: 지문이 바뀐 단계만 실행하고 결과는 디스크에 캐시"""
+
+    def __init__(self, cache_dir='.pipeline_cache'):
+        self.cache_dir = cache_dir
+        self.stages = {}
+        self.producers = {}
+        self.state_file = os.path.join(cache_dir, 'state.json')
+
+    def add_stage(self, stage):
+        """단계 등록 (출력 아티팩트 이름은 그래프 안에서 유일해야 함)"""
+        for output in stage.outputs:
+            if output in self.producers:
+                raise ValueError(f"아티팩트 '{output}'를 만드는 단계가 이미 있습니다: {self.producers[output]}")
+            self.producers[output] = stage.name
+        self.stages[stage.name] = stage
+        return stage
+
+    def _ordered_stages(self):
+        """입력 의존성 기준 위상 정렬"""
+        ordered = []
+        visiting = set()
+        done = set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"단계 그래프에 순환이 있습니다: {name}")
+            visiting.add(name)
+            for artifact in self.stages[name].inputs:
+                if artifact not in self.producers:
+                    raise ValueError(f"'{name}' 단계의 입력 '{artifact}'를 만드는 단계가 없습니다.")
+                visit(self.producers[artifact])
+            visiting.discard(name)
+            done.add(name)
+            ordered.append(self.stages[name])
+
+        for name in self.stages:
+            visit(name)
+        return ordered
+
+    def _fingerprint(self, stage, artifact_fingerprints):
+        """입력 지문 + 설정 + 인자 + 원본 파일 해시로 단계 지문 계산"""
+        payload = {
+            'stage': stage.name,
+            'inputs': {name: artifact_fingerprints[name] for name in stage.inputs},
+            'config': {key: config_value(key) for key in stage.config_keys},
+            'params': stage.params,
+            'sources': {path: hash_file(path) for path in stage.source_files},
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _load_state(self):
+        if not os.path.exists(self.state_file):
+            return {}
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_state(self, state):
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+
+    def _artifact_path(self, artifact):
+        return os.path.join(self.cache_dir, f'{artifact}.pkl')
+
+    @staticmethod
+    def _artifact_fingerprint(fingerprint, run_id):
+        """아티팩트 지문 = 단계 지문 + 실행 id (단계가 다시 실행되면 하위 단계 지문도 바뀜)"""
+        return f'{fingerprint}:{run_id}'
+
+    def _is_fresh(self, stage, fingerprint, state):
+        """이전 실행과 지문이 같고 출력물이 모두 남아 있으면 최신"""
+        entry = state.get(stage.name)
+        if not isinstance(entry, dict) or entry.get('fingerprint') != fingerprint:
+            return False
+        if not all(os.path.exists(self._artifact_path(a)) for a in stage.outputs):
+            return False
+        return all(os.path.exists(path) for path in stage.output_files)
+
+    def fresh_stages(self, force=()):
+        """실행하지 않고, 지금 run(force)하면 캐시를 그대로 쓸 단계 이름 집합 (비용 사전 추정용)
+
+        다시 실행될 단계의 하위 단계도 run()과 똑같이 최신이 아닌 것으로 계산합니다.
+        """
+        state = self._load_state()
+        artifact_fingerprints = {}
+        fresh = set()
+        for stage in self._ordered_stages():
+            fingerprint = self._fingerprint(stage, artifact_fingerprints)
+            if stage.name not in force and self._is_fresh(stage, fingerprint, state):
+                fresh.add(stage.name)
+                run_id = state[stage.name]['run_id']
+            else:
+                run_id = 'pending'  # 실행되면 새 id를 받으므로 저장된 어떤 id와도 다름
+            for output in stage.outputs:
+                artifact_fingerprints[output] = self._artifact_fingerprint(fingerprint, run_id)
+        return fresh
+
+    def run(self, force=()):
+        """변경된 단계만 실행. force에 단계 이름을 주면 강제 재실행 (하위 단계도 함께 재실행)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        state = self._load_state()
+        artifact_fingerprints = {}
+        artifacts = {}
+        executed = []
+        skipped = []
+
+        for stage in self._ordered_stages():
+            fingerprint = self._fingerprint(stage, artifact_fingerprints)
+
+            if stage.name not in force and self._is_fresh(stage, fingerprint, state):
+                for output in stage.outputs:
+                    artifact_fingerprints[output] = self._artifact_fingerprint(
+                        fingerprint, state[stage.name]['run_id'])
+                print(f"⏭️ [{stage.name}] 입력 변경 없음 - 건너뜀")
+                skipped.append(stage.name)
+                continue
+
+            # 필요한 입력만 메모리 또는 캐시에서 로드
+            inputs = {}
+            for artifact in stage.inputs:
+                if artifact not in artifacts:
+                    with open(self._artifact_path(artifact), 'rb') as f:
+                        artifacts[artifact] = pickle.load(f)
+                inputs[artifact] = artifacts[artifact]
+
+            print(f"▶️ [{stage.name}] 실행 중...")
+            start_time = time.time()
+            outputs = stage.func(inputs, stage.params) or {}
+
+            missing = [a for a in stage.outputs if a not in outputs]
+            if missing:
+                raise RuntimeError(f"'{stage.name}' 단계가 출력 {missing}을(를) 반환하지 않았습니다.")
+
+            for artifact in stage.outputs:
+                artifacts[artifact] = outputs[artifact]
+                with open(self._artifact_path(artifact), 'wb') as f:
+                    pickle.dump(outputs[artifact], f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            # 실행할 때마다 새 실행 id → 지문이 같아도(--force) 하위 단계는 새 결과로 다시 실행
+            run_id = uuid.uuid4().hex
+            for output in stage.outputs:
+                artifact_fingerprints[output] = self._artifact_fingerprint(fingerprint, run_id)
+            state[stage.name] = {'fingerprint': fingerprint, 'run_id': run_id}
+            self._save_state(state)
+            executed.append(stage.name)
+            print(f"✅ [{stage.name}] 완료 ({time.time() - start_time:.1f}초)")
+
+        print(f"\n📋 실행: {executed or '없음'} / 건너뜀: {skipped or '없음'}")
+        return {'executed': executed, 'skipped': skipped}
+
+
+def build_analysis_graph(excel_file=None, query=None, n_clusters=None, cache_dir='.pipeline_cache'):
+    """수집(선택) → 로드 → 요약 → 임베딩 → 클러스터링 → 저장 단계 그래프 구성"""
+    from delta_export import output_file, source_file
+    from paper_analyzer import PaperAnalyzer, cluster_naming_prompt, insight_prompt, summary_prompt
+
+    graph = StageGraph(cache_dir)
+    analyzer = None
+
+    def get_analyzer():
+        nonlocal analyzer
+        if analyzer is None:
+            analyzer = PaperAnalyzer()
+        return analyzer
+
+    if excel_file is None:
+        # 원본 파일이 없으면 arXiv 수집 단계부터 실행
+        collected_file = 'collected_papers.xlsx'
+
+        def collect(inputs, params):
+            from paper_collector import PaperCollector
+            collector = PaperCollector()
+            collector.search_arxiv_papers(params['query'], max_results=params['max_results'])
+            df = collector.classify_papers_by_category()
+            if df is None:
+                raise RuntimeError("논문 수집 실패")
+            collector.save_to_excel(df, collected_file)
+            return {'papers': df}
+
+        graph.add_stage(Stage(
+            'collect', collect,
+            outputs=['papers'],
+            config_keys=['ARXIV_SEARCH_CONFIG', 'CATEGORY_MAPPING', 'DELTA_EXPORT_CONFIG'],
+            params={
+                'query': query or "artificial intelligence OR machine learning OR deep learning OR AI technology",
+                'max_results': Config.ARXIV_SEARCH_CONFIG['max_results'],
+            },
+            output_files=[output_file(collected_file)],  # delta 모드면 증분 내보내기 매니페스트
+        ))
+    else:
+        def load(inputs, params):
+            a = get_analyzer()
+            if not a.load_papers(params['excel_file']):
+                raise RuntimeError(f"{params['excel_file']} 로드 실패")
+            return {'papers': a.papers_df}
+
+        graph.add_stage(Stage(
+            'load', load,
+            outputs=['papers'],
+            params={'excel_file': excel_file},
+            source_files=[source_file(excel_file)],  # 증분 내보내기 디렉토리면 매니페스트 해시
+        ))
+
+    def summarize(inputs, params):
+        a = get_analyzer()
+        a.papers_df = inputs['papers'].copy()
+        a.summarize_abstracts_with_gpt()
+        summary_columns = [c for c in ('gpt_summary', 'key_insights', 'summary_tier') if c in a.papers_df.columns]
+        return {'summaries': a.papers_df[summary_columns]}
+
+    graph.add_stage(Stage(
+        'summarize', summarize,
+        inputs=['papers'],
+        outputs=['summaries'],
+        config_keys=['GPT_CONFIG.model', 'GPT_CONFIG.max_tokens', 'GPT_CONFIG.insight_max_tokens',
+                     'GPT_CONFIG.temperature', 'GPT_CONFIG.insight_mode', 'GPT_CONFIG.normalize_abstracts',
+                     'GPT_CONFIG.request_interval', 'SUMMARY_ROUTING_CONFIG'],
+        params={'prompts': source_fingerprint(summary_prompt, insight_prompt)},
+    ))
+
+    def embed(inputs, params):
+        a = get_analyzer()
+        a.papers_df = inputs['papers'].copy()
+        embeddings = a.create_embeddings(fit_reducer=True)
+        if embeddings is None:
+            raise RuntimeError("임베딩 생성 실패")
+        return {'embeddings': embeddings}
+
+    graph.add_stage(Stage(
+        'embed', embed,
+        inputs=['papers'],
+        outputs=['embeddings'],
+        config_keys=['CLUSTERING_CONFIG.embedding_model', 'CLUSTERING_CONFIG.embedding_dimensions',
+                     'CLUSTERING_CONFIG.dimension_reduction', 'GPT_CONFIG.normalize_abstracts'],
+    ))
+
+    def cluster(inputs, params):
+        a = get_analyzer()
+        a.papers_df = inputs['papers'].copy()
+        a.embeddings = inputs['embeddings']
+        if Config.CLUSTERING_CONFIG['hierarchical']:
+            result = a.perform_hierarchical_clustering(params['n_clusters'])
+            if result is None:
+                raise RuntimeError("계층 클러스터링 실패")
+            labels, sub_labels = result
+            return {'clusters': {'labels': labels, 'centers': a.cluster_centers,
+                                 'sub_labels': sub_labels, 'sub_centers': a.subcluster_centers}}
+
+        labels = a.perform_clustering(params['n_clusters'])
+        if labels is None:
+            raise RuntimeError("클러스터링 실패")
+        return {'clusters': {'labels': labels, 'centers': a.cluster_centers}}
+
+    graph.add_stage(Stage(
+        'cluster', cluster,
+        inputs=['papers', 'embeddings'],
+        outputs=['clusters'],
+        config_keys=['CLUSTERING_CONFIG.n_clusters', 'CLUSTERING_CONFIG.clustering_method',
+                     'CLUSTERING_CONFIG.hierarchical', 'CLUSTERING_CONFIG.n_subclusters',
+                     'CLUSTERING_CONFIG.spherical_n_init', 'CLUSTERING_CONFIG.spherical_max_iter',
+                     'CLUSTERING_CONFIG.spherical_tol', 'CLUSTERING_CONFIG.spherical_seed_sample_size'],
+        params={'n_clusters': n_clusters},
+    ))
+
+    def export(inputs, params):
+        a = get_analyzer()
+        a.papers_df = inputs['papers'].copy()
+        for column in inputs['summaries'].columns:
+            a.papers_df[column] = inputs['summaries'][column].values
+        a.embeddings = inputs['embeddings']
+        a.clusters = inputs['clusters']['labels']
+        a.cluster_centers = inputs['clusters']['centers']
+        a.papers_df['cluster'] = a.clusters
+        if 'sub_labels' in inputs['clusters']:
+            sub_labels = inputs['clusters']['sub_labels']
+            a.subcluster_centers = inputs['clusters']['sub_centers']
+            a.papers_df['subcluster'] = sub_labels
+            a.papers_df['cluster_path'] = [
+                f"{c}.{s}" if c >= 0 else '-1' for c, s in zip(a.clusters, sub_labels)
+            ]
+        a.cluster_names = {}
+
+        a.refine_other_categories()
+        if Config.GPT_CONFIG['insight_mode'] == 'cluster':
+            a.name_clusters_with_gpt()
+        a.analyze_clusters()
+        a.visualize_clusters()
+        a.save_analysis_results()
+        a.save_snapshot()
+        return {'report': Config.OUTPUT_CONFIG['excel_filename']}
+
+    graph.add_stage(Stage(
+        'export', export,
+        inputs=['papers', 'summaries', 'embeddings', 'clusters'],
+        outputs=['report'],
+        config_keys=['OUTPUT_CONFIG', 'VISUALIZATION_CONFIG', 'SERVICE_CONFIG.snapshot_dir',
+                     'GPT_CONFIG.model', 'GPT_CONFIG.temperature', 'GPT_CONFIG.cluster_name_max_tokens',
+                     'GPT_CONFIG.insight_mode', 'GPT_CONFIG.cluster_sample_size',
+                     'CATEGORY_CLASSIFIER_CONFIG', 'CATEGORY_MAPPING', 'DELTA_EXPORT_CONFIG'],
+        params={'prompts': source_fingerprint(cluster_naming_prompt)},
+        output_files=[output_file(Config.OUTPUT_CONFIG['excel_filename'])],
+    ))
+
+    return graph
+
+
+def run_incremental(excel_file=None, query=None, n_clusters=None, force=()):
+    """입력이 바뀐 단계만 실행하는 분석 파이프라인"""
+    print("🧩 증분 파이프라인 실행")
+    print("=" * 50)
+    graph = build_analysis_graph(excel_file, query, n_clusters)
+    return graph.run(force=force)
@@ -0,0 +1,310 @@
+"""
+로컬 조회 서비스: 분석 스냅샷을 메모리에 올려 두고 HTTP로 질의에 응답
+- 논문 조회 / 유사 논문(코사인 최근접) / 클러스터별 최신 논문 / 새 초록의 클러스터 배정
+- 임베딩은 memory-map(.npy)으로 열어 여러 요청이 같은 페이지를 공유
+- ThreadingHTTPServer로 동시 요청 처리, CURRENT 파일이 바뀌면 새 스냅샷을 로드한 뒤 교체(무중단)
+
+스냅샷은 PaperAnalyzer.save_snapshot()이 만듭니다.
+
+엔드포인트:
+    GET  /health
+    GET  /clusters
+    GET  /clusters/<id>/latest?n=10
+    GET  /papers/<arxiv_id>
+    GET  /papers/<arxiv_id>/similar?k=10
+    POST /assign   {"abstract": "..."} 또는 {"embedding": [...]}, 선택: "k"
+    POST /reload
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+import numpy as np
+import pandas as pd
+from config import Config
+from embedding_reduction import EmbeddingReducer
+from transport import call_with_retry, create_openai_client
+
+# 응답에 포함할 컬럼 (있는 것만 사용)
+RESPONSE_COLUMNS = [
+    'arxiv_id', 'title', 'authors', 'published_date', 'main_category',
+    'cluster', 'cluster_path', 'cluster_name', 'gpt_summary', 'arxiv_url', 'pdf_url'
+]
+
+
+def read_current_version(snapshot_dir):
+    """CURRENT 파일이 가리키는 스냅샷 버전 (없으면 None)"""
+    try:
+        with open(os.path.join(snapshot_dir, 'CURRENT'), encoding='utf-8') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def parse_count(value, name, upper):
+    """요청 인자(k, n)를 1 이상 upper 이하 정수로 변환 (범위 밖이면 ValueError)"""
+    try:
+        count = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} 값은 정수여야 합니다: {value!r}") from None
+    if not 1 <= count <= upper:
+        raise ValueError(f"{name} 값은 1 이상 {upper} 이하여야 합니다: {count}")
+    return count
+
+
+class CorpusIndex:
+    """스냅샷 한 버전의 읽기 전용 인덱스 (생성 후 변경하지 않으므로 스레드 간 공유 가능)"""
+
+    def __init__(self, version_dir):
+        self.version = os.path.basename(os.path.normpath(version_dir))
+        papers_df = pd.read_parquet(os.path.join(version_dir, 'papers.parquet'))
+        self.embeddings = np.load(os.path.join(version_dir, 'embeddings.npy'), mmap_mode='r')
+        self.centers = np.load(os.path.join(version_dir, 'centers.npy'))
+        self.center_sq_norms = (self.centers ** 2).sum(axis=1)
+
+        columns = [column for column in RESPONSE_COLUMNS if column in papers_df.columns]
+        self.papers = papers_df[columns]
+        self.row_of = {arxiv_id: row for row, arxiv_id in enumerate(papers_df['arxiv_id'])}
+
+        # 클러스터별 행 번호를 최신순으로 미리 정렬
+        clusters = papers_df['cluster'].to_numpy() if 'cluster' in papers_df.columns \
+            else np.full(len(papers_df), -1)
+        published = pd.to_datetime(papers_df['published_date'], errors='coerce')
+        order = np.argsort(-published.fillna(pd.Timestamp.min).to_numpy().astype('int64'), kind='stable')
+        self.latest_rows = {
+            int(cluster_id): order[clusters[order] == cluster_id]
+            for cluster_id in np.unique(clusters) if cluster_id >= 0
+        }
+
+    def records(self, rows, scores=None):
+        """행 번호 목록 → JSON 직렬화 가능한 레코드"""
+        records = json.loads(self.papers.iloc[rows].to_json(orient='records', date_format='iso',
+                                                             force_ascii=False))
+        if scores is not None:
+            for record, score in zip(records, scores):
+                record['score'] = round(float(score), 4)
+        return records
+
+    def lookup(self, arxiv_id):
+        row = self.row_of.get(arxiv_id)
+        return None if row is None else self.records([row])[0]
+
+    def nearest(self, vector, k, exclude_row=None):
+        """정규화된 벡터와 코사인 유사도가 가장 높은 k개 (행 번호, 점수)"""
+        scores = self.embeddings @ vector
+        if exclude_row is not None:
+            scores[exclude_row] = -np.inf
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return top, scores[top]
+
+    def similar(self, arxiv_id, k):
+        row = self.row_of.get(arxiv_id)
+        if row is None:
+            return None
+        vector = np.asarray(self.embeddings[row])
+        if not vector.any():
+            return []  # 임베딩이 실패했던 논문
+        rows, scores = self.nearest(vector, k, exclude_row=row)
+        return self.records(rows, scores)
+
+    def latest(self, cluster_id, n):
+        rows = self.latest_rows.get(cluster_id)
+        return None if rows is None else self.records(rows[:n])
+
+    def assign(self, embedding, k):
+        """새 임베딩을 가장 가까운 클러스터 중심(K-means와 같은 유클리드 거리)에 배정"""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        distances = self.center_sq_norms - 2 * (self.centers @ embedding)
+        cluster_id = int(np.argmin(distances))
+
+        norm = np.linalg.norm(embedding)
+        rows, scores = self.nearest(embedding / norm if norm > 0 else embedding, k)
+        return {'cluster': cluster_id, 'similar': self.records(rows, scores)}
+
+    def cluster_summary(self):
+        summary = []
+        for cluster_id, rows in self.latest_rows.items():
+            entry = {'cluster': cluster_id, 'paper_count': int(len(rows))}
+            if 'cluster_name' in self.papers.columns and len(rows):
+                entry['cluster_name'] = self.papers['cluster_name'].iloc[rows[0]]
+            summary.append(entry)
+        return summary
+
+
+class QueryService:
+    """현재 인덱스를 들고 있다가 새 스냅샷이 생기면 교체"""
+
+    def __init__(self, snapshot_dir=None):
+        self.snapshot_dir = snapshot_dir or Config.SERVICE_CONFIG['snapshot_dir']
+        self.index = None
+        self._reload_lock = threading.Lock()
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.reducer = EmbeddingReducer()  # 스냅샷과 같은 차원으로 축소
+
+    def reload(self):
+        """CURRENT 버전이 바뀌었으면 새 인덱스를 만든 뒤 참조만 교체 (진행 중인 요청은 이전 인덱스 사용)"""
+        with self._reload_lock:
+            version = read_current_version(self.snapshot_dir)
+            if version is None:
+                raise FileNotFoundError(f"스냅샷이 없습니다: {self.snapshot_dir}/CURRENT")
+            if self.index is not None and self.index.version == version:
+                return False
+
+            start_time = time.time()
+            index = CorpusIndex(os.path.join(self.snapshot_dir, version))
+            self.index = index
+            print(f"🔄 스냅샷 로드: {version} (논문 {len(index.row_of)}개, "
+                  f"클러스터 {len(index.centers)}개, {time.time() - start_time:.2f}초)")
+            return True
+
+    def watch(self, interval):
+        """주기적으로 CURRENT를 확인하는 백그라운드 스레드 시작"""
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.reload()
+                except Exception as e:
+                    print(f"⚠️ 스냅샷 교체 실패 (기존 스냅샷 유지): {e}")
+
+        threading.Thread(target=loop, daemon=True).start()
+
+    def embed(self, text):
+        """새 초록 임베딩 (OpenAI 클라이언트는 처음 필요할 때 생성)"""
+        with self._client_lock:
+            if self._client is None:
+                self._client = create_openai_client()
+        response = call_with_retry(
+            self._client.embeddings.create,
+            model=Config.CLUSTERING_CONFIG['embedding_model'],
+            input=[text],
+            description='초록 임베딩',
+            **self.reducer.request_kwargs()
+        )
+        embedding = response.data[0].embedding
+        if self.reducer.enabled:
+            return self.reducer.reduce([embedding])[0]
+        return embedding
+
+
+def make_handler(service):
+    """QueryService에 연결된 요청 핸들러 클래스 생성"""
+
+    class QueryHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            return json.loads(self.rfile.read(length) or b'{}')
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            path = unquote(url.path).rstrip('/')
+            index = service.index  # 요청 처리 중에는 같은 인덱스 사용
+            if index is None:
+                return self._send_json(503, {'error': '로드된 스냅샷이 없습니다'})
+            default_k = Config.SERVICE_CONFIG['default_k']
+
+            try:
+                if path == '/health':
+                    return self._send_json(200, {'version': index.version, 'papers': len(index.row_of)})
+                if path == '/clusters':
+                    return self._send_json(200, index.cluster_summary())
+                if path.startswith('/clusters/') and path.endswith('/latest'):
+                    cluster_id = int(path[len('/clusters/'):-len('/latest')])
+                    n = parse_count(query.get('n', [default_k])[0], 'n', len(index.row_of))
+                    result = index.latest(cluster_id, n)
+                elif path.startswith('/papers/') and path.endswith('/similar'):
+                    # arxiv_id에 '/'가 들어갈 수 있으므로(hep-th/9901001) 접두/접미만 제거
+                    arxiv_id = path[len('/papers/'):-len('/similar')]
+                    # 자기 자신은 제외하므로 최대 (논문 수 - 1)개
+                    k = parse_count(query.get('k', [default_k])[0], 'k', len(index.row_of) - 1)
+                    result = index.similar(arxiv_id, k)
+                elif path.startswith('/papers/'):
+                    result = index.lookup(path[len('/papers/'):])
+                else:
+                    return self._send_json(404, {'error': f'알 수 없는 경로: {path}'})
+            except ValueError as e:
+                return self._send_json(400, {'error': str(e)})
+            except (KeyError, IndexError) as e:
+                return self._send_json(404, {'error': f'해당 논문/클러스터가 없습니다: {e}'})
+            except OSError as e:
+                # memory-map된 임베딩 파일을 읽지 못한 경우 (스냅샷 교체/삭제 등)
+                return self._send_json(503, {'error': f'스냅샷을 읽을 수 없습니다: {e}'})
+            except Exception as e:
+                return self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+
+            if result is None:
+                return self._send_json(404, {'error': '해당 논문/클러스터가 없습니다'})
+            return self._send_json(200, result)
+
+        def do_POST(self):
+            path = urlparse(self.path).path.rstrip('/')
+            try:
+                if path == '/reload':
+                    changed = service.reload()
+                    return self._send_json(200, {'reloaded': changed, 'version': service.index.version})
+                if path == '/assign':
+                    payload = self._read_json()
+                    index = service.index
+                    if index is None:
+                        return self._send_json(503, {'error': '로드된 스냅샷이 없습니다'})
+                    embedding = payload.get('embedding')
+                    if embedding is None:
+                        if not payload.get('abstract'):
+                            return self._send_json(400, {'error': 'abstract 또는 embedding이 필요합니다'})
+                        embedding = service.embed(payload['abstract'])
+                    k = parse_count(payload.get('k', Config.SERVICE_CONFIG['default_k']), 'k', len(index.row_of))
+                    return self._send_json(200, index.assign(embedding, k))
+                return self._send_json(404, {'error': f'알 수 없는 경로: {path}'})
+            except (ValueError, KeyError) as e:
+                return self._send_json(400, {'error': str(e)})
+            except FileNotFoundError as e:
+                return self._send_json(404, {'error': str(e)})
+            except OSError as e:
+                return self._send_json(503, {'error': f'스냅샷을 읽을 수 없습니다: {e}'})
+            except Exception as e:
+                return self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+
+        def log_message(self, format, *args):
+            pass  # 요청마다 로그를 찍지 않음
+
+    return QueryHandler
+
+
+def serve(snapshot_dir=None, host=None, port=None, reload_interval=None):
+    """스냅샷을 로드하고 HTTP 서비스 시작 (Ctrl+C로 종료)"""
+    config = Config.SERVICE_CONFIG
+    host = host or config['host']
+    port = port or config['port']
+    reload_interval = config['reload_interval'] if reload_interval is None else reload_interval
+
+    service = QueryService(snapshot_dir)
+    service.reload()
+    if reload_interval:
+        service.watch(reload_interval)
+
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    print(f"🌐 조회 서비스 시작: http://{host}:{port} (스냅샷: {service.snapshot_dir})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 조회 서비스 종료")
+    finally:
+        server.server_close()
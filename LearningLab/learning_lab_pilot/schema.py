@@ -0,0 +1,69 @@
+"""
+논문 테이블 스키마: 컬럼별 dtype 정의와 적용
+- 카테고리 컬럼: category
+- 날짜 컬럼: datetime64
+- 텍스트 컬럼: Arrow 기반 문자열 (pyarrow가 없으면 object)
+- 정수 컬럼: int32 / 클러스터·하위 클러스터 id는 int16
+"""
+
+import pandas as pd
+
+
+def text_dtype():
+    """pyarrow가 있으면 Arrow 기반 문자열, 없으면 object"""
+    try:
+        import pyarrow  # noqa: F401
+        return 'string[pyarrow]'
+    except ImportError:
+        return object
+
+
+CATEGORY_COLUMNS = ['main_category', 'primary_category', 'categories', 'cluster_name', 'summary_tier']
+DATE_COLUMNS = ['published_date', 'collected_at']
+TEXT_COLUMNS = [
+    'arxiv_id', 'title', 'authors', 'abstract', 'clean_abstract', 'pdf_url', 'arxiv_url', 'comment',
+    'journal_ref', 'doi', 'matched_queries', 'sources', 'gpt_summary', 'key_insights', 'cluster_keywords',
+    'cluster_path'
+]
+INTEGER_COLUMNS = {'id': 'int32', 'word_count': 'int32', 'cluster': 'int16', 'subcluster': 'int16'}
+
+
+def apply_schema(df):
+    """존재하는 컬럼에만 스키마 dtype 적용 (이미 맞는 타입이면 건너뜀)"""
+    if df is None:
+        return df
+
+    string_dtype = text_dtype()
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+
+    for column in DATE_COLUMNS:
+        if column in df.columns and not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = pd.to_datetime(df[column], errors='coerce')
+
+    for column in TEXT_COLUMNS:
+        if column in df.columns and df[column].dtype != string_dtype:
+            # 엑셀에서 숫자로 읽힌 값(예: doi 없음 → NaN)도 문자열/결측으로 통일
+            df[column] = df[column].astype(string_dtype)
+
+    for column, dtype in INTEGER_COLUMNS.items():
+        if column in df.columns and df[column].dtype != dtype and not df[column].isna().any():
+            df[column] = df[column].astype(dtype)
+
+    return df
+
+
+def memory_usage_mb(df):
+    """데이터프레임 실제 메모리 사용량(MB)"""
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def apply_schema_with_report(df, label='papers_df'):
+    """스키마 적용 전후 메모리 사용량 출력"""
+    before = memory_usage_mb(df)
+    df = apply_schema(df)
+    after = memory_usage_mb(df)
+    reduction = (1 - after / before) * 100 if before > 0 else 0
+    print(f"🧮 {label} 메모리: {before:.1f}MB → {after:.1f}MB ({reduction:.0f}% 감소)")
+    return df
@@ -0,0 +1,217 @@
+"""
+arXiv 메타데이터 스냅샷 대량 적재
+- JSON Lines 스냅샷 (arxiv-metadata-oai-snapshot.json, .gz 가능): 한 줄에 레코드 하나
+- OAI-PMH XML 덤프 (metadataPrefix=arXiv, .gz 가능)
+
+파일을 스트리밍으로 읽어 일정한 메모리로 처리하고, Config.CATEGORY_MAPPING 카테고리만 골라
+PaperCollector와 같은 컬럼으로 변환한 뒤 청크 단위로 PaperStore에 저장합니다.
+
+arxiv_id는 두 형식 모두 버전 접미사 없는 id('2401.00001')로 저장합니다.
+OAI XML(metadataPrefix=arXiv)에는 버전 정보가 없으므로, 입력 형식과 관계없이 같은 논문이 같은 key를 갖도록
+버전 없는 형식으로 통일했습니다. PaperCollector 결과('2401.00001v2')와는 base_arxiv_id()로 맞춰 비교합니다.
+"""
+
+import gzip
+import json
+import re
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+import pandas as pd
+from config import Config
+from paper_store import PaperStore
+from schema import apply_schema
+
+# PaperCollector.save_to_excel과 같은 컬럼 순서
+PAPER_COLUMNS = [
+    'id', 'title', 'authors', 'published_date', 'main_category',
+    'primary_category', 'categories', 'abstract', 'word_count',
+    'arxiv_id', 'pdf_url', 'arxiv_url', 'journal_ref', 'doi',
+    'comment', 'collected_at'
+]
+
+# JSON 전체를 파싱하기 전에 categories 필드만 빠르게 확인
+_CATEGORIES_PATTERN = re.compile(r'"categories"\s*:\s*"([^"]*)"')
+
+_MONTHS = {
+    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04', 'May': '05', 'Jun': '06',
+    'Jul': '07', 'Aug': '08', 'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+}
+
+
+def open_maybe_gzip(path, mode='rt'):
+    """.gz 확장자면 gzip으로 열기"""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode, encoding='utf-8' if 't' in mode else None)
+    return open(path, mode, encoding='utf-8' if 't' in mode else None)
+
+
+def _rfc2822_to_date(value):
+    """'Mon, 2 Apr 2007 19:18:42 GMT' → '2007-04-02' (strptime보다 빠른 분해)"""
+    parts = value.split()
+    if len(parts) < 4 or parts[2] not in _MONTHS:
+        return ''
+    return f"{parts[3]}-{_MONTHS[parts[2]]}-{int(parts[1]):02d}"
+
+
+def _clean(value):
+    """줄바꿈/연속 공백 정리 (split/join이 정규식 치환보다 빠름)"""
+    if not value:
+        return ''
+    return ' '.join(value.split())
+
+
+class SnapshotIngestor:
+    """스냅샷 파일을 스트리밍으로 읽어 PaperStore에 청크 단위 저장"""
+
+    def __init__(self, store=None, chunk_size=None, category_mapping=None):
+        self.store = store or PaperStore()
+        self.chunk_size = chunk_size or Config.STORE_CONFIG['chunk_size']
+        self.category_mapping = category_mapping or Config.CATEGORY_MAPPING
+        self.collected_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self._next_id = self.store.count() + 1  # 기존 저장분 뒤에 이어서 id 부여
+        self._buffer = {column: [] for column in PAPER_COLUMNS}
+        self.stats = {'read': 0, 'matched': 0, 'written': 0, 'chunks': 0}
+
+    def _main_category(self, categories):
+        for category in categories:
+            if category in self.category_mapping:
+                return self.category_mapping[category]
+        return None
+
+    def _add_record(self, arxiv_id, title, authors, published_date, categories,
+                    abstract, comment, journal_ref, doi):
+        """필터를 통과한 레코드를 컬럼 버퍼에 추가하고 청크가 차면 저장"""
+        main_category = self._main_category(categories)
+        if main_category is None:
+            return
+
+        abstract_words = (abstract or '').split()
+        buffer = self._buffer
+        buffer['id'].append(self._next_id)
+        buffer['title'].append(_clean(title))
+        buffer['authors'].append(authors)
+        buffer['published_date'].append(published_date)
+        buffer['main_category'].append(main_category)
+        buffer['primary_category'].append(categories[0] if categories else '')
+        buffer['categories'].append(', '.join(categories))
+        buffer['abstract'].append(' '.join(abstract_words))
+        buffer['word_count'].append(len(abstract_words))
+        buffer['arxiv_id'].append(arxiv_id)
+        buffer['pdf_url'].append(f"http://arxiv.org/pdf/{arxiv_id}")
+        buffer['arxiv_url'].append(f"http://arxiv.org/abs/{arxiv_id}")
+        buffer['journal_ref'].append(journal_ref or '')
+        buffer['doi'].append(doi or '')
+        buffer['comment'].append(_clean(comment))
+        buffer['collected_at'].append(self.collected_at)
+
+        self._next_id += 1
+        self.stats['matched'] += 1
+        if len(buffer['id']) >= self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        """컬럼 버퍼를 데이터프레임으로 만들어 저장소에 한 청크로 기록"""
+        if not self._buffer['id']:
+            return
+        df = apply_schema(pd.DataFrame(self._buffer, columns=PAPER_COLUMNS))
+        self.store.append(df)
+        self.stats['written'] += len(df)
+        self.stats['chunks'] += 1
+        self._buffer = {column: [] for column in PAPER_COLUMNS}
+
+    def ingest_json_lines(self, path):
+        """JSON Lines 스냅샷 적재 (카테고리가 맞는 줄만 json 파싱)"""
+        wanted = set(self.category_mapping)
+        with open_maybe_gzip(path) as f:
+            for line in f:
+                self.stats['read'] += 1
+                match = _CATEGORIES_PATTERN.search(line)
+                if match is None or wanted.isdisjoint(match.group(1).split()):
+                    continue
+
+                record = json.loads(line)
+                versions = record.get('versions') or []
+                published_date = _rfc2822_to_date(versions[0]['created']) if versions else ''
+                if not published_date:
+                    published_date = record.get('update_date', '')
+
+                authors_parsed = record.get('authors_parsed')
+                if authors_parsed:
+                    authors = ', '.join(' '.join(p for p in (a[1], a[0]) if p) for a in authors_parsed)
+                else:
+                    authors = _clean(record.get('authors', '')).replace(' and ', ', ')
+
+                self._add_record(
+                    arxiv_id=record['id'],
+                    title=record.get('title', ''),
+                    authors=authors,
+                    published_date=published_date,
+                    categories=record.get('categories', '').split(),
+                    abstract=record.get('abstract', ''),
+                    comment=record.get('comments'),
+                    journal_ref=record.get('journal-ref'),
+                    doi=record.get('doi'),
+                )
+
+    def ingest_oai_xml(self, path):
+        """OAI-PMH XML 덤프 적재 (iterparse + clear로 일정한 메모리 유지)"""
+        with open_maybe_gzip(path, 'rb') as f:
+            parents = []
+            for event, elem in ET.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    parents.append(elem)
+                    continue
+                parents.pop()
+                if elem.tag.rsplit('}', 1)[-1] != 'record':
+                    continue
+                self.stats['read'] += 1
+
+                fields = {}
+                authors = []
+                for child in elem.iter():
+                    tag = child.tag.rsplit('}', 1)[-1]
+                    if tag == 'author':
+                        forenames = child.findtext('{*}forenames') or ''
+                        keyname = child.findtext('{*}keyname') or ''
+                        authors.append(f"{forenames} {keyname}".strip())
+                    elif tag not in fields and child.text:
+                        fields[tag] = child.text
+                # 처리한 레코드를 트리에서 떼어내 메모리 누적 방지
+                elem.clear()
+                if parents:
+                    parents[-1].remove(elem)
+
+                if 'id' not in fields:
+                    continue  # 삭제된 레코드 등
+                self._add_record(
+                    arxiv_id=fields['id'],
+                    title=fields.get('title', ''),
+                    authors=', '.join(authors),
+                    published_date=fields.get('created', ''),
+                    categories=fields.get('categories', '').split(),
+                    abstract=fields.get('abstract', ''),
+                    comment=fields.get('comments'),
+                    journal_ref=fields.get('journal-ref'),
+                    doi=fields.get('doi'),
+                )
+
+    def ingest(self, paths):
+        """파일 형식(.json/.jsonl/.xml, .gz 포함)에 따라 적재"""
+        print(f"📥 arXiv 스냅샷 적재 시작: {len(paths)}개 파일 → {self.store.store_dir}")
+        start_time = time.time()
+
+        for path in paths:
+            name = path[:-3] if path.endswith('.gz') else path
+            print(f"📄 {path} 읽는 중...")
+            if name.endswith('.xml'):
+                self.ingest_oai_xml(path)
+            else:
+                self.ingest_json_lines(path)
+        self._flush()
+
+        elapsed = time.time() - start_time
+        rate = self.stats['read'] / elapsed if elapsed > 0 else 0
+        print(f"✅ 적재 완료: {self.stats['read']}개 읽음 → {self.stats['written']}개 저장 "
+              f"({self.stats['chunks']}개 청크, {elapsed:.1f}초, {rate:,.0f} 레코드/초)")
+        return self.stats
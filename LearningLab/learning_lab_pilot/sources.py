@@ -0,0 +1,297 @@
+"""
+다중 출처 논문 수집: 출처 어댑터 + 출처 간 동일 논문 식별
+- 어댑터: arXiv, KCI(한국학술지인용색인 OpenAPI), Crossref
+- 모든 출처를 동시에 검색하고 PaperCollector와 같은 컬럼으로 정규화
+- DOI / 정규화한 제목 해시 인덱스로 같은 논문을 하나로 합쳐 한 번만 저장·요약·임베딩
+
+각 어댑터의 API 주소는 Config.SOURCES_CONFIG에서 바꿀 수 있어 로컬 테스트 서버로 대체할 수 있습니다.
+arXiv가 아닌 논문의 arxiv_id 컬럼에는 '<출처>:<출처 내 id>' 형식의 키를 넣습니다.
+"""
+
+import hashlib
+import re
+import time
+import unicodedata
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import arxiv
+from config import Config
+from paper_collector import RateLimiter, RateLimitedClient
+from transport import call_with_retry, get_http_session
+
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+_AFFILIATION_PATTERN = re.compile(r'\s*\([^)]*\)\s*$')
+
+
+def normalize_doi(doi):
+    """'https://doi.org/10.1000/ABC' → '10.1000/abc' (없으면 '')"""
+    if not doi:
+        return ''
+    doi = doi.strip().lower()
+    for prefix in ('https://doi.org/', 'http://doi.org/', 'https://dx.doi.org/', 'http://dx.doi.org/', 'doi:'):
+        if doi.startswith(prefix):
+            doi = doi[len(prefix):]
+    return doi
+
+
+def title_hash(title):
+    """대소문자/공백/문장부호를 무시한 제목 해시 (너무 짧은 제목은 '')"""
+    if not title:
+        return ''
+    normalized = ''.join(ch for ch in unicodedata.normalize('NFKC', title).casefold() if ch.isalnum())
+    if len(normalized) < 8:
+        return ''
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+def _clean(value):
+    if not value:
+        return ''
+    return ' '.join(_TAG_PATTERN.sub(' ', value).split())
+
+
+def make_record(source, source_id, title, authors='', published_date='', abstract='', doi='',
+                categories=(), primary_category='', pdf_url='', url='', journal_ref='',
+                comment='', alt_titles=()):
+    """출처별 응답을 공통 레코드로 변환 (PaperCollector 컬럼 + sources)"""
+    abstract = _clean(abstract)
+    return {
+        'title': _clean(title),
+        'authors': authors,
+        'published_date': published_date,
+        'primary_category': primary_category or (categories[0] if categories else ''),
+        'categories': ', '.join(categories),
+        'abstract': abstract,
+        'word_count': len(abstract.split()),
+        'arxiv_id': source_id if source == 'arxiv' else f"{source}:{source_id}",
+        'pdf_url': pdf_url,
+        'arxiv_url': url,
+        'journal_ref': journal_ref or '',
+        'doi': normalize_doi(doi),
+        'comment': comment or '',
+        'sources': source,
+        '_alt_titles': [_clean(t) for t in alt_titles if t],
+    }
+
+
+class PaperSource:
+    """출처 어댑터 기본 클래스: search(query, max_results) → 공통 레코드 목록"""
+
+    name = None
+
+    def search(self, query, max_results):
+        raise NotImplementedError
+
+
+class ArxivSource(PaperSource):
+    name = 'arxiv'
+
+    def __init__(self, rate_limiter=None, query_url_format=None):
+        self.rate_limiter = rate_limiter or RateLimiter(Config.ARXIV_SEARCH_CONFIG['min_request_interval'])
+        self.query_url_format = query_url_format or Config.SOURCES_CONFIG['arxiv_url']
+
+    def search(self, query, max_results):
+        client = RateLimitedClient(self.rate_limiter, page_size=min(max_results, 100),
+                                   query_url_format=self.query_url_format)
+        search = arxiv.Search(query=query, max_results=max_results,
+                              sort_by=arxiv.SortCriterion.Relevance,
+                              sort_order=arxiv.SortOrder.Descending)
+        return [
+            make_record(
+                'arxiv', paper.get_short_id(), paper.title,
+                authors=', '.join(author.name for author in paper.authors),
+                published_date=paper.published.strftime('%Y-%m-%d'),
+                abstract=paper.summary, doi=paper.doi, categories=paper.categories,
+                primary_category=paper.primary_category, pdf_url=paper.pdf_url,
+                url=paper.entry_id, journal_ref=paper.journal_ref, comment=paper.comment,
+            )
+            for paper in client.results(search)
+        ]
+
+
+class KCISource(PaperSource):
+    """KCI OpenAPI 논문 검색 (articleSearch, XML 응답, Config.KCI_API_KEY 필요)"""
+
+    name = 'kci'
+
+    def __init__(self, api_url=None, api_key=None):
+        self.api_url = api_url or Config.SOURCES_CONFIG['kci_url']
+        self.api_key = api_key or Config.KCI_API_KEY
+
+    def _get(self, params):
+        response = get_http_session().get(self.api_url, params=params,
+                                          timeout=Config.SOURCES_CONFIG['timeout'])
+        response.raise_for_status()
+        return response.content
+
+    def search(self, query, max_results):
+        content = call_with_retry(self._get, {
+            'apiCode': 'articleSearch', 'key': self.api_key, 'title': query,
+            'displayCount': max_results, 'page': 1,
+        }, description='KCI 검색')
+        root = ET.fromstring(content)
+
+        records = []
+        for record in root.iter('record'):
+            article = record.find('articleInfo')
+            if article is None:
+                continue
+            journal = record.find('journalInfo')
+            titles = [t.text for t in article.iter('article-title') if t.text]
+            abstracts = {a.get('lang'): a.text for a in article.iter('abstract') if a.text}
+            authors = [_AFFILIATION_PATTERN.sub('', a.text) for a in article.iter('author') if a.text]
+
+            published_date = ''
+            if journal is not None and journal.findtext('pub-year'):
+                month = (journal.findtext('pub-mon') or '01').zfill(2)
+                published_date = f"{journal.findtext('pub-year')}-{month}-01"
+
+            category = article.findtext('article-categories') or ''
+            records.append(make_record(
+                'kci', article.get('article-id') or article.findtext('url') or '',
+                titles[0] if titles else '',
+                authors=', '.join(authors), published_date=published_date,
+                abstract=abstracts.get('original') or next(iter(abstracts.values()), ''),
+                doi=article.findtext('doi'), categories=[category] if category else [],
+                url=article.findtext('url') or '',
+                journal_ref=journal.findtext('journal-name') if journal is not None else '',
+                alt_titles=titles[1:],
+            ))
+            if len(records) >= max_results:
+                break
+        return records
+
+
+class CrossrefSource(PaperSource):
+    """Crossref REST API 검색 (JSON 응답)"""
+
+    name = 'crossref'
+
+    def __init__(self, api_url=None, mailto=None):
+        self.api_url = api_url or Config.SOURCES_CONFIG['crossref_url']
+        self.mailto = mailto or Config.SOURCES_CONFIG['crossref_mailto']
+
+    def _get(self, params):
+        response = get_http_session().get(self.api_url, params=params,
+                                          timeout=Config.SOURCES_CONFIG['timeout'])
+        response.raise_for_status()
+        return response.json()
+
+    def search(self, query, max_results):
+        params = {'query.bibliographic': query, 'rows': max_results,
+                  'select': 'DOI,title,author,abstract,issued,URL,container-title,subject'}
+        if self.mailto:
+            params['mailto'] = self.mailto  # Crossref polite pool
+        payload = call_with_retry(self._get, params, description='Crossref 검색')
+
+        records = []
+        for item in payload.get('message', {}).get('items', []):
+            titles = item.get('title') or ['']
+            authors = [' '.join(p for p in (a.get('given'), a.get('family')) if p)
+                       for a in item.get('author', [])]
+            date_parts = (item.get('issued', {}).get('date-parts') or [[None]])[0]
+            published_date = ''
+            if date_parts and date_parts[0]:
+                parts = list(date_parts) + [1, 1]
+                published_date = f"{parts[0]:04d}-{parts[1]:02d}-{parts[2]:02d}"
+            records.append(make_record(
+                'crossref', item.get('DOI', ''), titles[0],
+                authors=', '.join(authors), published_date=published_date,
+                abstract=item.get('abstract', ''), doi=item.get('DOI'),
+                categories=item.get('subject', []), url=item.get('URL', ''),
+                journal_ref=(item.get('container-title') or [''])[0],
+                alt_titles=titles[1:],
+            ))
+        return records
+
+
+SOURCE_CLASSES = {source.name: source for source in (ArxivSource, KCISource, CrossrefSource)}
+
+
+class IdentityIndex:
+    """DOI / 제목 해시 → 레코드 번호 인덱스로 출처가 달라도 같은 논문을 하나로 합침"""
+
+    def __init__(self):
+        self.records = []
+        self._by_doi = {}
+        self._by_title = {}
+
+    def _keys(self, record):
+        titles = [record['title']] + record.get('_alt_titles', [])
+        return record['doi'], [h for h in (title_hash(t) for t in titles) if h]
+
+    def find(self, record):
+        doi, hashes = self._keys(record)
+        if doi and doi in self._by_doi:
+            return self._by_doi[doi]
+        for h in hashes:
+            if h in self._by_title:
+                return self._by_title[h]
+        return None
+
+    def _register(self, position, record):
+        doi, hashes = self._keys(record)
+        if doi:
+            self._by_doi.setdefault(doi, position)
+        for h in hashes:
+            self._by_title.setdefault(h, position)
+
+    def add(self, record):
+        """새 논문이면 추가하고 True, 이미 있으면 빈 필드만 채우고 False"""
+        position = self.find(record)
+        if position is None:
+            self.records.append(record)
+            self._register(len(self.records) - 1, record)
+            return True
+
+        existing = self.records[position]
+        for field, value in record.items():
+            if field.startswith('_') or field == 'sources':
+                continue
+            if value and not existing.get(field):
+                existing[field] = value
+        if record['sources'] not in existing['sources'].split(', '):
+            existing['sources'] += f", {record['sources']}"
+        existing['word_count'] = len(existing['abstract'].split())
+        existing['_alt_titles'] = existing.get('_alt_titles', []) + [record['title']]
+        # 나중 출처가 DOI를 채워 준 경우 등 새 키도 인덱스에 등록
+        self._register(position, existing)
+        return False
+
+
+def collect_from_sources(query, source_names=None, max_results_per_source=30, max_workers=None):
+    """여러 출처를 동시에 검색 → 설정 순서대로 병합 (반환: 레코드 목록, 출처별 실패)"""
+    source_names = source_names or Config.SOURCES_CONFIG['enabled']
+    max_workers = max_workers or Config.SOURCES_CONFIG['max_workers']
+    sources = [SOURCE_CLASSES[name]() for name in source_names]
+
+    print(f"🔍 {len(sources)}개 출처에서 '{query}' 동시 검색 중 (출처당 최대 {max_results_per_source}개)...")
+    start_time = time.time()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(source.search, query, max_results_per_source) for source in sources]
+
+    index = IdentityIndex()
+    failures = {}
+    # 완료 순서와 관계없이 설정 순서대로 병합해 어떤 출처 값이 우선인지 고정
+    for source, future in zip(sources, futures):
+        try:
+            records = future.result()
+        except Exception as e:
+            print(f"❌ {source.name} 검색 실패: {e}")
+            failures[source.name] = e
+            continue
+        new_count = sum(index.add(record) for record in records)
+        print(f"📄 {source.name}: {len(records)}개 (신규 {new_count}개)")
+
+    collected_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    papers = []
+    for i, record in enumerate(index.records, 1):
+        paper = {key: value for key, value in record.items() if not key.startswith('_')}
+        paper['id'] = i
+        paper['collected_at'] = collected_at
+        papers.append(paper)
+
+    print(f"✅ 총 {len(papers)}개 논문 수집 완료! (출처 간 중복 제거, {time.time() - start_time:.1f}초)")
+    return papers, failures
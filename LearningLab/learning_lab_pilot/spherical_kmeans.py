@@ -0,0 +1,126 @@
+"""
+구면(spherical) K-means: 정규화한 float32 임베딩을 코사인 유사도로 클러스터링
+- 배정: (임베딩 @ 중심.T) BLAS 행렬곱 후 argmax (유클리드 거리 계산 없음), chunk_size 행씩 처리
+- 중심 갱신: one-hot 희소행렬 @ 임베딩 합계를 다시 정규화 (단위 벡터 중심)
+- 초기화: 표본(seed_sample_size)에서 k-means++ (거리 = 1 - 코사인 유사도)
+- 재시작(n_init)은 스레드 풀에서 동시에 실행 (BLAS 스레드를 작업 수로 나눠 과다 구독 방지)
+- 조기 종료: 목적함수(코사인 유사도 합) 상대 개선이 tol 미만이거나 배정이 그대로면 중단
+
+중심이 단위 벡터이므로 기존 유클리드 최근접 배정(assign_to_clusters, query_service)과 같은 결과를 냅니다.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from config import Config
+from embedding_reduction import l2_normalize
+
+
+def cosine_cohesion(embeddings, labels):
+    """클러스터 품질: 논문과 소속 클러스터 평균 방향의 코사인 유사도 평균 (높을수록 응집)"""
+    valid = labels >= 0
+    vectors = l2_normalize(embeddings[valid])
+    labels = labels[valid]
+    centers = l2_normalize(_cluster_sums(vectors, labels, labels.max() + 1))
+    return float(np.einsum('ij,ij->i', vectors, centers[labels]).mean())
+
+
+def _cluster_sums(vectors, labels, n_clusters):
+    """클러스터별 벡터 합계 (one-hot 희소행렬 곱 한 번)"""
+    from scipy.sparse import csr_matrix
+    one_hot = csr_matrix((np.ones(len(labels), dtype=np.float32), (labels, np.arange(len(labels)))),
+                         shape=(n_clusters, len(labels)))
+    return np.asarray(one_hot @ vectors)
+
+
+class SphericalKMeans:
+    """코사인 유사도 기준 K-means (sklearn KMeans와 같은 labels_/cluster_centers_/fit_predict 인터페이스)"""
+
+    def __init__(self, n_clusters, n_init=None, max_iter=None, tol=None, seed_sample_size=None,
+                 n_jobs=None, chunk_size=None, random_state=42):
+        config = Config.CLUSTERING_CONFIG
+        self.n_clusters = n_clusters
+        self.n_init = n_init or config['spherical_n_init']
+        self.max_iter = max_iter or config['spherical_max_iter']
+        self.tol = config['spherical_tol'] if tol is None else tol
+        self.seed_sample_size = seed_sample_size or config['spherical_seed_sample_size']
+        self.n_jobs = n_jobs or config['spherical_workers'] or os.cpu_count() or 1
+        self.chunk_size = chunk_size or 65536
+        self.random_state = random_state
+        self.labels_ = None
+        self.cluster_centers_ = None
+        self.objective_ = None  # 코사인 유사도 합 (클수록 좋음)
+        self.n_iter_ = None
+
+    def _assign(self, vectors, centers):
+        """가장 가까운 중심 id와 유사도"""
+        labels = np.empty(len(vectors), dtype=np.int32)
+        similarity = np.empty(len(vectors), dtype=np.float32)
+        for start in range(0, len(vectors), self.chunk_size):
+            block = vectors[start:start + self.chunk_size] @ centers.T
+            labels[start:start + len(block)] = block.argmax(axis=1)
+            similarity[start:start + len(block)] = block[np.arange(len(block)), labels[start:start + len(block)]]
+        return labels, similarity
+
+    def _init_centers(self, vectors, rng):
+        """표본에서 k-means++ 초기화 (다음 중심은 1 - 최대 유사도에 비례한 확률로 선택)"""
+        sample_size = min(len(vectors), max(self.seed_sample_size, self.n_clusters))
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        centers = np.empty((self.n_clusters, vectors.shape[1]), dtype=np.float32)
+        centers[0] = sample[rng.integers(sample_size)]
+        closest = 1.0 - sample @ centers[0]
+        for index in range(1, self.n_clusters):
+            weights = np.clip(closest, 0, None).astype(np.float64)
+            total = weights.sum()
+            choice = rng.choice(sample_size, p=weights / total) if total > 0 else rng.integers(sample_size)
+            centers[index] = sample[choice]
+            np.minimum(closest, 1.0 - sample @ centers[index], out=closest)
+        return centers
+
+    def _single_run(self, vectors, seed):
+        rng = np.random.default_rng(seed)
+        centers = self._init_centers(vectors, rng)
+        labels, similarity = self._assign(vectors, centers)
+        objective = float(similarity.sum(dtype=np.float64))
+
+        for iteration in range(1, self.max_iter + 1):
+            sums = _cluster_sums(vectors, labels, self.n_clusters)
+            empty = np.flatnonzero(~np.any(sums, axis=1))
+            if len(empty):
+                # 빈 클러스터는 현재 중심과 가장 먼 논문으로 다시 시작
+                sums[empty] = vectors[np.argpartition(similarity, len(empty) - 1)[:len(empty)]]
+            centers = l2_normalize(sums)
+
+            new_labels, similarity = self._assign(vectors, centers)
+            new_objective = float(similarity.sum(dtype=np.float64))
+            converged = (np.array_equal(new_labels, labels)
+                         or new_objective - objective <= self.tol * abs(objective))
+            labels, objective = new_labels, new_objective
+            if converged:
+                break
+        return objective, labels, centers, iteration
+
+    def fit(self, embeddings):
+        vectors = l2_normalize(embeddings)
+        if len(vectors) < self.n_clusters:
+            raise ValueError(f"논문 수({len(vectors)})가 클러스터 수({self.n_clusters})보다 적습니다.")
+
+        seeds = np.random.SeedSequence(self.random_state).generate_state(self.n_init)
+        workers = max(1, min(self.n_jobs, self.n_init))
+        if workers == 1:
+            runs = [self._single_run(vectors, seed) for seed in seeds]
+        else:
+            # 행렬곱은 GIL을 놓으므로 스레드로 충분 (임베딩 복사 없음). BLAS 스레드는 작업 수만큼 나눠 씀
+            from threadpoolctl import threadpool_limits
+            with threadpool_limits(limits=max(1, (os.cpu_count() or 1) // workers), user_api='blas'):
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    runs = list(executor.map(lambda seed: self._single_run(vectors, seed), seeds))
+
+        self.objective_, self.labels_, self.cluster_centers_, self.n_iter_ = max(runs, key=lambda run: run[0])
+        return self
+
+    def fit_predict(self, embeddings):
+        return self.fit(embeddings).labels_
+
+    def predict(self, embeddings):
+        return self._assign(l2_normalize(embeddings), self.cluster_centers_)[0]
@@ -0,0 +1,112 @@
+"""
+요약 티어 라우팅: 짧거나 우선순위가 낮은 논문은 로컬 추출 요약, 나머지만 GPT 요약
+- 규칙 (Config.SUMMARY_ROUTING_CONFIG, 하나라도 맞으면 로컬):
+    word_count <= max_words / main_category가 local_categories에 포함 / rule 조건식(DataFrame.eval)이 참
+- 로컬 추출 요약: 문장 단위 TF-IDF 벡터로 초록 전체(제목 포함) 벡터와 가장 가까운 문장을 골라 원문 순서로 연결
+  모든 논문의 문장을 희소행렬 하나로 벡터화해 점수를 한 번에 계산 (API 호출 없음)
+- 키워드: 논문 TF-IDF 가중치 상위 단어 (insight_mode='paper'일 때 key_insights)
+
+문장 임베딩은 API 호출이 필요하므로 로컬 경로에서는 TF-IDF 벡터를 문장 임베딩 대신 사용합니다.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from config import Config
+
+TIER_LOCAL = 'local'
+TIER_LLM = 'llm'
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9(\[])')
+
+
+def route_papers(papers_df, config=None):
+    """로컬 추출 요약으로 보낼 논문 마스크 (True = 로컬)"""
+    config = config or Config.SUMMARY_ROUTING_CONFIG
+    local = np.zeros(len(papers_df), dtype=bool)
+    if not config['enabled'] or len(papers_df) == 0:
+        return local
+
+    if config['max_words']:
+        if 'word_count' in papers_df.columns:
+            word_count = papers_df['word_count']
+        else:
+            word_count = papers_df['abstract'].fillna('').astype(str).str.split().str.len()
+        local |= (word_count <= config['max_words']).to_numpy()
+    if config['local_categories'] and 'main_category' in papers_df.columns:
+        local |= papers_df['main_category'].isin(config['local_categories']).to_numpy()
+    if config['rule']:
+        local |= papers_df.eval(config['rule']).fillna(False).to_numpy(dtype=bool)
+    return local
+
+
+class ExtractiveSummarizer:
+    """문장 TF-IDF와 문서 중심 벡터의 코사인 유사도로 핵심 문장을 고르는 추출 요약기"""
+
+    def __init__(self, max_sentences=None, n_keywords=None):
+        config = Config.SUMMARY_ROUTING_CONFIG
+        self.max_sentences = max_sentences or config['max_sentences']
+        self.n_keywords = n_keywords or config['n_keywords']
+
+    def summarize(self, titles, abstracts):
+        """반환: (요약 목록, 키워드 목록) — 입력 순서 그대로"""
+        from scipy.sparse import csr_matrix
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.preprocessing import normalize
+
+        sentences, owners = [], []
+        for document, abstract in enumerate(abstracts):
+            parts = [part.strip() for part in _SENTENCE_SPLIT.split(str(abstract or '')) if part.strip()]
+            sentences.extend(parts)
+            owners.extend([document] * len(parts))
+        if not sentences:
+            return [None] * len(abstracts), [None] * len(abstracts)
+        owners = np.asarray(owners)
+
+        vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True)
+        try:
+            sentence_vectors = vectorizer.fit_transform(sentences + [str(title or '') for title in titles])
+        except ValueError:
+            # 불용어만 있는 등 어휘가 비면 앞 문장을 그대로 사용
+            return self._leading_sentences(sentences, owners, len(abstracts)), [None] * len(abstracts)
+        title_vectors = sentence_vectors[len(sentences):]
+        sentence_vectors = sentence_vectors[:len(sentences)]
+
+        # 문서 벡터 = 문장 벡터 합 + 제목 벡터 (one-hot 희소행렬 곱 한 번)
+        one_hot = csr_matrix((np.ones(len(owners)), (owners, np.arange(len(owners)))),
+                             shape=(len(abstracts), len(owners)))
+        documents = normalize(one_hot @ sentence_vectors + title_vectors)
+        scores = np.asarray(sentence_vectors.multiply(documents[owners]).sum(axis=1)).ravel()
+
+        ranked = pd.DataFrame({'document': owners, 'position': np.arange(len(owners)), 'score': scores})
+        ranked['rank'] = ranked.groupby('document')['score'].rank(method='first', ascending=False)
+        chosen = ranked[ranked['rank'] <= self.max_sentences].sort_values(['document', 'position'])
+        joined = pd.Series(np.asarray(sentences, dtype=object)[chosen['position']]).groupby(
+            chosen['document'].to_numpy()).agg(' '.join)
+        summaries = [joined.get(document) for document in range(len(abstracts))]
+
+        vocabulary = vectorizer.get_feature_names_out()
+        documents = documents.tocsr()
+        keywords = []
+        for start, end in zip(documents.indptr[:-1], documents.indptr[1:]):
+            top = documents.indices[start:end][np.argsort(documents.data[start:end])[::-1][:self.n_keywords]]
+            keywords.append(', '.join(vocabulary[top]) if len(top) else None)
+        return summaries, keywords
+
+    def _leading_sentences(self, sentences, owners, n_documents):
+        leading = {}
+        for sentence, document in zip(sentences, owners):
+            leading.setdefault(document, []).append(sentence)
+        return [' '.join(leading[d][:self.max_sentences]) if d in leading else None for d in range(n_documents)]
+
+
+def report_tiers(tiers, seconds):
+    """티어별 논문 수와 소요 시간 출력 (tiers: 논문별 티어 배열, seconds: 티어 → 총 소요 시간)"""
+    counts = pd.Series(tiers).value_counts()
+    parts = []
+    for tier, label in ((TIER_LOCAL, '로컬 추출'), (TIER_LLM, 'GPT')):
+        count = int(counts.get(tier, 0))
+        elapsed = seconds.get(tier, 0.0)
+        per_paper = f", 편당 {elapsed / count * 1000:.1f}ms" if count else ''
+        parts.append(f"{label} {count}개 ({elapsed:.1f}초{per_paper})")
+    print(f"📊 요약 티어: {' / '.join(parts)}")
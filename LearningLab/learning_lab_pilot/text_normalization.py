@@ -0,0 +1,120 @@
+"""
+초록 정규화: GPT/임베딩 요청 전에 과금 토큰만 늘리는 표기를 제거
+- URL, 흔한 arXiv 상용구(IEEE 제출 안내, 코드 공개 문장, 저작권 표시)
+- LaTeX 마크업: 수식 구분자($, \\( \\)), 서식 명령(\\textbf{x} → x), 명령어 역슬래시(\\alpha → alpha), 중괄호
+- HTML/JATS 태그, 연속 공백
+
+규칙마다 정규식을 초록 컬럼 전체에 한 번씩 적용합니다 (pandas .str.replace, 행 단위 파이썬 루프 없음).
+원본 abstract는 그대로 두고 결과는 clean_abstract 컬럼으로 사용합니다.
+"""
+
+import pandas as pd
+from schema import text_dtype
+
+# 공백 문자 클래스: RE2의 \s는 ASCII 공백만, 파이썬 re의 \s는 유니코드 공백(NBSP 등)까지 포함하므로
+# 두 엔진에서 같은 결과가 나오도록 유니코드 공백을 명시적으로 나열해 \s 대신 사용
+_OTHER_SPACE_CHARS = '\\t\\n\\r\\f\x0b\x1c-\x1f\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000'
+_SPACE_CHARS = ' ' + _OTHER_SPACE_CHARS
+_SPACE = f'[{_SPACE_CHARS}]'
+_NON_SPACE = f'[^{_SPACE_CHARS}]'
+# URL은 먼저 이 표시 단어로 바꿔 두고, 코드 공개 문장 규칙이 '링크가 있는 문장'인지 확인한 뒤 지움
+_URL_MARK = 'zzurlzz'
+
+# (정규식, 치환) - 순서대로 적용. Arrow 문자열(RE2)과 파이썬 re 모두에서 같은 결과가 나오는 문법만 사용
+# (대소문자 무시는 플래그 대신 (?i), 전후방 탐색 없음, 공백은 _SPACE, 단어 문자는 ASCII 클래스)
+_RULES = [
+    # URL을 먼저 바꿔야 아래 상용구 규칙의 '[^.]*'가 도메인의 '.'에서 끊기지 않음
+    # (문장 끝 마침표/괄호는 URL에 포함하지 않아 다음 문장까지 지워지지 않음)
+    (rf'(?i)(?:https?://|www\.|(?:github|gitlab|bitbucket)\.(?:com|org)/){_NON_SPACE}*[^{_SPACE_CHARS}.,;:)\]]',
+     f' {_URL_MARK} '),
+    (rf'</?[a-zA-Z][a-zA-Z0-9_:-]*(?:{_SPACE}[^<>]*)?/?>', ' '),
+    (rf'(?i)This work has been submitted to the IEEE for possible publication\.'
+     rf'(?:{_SPACE}*Copyright may be transferred without notice[^.]*\.)?', ' '),
+    # 코드 공개 문장: 공백 뒤의 독립된 'code'(pseudo-code 등 제외)로 시작하고 링크나 저장소를 가리키는 경우만
+    # (캡처 그룹을 쓰면 RE2가 느린 경로로 처리하므로 앞 공백까지 지우고 공백 하나로 치환)
+    (rf'(?i)(?:^|{_SPACE})(?:(?:Our|The|All){_SPACE}+)?(?:source{_SPACE}+)?code'
+     rf'(?:{_SPACE}+and{_SPACE}+(?:data(?:sets?)?|models?|weights))?'
+     rf'{_SPACE}+(?:is|are|will{_SPACE}+be){_SPACE}+(?:publicly{_SPACE}+|freely{_SPACE}+|made{_SPACE}+)?'
+     rf'(?:available|released)\b[^.]*(?:{_URL_MARK}|github|gitlab|bitbucket|zenodo|hugging{_SPACE}*face|'
+     rf'repository|project{_SPACE}+page)[^.]*(?:\.|$)', ' '),
+    (_URL_MARK, ' '),
+    (rf'(?i)(?:©|\(c\)|copyright){_SPACE}*\d{{4}}\b[^.]*(?:\.|$)(?:{_SPACE}*All rights reserved\.)?', ' '),
+    # LaTeX: 이스케이프 문자 → 인용/참조 → 서식 명령 → 악센트 → 나머지 명령 → 수식 구분자/중괄호
+    (r'\\([%&_#{}])', r'\1'),
+    (rf'\\(?:cite[pt]?|ref|eqref|label|footnote|url){_SPACE}*\{{[^{{}}]*\}}', ' '),
+    (r'\\(?:text(?:bf|it|rm|tt|sf|sc)?|emph|math(?:rm|bf|cal|bb|it|sf|tt|frak)|operatorname|mbox|'
+     rf'boldsymbol){_SPACE}*\{{([^{{}}]*)\}}', r'\1'),
+    (r'\\[\'"`^~=.]\{?([a-zA-Z])\}?', r'\1'),
+    (r'\\[,;:! ]', ' '),
+    (r'\\([a-zA-Z]+)', r' \1 '),
+    (r'\$+|\\[()\[\]]|[{}]', ''),
+    # 공백 정리: 모든 공백을 매칭하지 않도록 ' ' 외의 공백 문자만 바꾼 뒤 연속 공백만 합침
+    (f'[{_OTHER_SPACE_CHARS}]', ' '),
+    (r' {2,}', ' '),
+    (r' ([.,;:)])', r'\1'),
+]
+
+# (입력, 기대 결과) - 규칙을 바꾸면 self_check()로 두 문자열 엔진에서 모두 확인
+FIXTURES = [
+    ('The pseudo-code is available in the appendix. We show results.',
+     'The pseudo-code is available in the appendix. We show results.'),
+    ('Our code is available at https://github.com/a/b. We show results.', 'We show results.'),
+    ('We show results. Code and models are publicly available on GitHub.', 'We show results.'),
+    ('Code is available at https://x.org/y/. Results hold.', 'Results hold.'),
+    ('Our code will be released upon publication.', 'Our code will be released upon publication.'),
+    ('The source code is available in the supplementary material.',
+     'The source code is available in the supplementary material.'),
+    ('See www.example.org/x. The encode is released quickly.', 'See. The encode is released quickly.'),
+    ('We use \\textbf{deep} $\\alpha$-nets.\u00a0Results\u2009hold.', 'We use deep alpha -nets. Results hold.'),
+]
+
+
+def _apply_rules(cleaned):
+    for pattern, replacement in _RULES:
+        cleaned = cleaned.str.replace(pattern, replacement, regex=True)
+    return cleaned.str.strip()
+
+
+def normalize_abstracts(abstracts):
+    """초록 시리즈 정규화 (결측값은 그대로)
+
+    Arrow 문자열(pyarrow 설치 시)과 object 문자열 어느 쪽이든 같은 결과가 나옵니다.
+    """
+    # Arrow 문자열이면 str.replace가 pyarrow(RE2)로 컬럼 전체를 한 번에 처리 (object 대비 약 5배)
+    return _apply_rules(pd.Series(abstracts, copy=False).astype(text_dtype()))
+
+
+def self_check():
+    """FIXTURES를 object/Arrow 문자열 모두로 정규화해 기대 결과와 비교 (실패 목록 반환)"""
+    inputs = pd.Series([text for text, _ in FIXTURES])
+    failures = []
+    for dtype in ('object', 'string[pyarrow]'):
+        try:
+            series = inputs.astype(dtype)
+        except ImportError:
+            continue  # pyarrow 없음
+        for (text, expected), actual in zip(FIXTURES, _apply_rules(series)):
+            if actual != expected:
+                failures.append((dtype, text, expected, actual))
+    return failures
+
+
+def report_token_reduction(before, after, model=None):
+    """정규화 전후 토큰 수 비교 출력 (반환: 전, 후 토큰 수)"""
+    from config import Config
+    from cost_planner import TokenCounter
+
+    counter = TokenCounter(model or Config.GPT_CONFIG['model'])
+    before_tokens = int(counter.count(pd.Series(before).fillna('').astype(str)).sum())
+    after_tokens = int(counter.count(pd.Series(after).fillna('').astype(str)).sum())
+    reduction = 1 - after_tokens / before_tokens if before_tokens else 0.0
+    note = '' if counter.exact else ', 근사치'
+    print(f"🧹 초록 정규화: 토큰 {before_tokens:,} → {after_tokens:,} ({reduction:.1%} 감소{note})")
+    return before_tokens, after_tokens
+
+
+if __name__ == '__main__':
+    failed = self_check()
+    for dtype, text, expected, actual in failed:
+        print(f"❌ [{dtype}] {text!r}\n   기대: {expected!r}\n   결과: {actual!r}")
+    print(f"✅ 정규화 규칙 확인: 예시 {len(FIXTURES)}개 통과" if not failed else f"❌ 실패 {len(failed)}건")
@@ -0,0 +1,198 @@
+"""
+공용 전송 계층: 수집기(arXiv, PDF)와 분석기(OpenAI)가 함께 사용
+- 커넥션 풀/keep-alive를 재사용하는 공유 HTTP 세션
+- 지수 백오프 + 지터 재시도 (Retry-After / rate-limit 헤더 우선)
+- 재시도 후에도 실패한 항목을 모아 두는 재시도 큐
+"""
+
+import email.utils
+import json
+import random
+import re
+import threading
+import time
+from config import Config
+
+# 재시도할 HTTP 상태 코드
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class RetryQueue:
+    """재시도 후에도 실패한 항목 목록 (단계별로 다시 처리하거나 파일로 저장)"""
+
+    def __init__(self):
+        self.items = []
+        self._lock = threading.Lock()
+
+    def add(self, stage, key, error, payload=None):
+        with self._lock:
+            self.items.append({
+                'stage': stage,
+                'key': key,
+                'error': f"{type(error).__name__}: {error}" if isinstance(error, Exception) else str(error),
+                'payload': payload,
+                'failed_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            })
+
+    def by_stage(self, stage):
+        return [item for item in self.items if item['stage'] == stage]
+
+    def remove(self, stage, keys):
+        keys = set(keys)
+        with self._lock:
+            self.items = [item for item in self.items
+                          if not (item['stage'] == stage and item['key'] in keys)]
+
+    def save(self, filename=None):
+        """실패 목록을 JSON 파일로 저장"""
+        filename = filename or Config.TRANSPORT_CONFIG['retry_queue_file']
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.items, f, ensure_ascii=False, indent=2, default=str)
+        return filename
+
+    def report(self):
+        if not self.items:
+            return
+        counts = {}
+        for item in self.items:
+            counts[item['stage']] = counts.get(item['stage'], 0) + 1
+        summary = ', '.join(f"{stage} {count}건" for stage, count in counts.items())
+        print(f"📮 재시도 큐: {summary}")
+
+    def __len__(self):
+        return len(self.items)
+
+
+def get_http_session():
+    """프로세스 전체가 공유하는 keep-alive HTTP 세션"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            class TimeoutHTTPAdapter(HTTPAdapter):
+                """timeout을 주지 않은 요청에도 기본 타임아웃 적용"""
+
+                def send(self, request, **kwargs):
+                    if kwargs.get('timeout') is None:
+                        kwargs['timeout'] = Config.GPT_CONFIG['timeout']
+                    return super().send(request, **kwargs)
+
+            pool_size = Config.TRANSPORT_CONFIG['pool_maxsize']
+            adapter = TimeoutHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def create_openai_client():
+    """타임아웃을 적용하고 자체 재시도는 끈 OpenAI 클라이언트 (재시도는 call_with_retry가 담당)"""
+    from openai import OpenAI
+    return OpenAI(
+        api_key=Config.OPENAI_API_KEY,
+        timeout=Config.GPT_CONFIG['timeout'],
+        max_retries=0
+    )
+
+
+def _status_code(error):
+    """예외에서 HTTP 상태 코드 추출 (openai / requests / arxiv)"""
+    for attr in ('status_code', 'status'):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+def _parse_duration(value):
+    """'1s', '6m0s', '20ms' 형식의 rate-limit 리셋 시간을 초로 변환"""
+    total = 0.0
+    for amount, unit in re.findall(r'([\d.]+)(ms|h|m|s)', value):
+        total += float(amount) * {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}[unit]
+    return total
+
+
+def retry_after_seconds(error):
+    """Retry-After / rate-limit 헤더가 알려주는 대기 시간 (없으면 None)"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+
+    if headers.get('retry-after-ms'):
+        try:
+            return float(headers['retry-after-ms']) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get('retry-after')
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            parsed = email.utils.parsedate_to_datetime(retry_after)
+            if parsed is not None:
+                return max(parsed.timestamp() - time.time(), 0)
+
+    resets = [_parse_duration(headers[name]) for name in
+              ('x-ratelimit-reset-requests', 'x-ratelimit-reset-tokens') if headers.get(name)]
+    return max(resets) if resets else None
+
+
+def _transient_exception_types():
+    """상태 코드 없이 발생하는 일시적 네트워크 예외 타입"""
+    exception_types = [ConnectionError, TimeoutError]
+    try:
+        import requests
+        exception_types += [requests.ConnectionError, requests.Timeout]
+    except ImportError:
+        pass
+    try:
+        import openai
+        exception_types += [openai.APIConnectionError]
+    except ImportError:
+        pass
+    try:
+        import arxiv
+        exception_types += [arxiv.UnexpectedEmptyPageError]
+    except ImportError:
+        pass
+    return tuple(exception_types)
+
+
+def is_retryable(error):
+    """재시도해서 성공할 수 있는 오류인지 판단"""
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return isinstance(error, _transient_exception_types())
+
+
+def call_with_retry(func, *args, description='요청', **kwargs):
+    """func를 호출하고 일시적 오류면 지수 백오프 + 지터로 재시도"""
+    config = Config.TRANSPORT_CONFIG
+    max_retries = config['max_retries']
+
+    for attempt in range(max_retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+
+            # full jitter 백오프, 서버가 대기 시간을 알려주면 그보다 짧게 기다리지 않음
+            backoff = min(config['backoff_max'], config['backoff_base'] * (2 ** attempt))
+            delay = random.uniform(0, backoff)
+            server_delay = retry_after_seconds(e)
+            if server_delay is not None:
+                delay = max(delay, server_delay)
+
+            print(f"🔁 {description} 재시도 {attempt + 1}/{max_retries} ({delay:.1f}초 후): {e}")
+            time.sleep(delay)
@@ -0,0 +1,180 @@
+"""
+논문 저장소 추세 집계 (materialized rollup)
+리포트마다 전체 논문을 다시 읽지 않도록 part 파일별 월간 집계를 저장소 옆에 보관합니다.
+
+- 저장 위치: <store_dir>/<TREND_CONFIG['rollup_dir']>/part-00000.parquet ... (part 파일과 같은 이름)
+- 내용: (kind, key, month, papers) 긴 형식 테이블
+    kind = 'main_category' | 'cluster' | 'keyword'  (키워드는 key_insights, 없으면 cluster_keywords)
+- 증분 갱신: PaperStore.append가 새 part를 쓸 때 그 청크만 집계 (TREND_CONFIG['update_on_append']),
+  update()는 집계가 없는 part만 골라 채움. part 파일은 추가만 되므로 part별 집계는 다시 계산할 일이 없음
+- 리포트: 작은 집계 파일만 합쳐서 월별 표, 이동 성장률, 최근 처음 등장한 키워드 계산
+
+사용 예:
+    python cli.py trends --store paper_store --output trend_report.xlsx
+"""
+
+import os
+import pandas as pd
+from config import Config
+
+DIMENSIONS = ['main_category', 'cluster']
+KEYWORD_COLUMNS = ['key_insights', 'cluster_keywords']  # 앞의 컬럼이 있으면 그 컬럼 사용
+
+
+def rollup_chunk(df):
+    """청크 하나의 월별 논문 수 집계 (published_date가 없는 논문은 제외)"""
+    frames = []
+    if 'published_date' not in df.columns:
+        return pd.DataFrame(columns=['kind', 'key', 'month', 'papers'])
+
+    month = pd.to_datetime(df['published_date'], errors='coerce').dt.to_period('M').dt.to_timestamp()
+    for dimension in DIMENSIONS:
+        if dimension in df.columns:
+            counts = (pd.DataFrame({'key': df[dimension].astype(str).to_numpy(), 'month': month})
+                      [df[dimension].notna().to_numpy()]
+                      .groupby(['key', 'month']).size())
+            frames.append(counts.rename('papers').reset_index().assign(kind=dimension))
+
+    keyword_column = next((column for column in KEYWORD_COLUMNS if column in df.columns), None)
+    if keyword_column is not None:
+        # 논문 하나에 같은 키워드가 두 번 나와도 한 번만 집계
+        keywords = (pd.DataFrame({'key': df[keyword_column].astype(str).str.lower().str.split(','),
+                                  'month': month})[df[keyword_column].notna().to_numpy()]
+                    .explode('key'))
+        keywords['key'] = keywords['key'].str.strip()
+        keywords = (keywords[keywords['key'] != ''].rename_axis('row').reset_index()
+                    .drop_duplicates(['row', 'key']))
+        counts = keywords.groupby(['key', 'month']).size()
+        frames.append(counts.rename('papers').reset_index().assign(kind='keyword'))
+
+    if not frames:
+        return pd.DataFrame(columns=['kind', 'key', 'month', 'papers'])
+    rollup = pd.concat(frames, ignore_index=True)[['kind', 'key', 'month', 'papers']]
+    return rollup.astype({'kind': 'category', 'papers': 'int64'})
+
+
+class TrendRollups:
+    """PaperStore의 part별 월간 집계 관리 + 추세 리포트"""
+
+    def __init__(self, store, config=None):
+        self.store = store
+        self.config = config or Config.TREND_CONFIG
+        self.rollup_dir = os.path.join(store.store_dir, self.config['rollup_dir'])
+
+    def _rollup_path(self, part_path):
+        return os.path.join(self.rollup_dir, os.path.basename(part_path))
+
+    def add(self, part_path, df):
+        """방금 추가된 part의 데이터프레임으로 집계 저장 (파일을 다시 읽지 않음)"""
+        os.makedirs(self.rollup_dir, exist_ok=True)
+        rollup_path = self._rollup_path(part_path)
+        # 임시 파일에 쓴 뒤 교체해 중단되더라도 반쯤 쓴 집계가 남지 않음
+        tmp_path = rollup_path + '.tmp'
+        rollup_chunk(df).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, rollup_path)
+        return rollup_path
+
+    def update(self, rebuild=False):
+        """집계가 없는 part만 읽어 집계 (rebuild=True면 전체 다시 계산). 반환: 새로 집계한 part 수"""
+        import pyarrow.parquet as pq
+
+        updated = 0
+        for part_path in self.store.part_files():
+            if not rebuild and os.path.exists(self._rollup_path(part_path)):
+                continue
+            available = set(pq.ParquetFile(part_path).schema_arrow.names)
+            columns = [column for column in ['published_date'] + DIMENSIONS + KEYWORD_COLUMNS
+                       if column in available]
+            self.add(part_path, pd.read_parquet(part_path, columns=columns))
+            updated += 1
+        if updated:
+            print(f"📈 추세 집계 갱신: part {updated}개")
+        return updated
+
+    def load(self):
+        """part별 집계를 합친 (kind, key, month) → papers 테이블"""
+        paths = [self._rollup_path(part_path) for part_path in self.store.part_files()]
+        frames = [pd.read_parquet(path) for path in paths if os.path.exists(path)]
+        if not frames:
+            return pd.DataFrame(columns=['kind', 'key', 'month', 'papers'])
+        rollups = pd.concat(frames, ignore_index=True)
+        rollups['kind'] = rollups['kind'].astype(str)
+        return rollups.groupby(['kind', 'key', 'month'], as_index=False)['papers'].sum()
+
+    @staticmethod
+    def monthly(rollups, kind):
+        """월 × key 논문 수 표 (빈 달은 0으로 채움)"""
+        table = (rollups[rollups['kind'] == kind]
+                 .pivot_table(index='month', columns='key', values='papers', aggfunc='sum', fill_value=0))
+        if table.empty:
+            return table
+        months = pd.date_range(table.index.min(), table.index.max(), freq='MS')
+        return table.reindex(months, fill_value=0).rename_axis('month')
+
+    @staticmethod
+    def growth(monthly_table, window):
+        """최근 window개월 합계 vs 그 이전 window개월 합계의 증가율 (이전 기간 0건이면 NaN)"""
+        rolling = monthly_table.rolling(window, min_periods=1).sum()
+        previous = rolling.shift(window)
+        return (rolling - previous) / previous.where(previous > 0)
+
+    @staticmethod
+    def new_keywords(rollups, months, top_n):
+        """최근 months개월 안에 처음 등장한 키워드 중 논문 수 상위 top_n"""
+        keywords = rollups[rollups['kind'] == 'keyword']
+        if keywords.empty:
+            return pd.DataFrame(columns=['keyword', 'first_month', 'papers'])
+        latest = keywords['month'].max()
+        since = latest - pd.DateOffset(months=months - 1)
+        summary = keywords.groupby('key').agg(first_month=('month', 'min'), papers=('papers', 'sum'))
+        fresh = summary[summary['first_month'] >= since].sort_values('papers', ascending=False).head(top_n)
+        return fresh.rename_axis('keyword').reset_index()
+
+    def report(self, output=None, window=None, new_keyword_months=None, top_n=None):
+        """추세 리포트 출력 (+ output 지정 시 엑셀 저장)"""
+        window = window or self.config['growth_window_months']
+        new_keyword_months = new_keyword_months or self.config['new_keyword_months']
+        top_n = top_n or self.config['top_keywords']
+
+        rollups = self.load()
+        if rollups.empty:
+            print("❌ 추세 집계가 없습니다. 먼저 update()로 집계하세요.")
+            return None
+
+        sheets = {}
+        print("\n" + "=" * 60)
+        print(f"📈 논문 추세 리포트 ({self.store.store_dir})")
+        print("=" * 60)
+        for kind, label in [('main_category', '카테고리'), ('cluster', '클러스터')]:
+            table = self.monthly(rollups, kind)
+            if table.empty:
+                continue
+            growth = self.growth(table, window)
+            latest = pd.DataFrame({'최근논문수': table.tail(window).sum(), '성장률': growth.iloc[-1]})
+            latest = latest.sort_values('최근논문수', ascending=False)
+            sheets[f'월별_{label}'] = table
+            sheets[f'성장률_{label}'] = growth
+            print(f"\n🏷️ {label}별 최근 {window}개월 ({table.index[-min(window, len(table))]:%Y-%m}"
+                  f" ~ {table.index[-1]:%Y-%m}):")
+            for key, row in latest.head(top_n).iterrows():
+                if pd.notna(row['성장률']):
+                    rate = f"{row['성장률']:+.1%}"
+                else:
+                    # 성장률 NaN = 이전 기간 0건: 최근에 생겼으면 신규, 최근에도 0건이면 표시할 추세 없음
+                    rate = '신규' if row['최근논문수'] > 0 else '-'
+                print(f"  • {key}: {int(row['최근논문수'])}개 ({rate})")
+
+        fresh = self.new_keywords(rollups, new_keyword_months, top_n)
+        sheets['신규키워드'] = fresh
+        if len(fresh):
+            print(f"\n🆕 최근 {new_keyword_months}개월 처음 등장한 키워드:")
+            for _, row in fresh.iterrows():
+                print(f"  • {row['keyword']}: {row['papers']}개 (첫 등장 {row['first_month']:%Y-%m})")
+        print("\n" + "=" * 60)
+
+        if output:
+            with pd.ExcelWriter(output, engine='openpyxl') as writer:
+                for sheet_name, sheet in sheets.items():
+                    sheet.to_excel(writer, sheet_name=sheet_name, index=sheet_name != '신규키워드')
+            print(f"💾 추세 리포트 저장: {output}")
+        return sheets
@@ -0,0 +1,122 @@
+"""
+새 논문 모니터링 (watch 모드)
+주기적으로 arXiv를 제출일 최신순으로 확인해 지난번 이후 새로 나온 논문만
+카테고리 분류 → GPT 요약 → 임베딩 → 기존 클러스터 배정 후 저장소(PaperStore)에 추가합니다.
+
+한 번의 확인에서 하는 작업은 전체 논문 수가 아니라 새 논문 수에 비례합니다.
+- 수집: 기준 시각보다 오래된 논문이 나오면 다음 페이지를 요청하지 않음
+- 클러스터: 다시 학습하지 않고 최신 분석 스냅샷(save_snapshot)의 중심에 배정
+- 저장: 확인할 때마다 새 part 파일 하나만 추가
+
+로컬 테스트: WATCH_CONFIG['feed_url'] 또는 --feed-url에 arXiv API와 같은 Atom 형식을 주는 주소를 지정
+    python -m http.server 8000   # feed.xml이 있는 디렉토리에서
+    python cli.py watch --once --feed-url "http://127.0.0.1:8000/feed.xml?{}"
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+import numpy as np
+from config import Config
+from paper_collector import PaperCollector, base_arxiv_id
+from paper_store import PaperStore
+from query_service import read_current_version
+
+
+class PaperWatcher:
+    """새 논문만 골라 분석 단계를 거쳐 저장소에 누적"""
+
+    def __init__(self, query=None, feed_url=None, store=None, snapshot_dir=None, state_file=None):
+        self.config = Config.WATCH_CONFIG
+        self.query = query or self.config['query'] or ' OR '.join(
+            f"cat:{category}" for category in Config.CATEGORY_MAPPING)
+        self.feed_url = feed_url or self.config['feed_url']
+        self.store = store or PaperStore(self.config['store_dir'])
+        self.snapshot_dir = snapshot_dir or Config.SERVICE_CONFIG['snapshot_dir']
+        self.state_file = state_file or self.config['state_file']
+        self.state = self._load_state()
+
+    def _load_state(self):
+        """마지막으로 본 제출 시각과 최근 arxiv_id 목록"""
+        if os.path.exists(self.state_file):
+            with open(self.state_file, encoding='utf-8') as f:
+                return json.load(f)
+        return {'last_published': None, 'seen_ids': [], 'polls': 0}
+
+    def _save_state(self):
+        tmp_path = self.state_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def _load_centers(self):
+        """최신 분석 스냅샷의 클러스터 중심 (스냅샷이 없으면 None)"""
+        version = read_current_version(self.snapshot_dir)
+        if version is None:
+            return None
+        return np.load(os.path.join(self.snapshot_dir, version, 'centers.npy'))
+
+    def poll_once(self):
+        """한 번 확인: 새 논문을 분석해 저장소에 추가하고 처리한 논문 수 반환"""
+        from paper_analyzer import PaperAnalyzer
+
+        start_time = time.time()
+        since = self.state['last_published']
+        since = datetime.fromisoformat(since) if since else None
+
+        collector = PaperCollector()
+        papers = collector.fetch_new_papers(self.query, since, self.state['seen_ids'],
+                                            max_results=self.config['max_results_per_poll'],
+                                            feed_url=self.feed_url)
+        self.state['polls'] += 1
+        if not len(papers):
+            self._save_state()
+            return 0
+
+        df = collector.classify_papers_by_category()
+        df['id'] = df['id'] + self.store.count()  # 저장소에 이어서 id 부여
+
+        analyzer = PaperAnalyzer()
+        analyzer.retry_queue = collector.retry_queue
+        analyzer.papers_df = df
+        analyzer.summarize_abstracts_with_gpt()
+        analyzer.create_embeddings()
+
+        centers = self._load_centers()
+        if centers is not None:
+            analyzer.assign_to_clusters(centers)
+        else:
+            print("⚠️ 분석 스냅샷이 없어 클러스터 배정을 건너뜁니다 (먼저 분석을 실행하세요)")
+
+        path = self.store.append(analyzer.papers_df, embeddings=analyzer.embeddings)
+
+        # 다음 확인의 기준 갱신 (페이지 요청이 실패했으면 빠진 구간을 다시 보도록 유지)
+        if not collector.retry_queue.by_stage('collect_page'):
+            self.state['last_published'] = collector.latest_published.isoformat()
+        new_ids = [base_arxiv_id(arxiv_id) for arxiv_id in df['arxiv_id']]
+        self.state['seen_ids'] = (self.state['seen_ids'] + new_ids)[-self.config['seen_ids_limit']:]
+        self._save_state()
+
+        if len(analyzer.retry_queue):
+            print(f"📮 실패 항목 {len(analyzer.retry_queue)}건 기록: {analyzer.retry_queue.save()}")
+        print(f"✅ 새 논문 {len(df)}개 처리 → {path} ({time.time() - start_time:.1f}초)")
+        return len(df)
+
+    def run(self, interval=None, max_polls=None):
+        """interval초마다 확인 (Ctrl+C로 종료)"""
+        interval = interval or self.config['interval_seconds']
+        print(f"👀 새 논문 모니터링 시작: {interval}초마다 확인 → {self.store.store_dir}")
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    # 한 번 실패해도 다음 주기에 다시 시도 (기준 시각은 갱신되지 않음)
+                    print(f"❌ 확인 실패: {e}")
+                polls += 1
+                if max_polls is None or polls < max_polls:
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            print("\n👋 모니터링 종료")
@@ -0,0 +1,255 @@
+"""
+내구성 있는 로컬 작업 큐 (SQLite): 요약/임베딩 단계를 여러 워커 프로세스·호스트가 나눠 처리
+- 임대(lease) + 가시성 타임아웃: 워커가 가져간 항목은 lease_seconds 동안 다른 워커에게 보이지 않음
+- 워커가 죽어 임대가 만료되면 다음 lease() 때 자동으로 회수되어 다시 배정
+- 결과/실패 기록은 현재 임대를 가진 워커만 가능: 임대가 만료되어 다른 워커가 가져간 항목은
+  이전 워커가 완료/실패 처리하지 못함 (같은 항목의 결과가 여러 번 와도 처음 기록만 남음)
+- max_attempts번 시도해도 실패한 항목은 'failed'로 남겨 분석기가 재시도 큐로 넘김
+
+여러 호스트에서 쓰려면 POSIX 파일 잠금이 제대로 동작하는 공유 파일시스템에 DB를 두어야 합니다.
+WAL 저널은 공유 메모리 파일을 쓰므로 네트워크/공유 파일시스템에서는 안전하지 않아
+기본값은 롤백 저널(journal_mode='DELETE')입니다. 한 호스트에서만 쓸 때는 'WAL'로 바꿔도 됩니다.
+
+사용 예:
+    python cli.py analyze --queue work_queue.db --local-workers 4   # 등록 + 로컬 워커 + 결과 수집
+    python cli.py worker --queue work_queue.db --stage summary        # 다른 프로세스/호스트에서 워커 추가
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import time
+import numpy as np
+from config import Config
+
+STAGES = ('summary', 'embedding')
+JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'WAL')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    stage TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending / leased / done / failed
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result BLOB,
+    error TEXT,
+    updated_at REAL,
+    PRIMARY KEY (stage, key)
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (stage, status);
+"""
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """stage/key 단위 작업 항목을 관리하는 SQLite 큐 (프로세스마다 하나씩 생성)"""
+
+    def __init__(self, db_path=None, lease_seconds=None, max_attempts=None, journal_mode=None):
+        config = Config.WORK_QUEUE_CONFIG
+        self.db_path = db_path or config['db_path']
+        self.lease_seconds = lease_seconds or config['lease_seconds']
+        self.max_attempts = max_attempts or config['max_attempts']
+        self.journal_mode = (journal_mode or config['journal_mode']).upper()
+        if self.journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"지원하지 않는 journal_mode: {self.journal_mode} (가능: {', '.join(JOURNAL_MODES)})")
+        # 트랜잭션은 직접 BEGIN IMMEDIATE로 관리
+        self.conn = sqlite3.connect(self.db_path, timeout=60, isolation_level=None)
+        self.conn.execute(f'PRAGMA journal_mode={self.journal_mode}')
+        if self.journal_mode == 'WAL':
+            self.conn.execute('PRAGMA synchronous=NORMAL')  # 롤백 저널은 기본값(FULL) 유지
+        self.conn.executescript(_SCHEMA)
+
+    def _transaction(self):
+        self.conn.execute('BEGIN IMMEDIATE')  # 쓰기 잠금을 먼저 잡아 두 워커가 같은 항목을 임대하지 않게 함
+        return self.conn
+
+    def enqueue(self, stage, items):
+        """(key, payload) 목록 등록. 이미 있는 key는 건너뜀 (재실행해도 중복 등록 없음)"""
+        conn = self._transaction()
+        try:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (stage, key, payload, updated_at) VALUES (?, ?, ?, ?)",
+                [(stage, str(key), json.dumps(payload, ensure_ascii=False), time.time()) for key, payload in items]
+            )
+            added = conn.total_changes - before
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return added
+
+    def lease(self, stage, worker_id, limit):
+        """처리할 항목 최대 limit개 임대 (만료된 임대는 회수). 반환: [(key, payload)]"""
+        now = time.time()
+        conn = self._transaction()
+        try:
+            # 임대가 만료된 채 시도 횟수를 다 쓴 항목은 실패로 확정
+            conn.execute(
+                "UPDATE tasks SET status = 'failed', error = COALESCE(error, '임대 만료 (워커 중단)'), updated_at = ? "
+                "WHERE stage = ? AND status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, stage, now, self.max_attempts)
+            )
+            rows = conn.execute(
+                "SELECT key, payload FROM tasks WHERE stage = ? AND "
+                "(status = 'pending' OR (status = 'leased' AND lease_expires < ?)) "
+                "ORDER BY rowid LIMIT ?",
+                (stage, now, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE stage = ? AND key = ?",
+                [(worker_id, now + self.lease_seconds, now, stage, key) for key, _ in rows]
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return [(key, json.loads(payload)) for key, payload in rows]
+
+    def complete(self, stage, key, result, worker_id):
+        """결과 기록 (worker_id가 현재 임대를 가진 경우만, 아니면 무시하고 False)"""
+        cursor = self.conn.execute(
+            "UPDATE tasks SET status = 'done', result = ?, error = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE stage = ? AND key = ? AND status = 'leased' AND lease_owner = ?",
+            (result, time.time(), stage, str(key), worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, stage, key, error, worker_id):
+        """처리 실패: 시도 횟수가 남았으면 다시 대기열로, 아니면 failed (worker_id가 현재 임대를 가진 경우만)"""
+        cursor = self.conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, lease_expires = NULL, updated_at = ? "
+            "WHERE stage = ? AND key = ? AND status = 'leased' AND lease_owner = ?",
+            (self.max_attempts, f"{type(error).__name__}: {error}", time.time(), stage, str(key), worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def counts(self, stage):
+        """상태별 항목 수 (만료된 임대는 pending으로 계산)"""
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        now = time.time()
+        for status, expired, count in self.conn.execute(
+            "SELECT status, lease_expires < ?, COUNT(*) FROM tasks WHERE stage = ? GROUP BY 1, 2",
+            (now, stage)
+        ):
+            counts['pending' if status == 'leased' and expired else status] += count
+        return counts
+
+    def is_finished(self, stage):
+        counts = self.counts(stage)
+        return counts['pending'] == 0 and counts['leased'] == 0
+
+    def results(self, stage):
+        """완료된 항목의 결과 {key: result}"""
+        return dict(self.conn.execute(
+            "SELECT key, result FROM tasks WHERE stage = ? AND status = 'done'", (stage,)))
+
+    def done_keys(self, stage):
+        """완료된 항목의 key 집합 (결과는 읽지 않음)"""
+        return {key for (key,) in self.conn.execute(
+            "SELECT key FROM tasks WHERE stage = ? AND status = 'done'", (stage,))}
+
+    def failures(self, stage):
+        """최종 실패한 항목 {key: error}"""
+        return dict(self.conn.execute(
+            "SELECT key, error FROM tasks WHERE stage = ? AND status = 'failed'", (stage,)))
+
+    def close(self):
+        self.conn.close()
+
+
+def encode_embedding(embedding):
+    return np.asarray(embedding, dtype=np.float32).tobytes()
+
+
+def decode_embedding(blob):
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def run_worker(stage, db_path=None, worker_id=None, exit_when_empty=True):
+    """큐에서 항목을 임대해 처리하는 워커 루프 (요약은 1개씩, 임베딩은 배치로)"""
+    from paper_analyzer import PaperAnalyzer
+
+    config = Config.WORK_QUEUE_CONFIG
+    queue = WorkQueue(db_path)
+    worker_id = worker_id or default_worker_id()
+    analyzer = PaperAnalyzer()
+    per_paper_insight = Config.GPT_CONFIG.get('insight_mode', 'paper') == 'paper'
+    batch_size = config['batch_size']
+    processed = 0
+
+    print(f"👷 워커 시작: {worker_id} ({stage}, {queue.db_path})")
+    while True:
+        items = queue.lease(stage, worker_id, batch_size)
+        if not items:
+            if exit_when_empty and queue.is_finished(stage):
+                break
+            time.sleep(config['poll_interval'])  # 다른 워커가 임대 중인 항목이 만료될 수 있으므로 대기
+            continue
+
+        if stage == 'summary':
+            for key, payload in items:
+                try:
+                    summary, insight = analyzer._summarize_paper(payload, per_paper_insight)
+                    result = json.dumps({'gpt_summary': summary, 'key_insights': insight},
+                                        ensure_ascii=False).encode('utf-8')
+                    processed += queue.complete(stage, key, result, worker_id)
+                except Exception as e:
+                    print(f"⚠️ {key} 요약 실패: {e}")
+                    queue.fail(stage, key, e, worker_id)
+        else:
+            texts = [payload['text'] for _, payload in items]
+            try:
+                embeddings = analyzer._embed_texts(texts)
+                for (key, _), embedding in zip(items, embeddings):
+                    processed += queue.complete(stage, key, encode_embedding(embedding), worker_id)
+            except Exception as e:
+                print(f"⚠️ 임베딩 배치 실패 ({len(items)}개): {e}")
+                for key, _ in items:
+                    queue.fail(stage, key, e, worker_id)
+
+    queue.close()
+    print(f"✅ 워커 종료: {worker_id} ({stage} {processed}개 처리)")
+    return processed
+
+
+def _worker_process(args):
+    stage, db_path = args
+    return run_worker(stage, db_path)
+
+
+class LocalWorkers:
+    """start_local_workers가 시작한 워커 풀 (join()에서 워커 예외를 다시 발생시킴)"""
+
+    def __init__(self, pool, result):
+        self.pool = pool
+        self.result = result
+
+    def ready(self):
+        """모든 워커 프로세스가 끝났는지 (정상 종료 또는 예외)"""
+        return self.result.ready()
+
+    def join(self):
+        """워커 종료 대기 후 워커별 처리 수 반환 (워커가 예외로 죽었으면 그 예외 발생)"""
+        self.pool.join()
+        return self.result.get()
+
+
+def start_local_workers(db_path, n_workers):
+    """단계별로 로컬 워커 프로세스 시작 (반환한 LocalWorkers는 호출 측에서 join()으로 종료 대기)"""
+    from multiprocessing import Pool
+
+    jobs = [(stage, db_path) for stage in STAGES for _ in range(n_workers)]
+    pool = Pool(len(jobs))
+    result = pool.map_async(_worker_process, jobs)
+    pool.close()
+    return LocalWorkers(pool, result)